@@ -1,67 +1,147 @@
-import { MongoClient } from 'mongodb'
 import { v4 as uuidv4 } from 'uuid'
 import { NextResponse } from 'next/server'
+import {
+  SEARCH_FIELDS_PROJECTION,
+  buildSearchFields,
+  buildSearchFilter,
+  parseQuery,
+  scoreProduct,
+  searchRankStage
+} from '@/lib/search'
+import {
+  LEDGER_TYPES,
+  SIGNUP_WALLET_BALANCE,
+  TransactionError,
+  WalletError,
+  ensureLedgerIndexes,
+  getBalance,
+  getHistory,
+  openWallet,
+  postLedgerEntry,
+  withTransaction
+} from '@/lib/wallet'
+import { beginIdempotentRequest, ensureIdempotencyIndexes } from '@/lib/idempotency'
+import { admissionStats, admitRequest, classifyRoute } from '@/lib/admission'
+import { singleFlight, singleFlightStats } from '@/lib/singleflight'
+import {
+  drainJobs,
+  enqueueJob,
+  ensureJobIndexes,
+  findJob,
+  jobStats,
+  kickWorkers,
+  retryDeadJobs,
+  startWorkers
+} from '@/lib/jobs'
+import { ORDER_CREATED, ensureOrderPipelineIndexes, orderJobHandlers } from '@/lib/orderPipeline'
+import { poolStats, processStats } from '@/lib/poolMetrics'
+import { getDatabase, getDatabaseFor, getMongoClient, routingStats } from '@/lib/mongodb'
+import { LiveUpdatesError, ensureLiveUpdateIndexes, liveStats, openLiveStream } from '@/lib/liveUpdates'
+import {
+  ProfilerError,
+  authorizeProfiler,
+  profilerStatus,
+  readProfile,
+  startProfile,
+  stopProfile
+} from '@/lib/profiler'
+import { BODY_LIMITS, ValidationError, orderSchema, parseBody, productSchema, userSchema } from '@/lib/validation'
+import {
+  CATALOG_TAG,
+  CatalogError,
+  ensureCatalogIndexes,
+  findActiveCategories,
+  findCatalogProducts,
+  parseCatalogQuery,
+  revalidateCatalog
+} from '@/lib/catalog'
+import { OrderNumberError, ensureOrderNumberIndexes, nextOrderNumber } from '@/lib/orderNumbers'
+import {
+  OrderError,
+  ensureOrderIndexes,
+  initialStatusFields,
+  listOrders,
+  orderSummary,
+  updateOrder
+} from '@/lib/orders'
+import { IMMUTABLE_CACHE_CONTROL, ImageError, getImageVariant, imageJobHandlers, queueImageIngest } from '@/lib/images'
+import {
+  TestRunError,
+  authorizeTestRuns,
+  ensureTestRunIndexes,
+  listTestRuns,
+  teardownTestRun,
+  testRunTag
+} from '@/lib/testRuns'
+import { SyncError, changesSince, ensureSyncIndexes, recordResync, recordTombstone } from '@/lib/adminSync'
 
-// MongoDB connection with proper singleton pattern and connection pooling
-let client
-let db
-let connecting = false
+let indexesReady = null
 
-async function connectToMongo() {
-  try {
-    // If already connected, return existing database
-    if (db) {
-      return db
-    }
-    
-    // If connection is in progress, wait for it
-    if (connecting) {
-      while (connecting) {
-        await new Promise(resolve => setTimeout(resolve, 50))
-      }
-      return db
-    }
-    
-    // Start connection process
-    connecting = true
-    
-    if (!client) {
-      console.log('Initializing MongoDB connection...')
-      client = new MongoClient(process.env.MONGO_URL, {
-        maxPoolSize: 10,
-        serverSelectionTimeoutMS: 5000,
-        socketTimeoutMS: 45000,
-        family: 4
-      })
-      await client.connect()
-      console.log('MongoDB client connected successfully')
-    }
-    
-    if (!db) {
-      db = client.db(process.env.DB_NAME)
-      console.log(`Connected to database: ${process.env.DB_NAME}`)
-    }
-    
-    connecting = false
-    return db
-    
-  } catch (error) {
-    connecting = false
-    console.error('MongoDB connection error:', error)
-    
-    // Reset client and db on error
-    client = null
-    db = null
-    
-    throw new Error(`Database connection failed: ${error.message}`)
+// Every job type the in-process workers and /admin/jobs/drain can run
+const JOB_HANDLERS = { ...orderJobHandlers, ...imageJobHandlers }
+
+// Shared client from lib/mongodb.js, plus the API's own startup work. The
+// handle returned carries the read preference and write concern of the
+// request's route class.
+async function connectToMongo(routeClass = null) {
+  const database = await getDatabase()
+
+  if (!indexesReady) {
+    indexesReady = ensureIndexes(database).catch(error => {
+      indexesReady = null
+      console.error('Index creation error:', error)
+    })
   }
+
+  // Order post-processing runs in this process unless disabled (e.g. for a dedicated worker)
+  if (process.env.ORDER_WORKERS !== '0') {
+    startWorkers({ client: getMongoClient(), database }, JOB_HANDLERS, {
+      concurrency: parseInt(process.env.ORDER_WORKERS) || 2
+    })
+  }
+
+  return getDatabaseFor(routeClass)
+}
+
+// Indexes backing the API queries; createIndex is a no-op when the index already exists
+async function ensureIndexes(database) {
+  await Promise.all([
+    database.collection('products').createIndex({ searchKeywords: 1 }),
+    database.collection('products').createIndex({ searchPrefixes: 1 }),
+    database.collection('products').createIndex({ id: 1 }),
+    database.collection('users').createIndex({ uid: 1 }),
+    database.collection('orders').createIndex({ id: 1 }),
+    ensureLedgerIndexes(database),
+    ensureIdempotencyIndexes(database),
+    ensureJobIndexes(database),
+    ensureOrderPipelineIndexes(database),
+    ensureOrderNumberIndexes(database),
+    ensureOrderIndexes(database),
+    ensureCatalogIndexes(database),
+    ensureLiveUpdateIndexes(database),
+    ensureTestRunIndexes(database),
+    ensureSyncIndexes(database)
+  ])
+}
+
+const SEARCH_CANDIDATE_LIMIT = 500
+const MAX_BATCH_IDS = 200
+// Fields a cart or wishlist needs to revalidate its stored copies
+const BATCH_PRODUCT_PROJECTION = { _id: 0, id: 1, price: 1, originalPrice: 1, stock: 1, active: 1 }
+const REINDEX_BATCH_SIZE = 1000
+const SEARCH_SOURCE_PROJECTION = {
+  name: 1, nameEn: 1, description: 1, descriptionEn: 1,
+  category: 1, categoryAr: 1, 'specifications.brand': 1
 }
 
 // Helper function to handle CORS
 function handleCORS(response) {
   response.headers.set('Access-Control-Allow-Origin', '*')
   response.headers.set('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-  response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+  response.headers.set(
+    'Access-Control-Allow-Headers',
+    'Content-Type, Authorization, Idempotency-Key, X-Test-Run, X-Test-Run-Token, X-Test-Run-TTL, X-Test-Client'
+  )
   response.headers.set('Access-Control-Allow-Credentials', 'true')
   return response
 }
@@ -71,14 +151,115 @@ export async function OPTIONS() {
   return handleCORS(new NextResponse(null, { status: 200 }))
 }
 
-// Route handler function
-async function handleRoute(request, { params }) {
+// Public catalog reads whose response is identical for every client
+const COALESCED_ROUTES = new Set([
+  '/products',
+  '/products/search',
+  '/products/suggest',
+  '/categories',
+  '/coupons'
+])
+
+// Route handler function. Identical concurrent catalog reads are coalesced so
+// only the first one goes through admission and hits MongoDB; the rest share
+// its response without taking a pool slot.
+async function handleRoute(request, context) {
+  const { path = [] } = context.params
+  const route = `/${path.join('/')}`
+
+  if (request.method !== 'GET' || !COALESCED_ROUTES.has(route)) {
+    return admitAndDispatch(request, context)
+  }
+
+  const url = new URL(request.url)
+  const { value: shared, leader } = await singleFlight(
+    `${route}?${url.searchParams.toString()}`,
+    async () => {
+      const response = await admitAndDispatch(request, context)
+      return { status: response.status, headers: [...response.headers], body: await response.text() }
+    },
+    route
+  )
+
+  // A rate-limit rejection belongs to the leader's client, not to everyone sharing the flight
+  if (!leader && shared.status === 429) {
+    return admitAndDispatch(request, context)
+  }
+
+  return new NextResponse(shared.body, { status: shared.status, headers: shared.headers })
+}
+
+// Admission control first, so rejected requests never wait on the MongoDB pool
+async function admitAndDispatch(request, context) {
+  const { path = [] } = context.params
+  const admission = await admitRequest(request, classifyRoute(path, request.method))
+
+  if (admission.response) {
+    return handleCORS(admission.response)
+  }
+
+  try {
+    return await dispatchRoute(request, context)
+  } finally {
+    admission.release()
+  }
+}
+
+async function dispatchRoute(request, { params }) {
   const { path = [] } = params
   const route = `/${path.join('/')}`
   const method = request.method
 
   try {
-    const database = await connectToMongo()
+    // Optimized product images: content-addressed variants served from the disk cache
+    if (path[0] === 'images' && path.length === 3 && method === 'GET') {
+      const image = await getImageVariant(path[1], path[2])
+      const headers = { 'Cache-Control': IMMUTABLE_CACHE_CONTROL, ETag: image.etag }
+      if (request.headers.get('if-none-match') === image.etag) {
+        return handleCORS(new NextResponse(null, { status: 304, headers }))
+      }
+      return handleCORS(new NextResponse(image.body, {
+        status: 200,
+        headers: { ...headers, 'Content-Type': image.contentType, 'Content-Length': String(image.body.length) }
+      }))
+    }
+
+    // Sampling CPU/heap profiles of this process; token-protected and independent of the database
+    if (path[0] === 'admin' && path[1] === 'profile') {
+      authorizeProfiler(request)
+
+      if (path.length === 2 && method === 'GET') {
+        return handleCORS(NextResponse.json(profilerStatus()))
+      }
+
+      // ?seconds=30&heap=false&intervalUs=1000
+      if (path.length === 2 && method === 'POST') {
+        const { searchParams } = new URL(request.url)
+        const capture = await startProfile({
+          seconds: Number(searchParams.get('seconds')) || undefined,
+          heap: searchParams.get('heap') !== 'false',
+          samplingIntervalUs: Number(searchParams.get('intervalUs')) || undefined
+        })
+        return handleCORS(NextResponse.json(capture, { status: 202 }))
+      }
+
+      if (path[2] === 'stop' && path.length === 3 && method === 'POST') {
+        return handleCORS(NextResponse.json(await stopProfile()))
+      }
+
+      // /admin/profile/:id/cpu or /admin/profile/:id/heap
+      if (path.length === 4 && method === 'GET') {
+        const profile = await readProfile(path[2], path[3])
+        return handleCORS(new NextResponse(profile.body, {
+          headers: {
+            'Content-Type': 'application/json',
+            'Content-Disposition': `attachment; filename="${profile.filename}"`
+          }
+        }))
+      }
+    }
+
+    const database = await connectToMongo(classifyRoute(path, method))
 
     // Root endpoint
     if ((route === '/' || route === '') && method === 'GET') {
@@ -91,16 +272,22 @@ async function handleRoute(request, { params }) {
 
     // Users endpoints
     if (route === '/users' && method === 'POST') {
-      const userData = await request.json()
+      const { data: userData } = await parseBody(request, userSchema, BODY_LIMITS.users)
       
       const user = {
         id: uuidv4(),
         ...userData,
+        walletBalance: SIGNUP_WALLET_BALANCE,
+        walletSeq: 1,
         createdAt: new Date(),
-        updatedAt: new Date()
+        updatedAt: new Date(),
+        ...testRunTag(request)
       }
 
-      await database.collection('users').insertOne(user)
+      await withTransaction(getMongoClient(), async (session) => {
+        await database.collection('users').insertOne(user, { session })
+        await openWallet(database, user, session)
+      })
       const { _id, ...userResponse } = user
       return handleCORS(NextResponse.json(userResponse))
     }
@@ -117,6 +304,49 @@ async function handleRoute(request, { params }) {
       return handleCORS(NextResponse.json(userResponse))
     }
 
+    // Process memory, connection pool, admission control, coalescing, live update counters and read routing
+    if (route === '/admin/metrics' && method === 'GET') {
+      return handleCORS(NextResponse.json({
+        process: processStats(),
+        pool: poolStats(),
+        admission: admissionStats(),
+        singleFlight: singleFlightStats(),
+        live: liveStats(),
+        routing: routingStats()
+      }))
+    }
+
+    // Background job queue: counts per status, manual drain and dead-letter retry
+    if (route === '/admin/jobs' && method === 'GET') {
+      return handleCORS(NextResponse.json(await jobStats(database)))
+    }
+
+    if (route === '/admin/jobs/drain' && method === 'POST') {
+      const { searchParams } = new URL(request.url)
+      const limit = parseInt(searchParams.get('limit')) || 100
+      const result = await drainJobs({ client: getMongoClient(), database }, JOB_HANDLERS, { limit })
+      return handleCORS(NextResponse.json(result))
+    }
+
+    if (route === '/admin/jobs/retry-dead' && method === 'POST') {
+      const retried = await retryDeadJobs(database)
+      return handleCORS(NextResponse.json({ retried }))
+    }
+
+    // One job with its status, attempts and `result` (image ingest progress)
+    if (route.startsWith('/admin/jobs/') && method === 'GET') {
+      const job = await findJob(database, route.split('/')[3])
+      if (!job) {
+        return handleCORS(NextResponse.json({ error: 'Job not found' }, { status: 404 }))
+      }
+      return handleCORS(NextResponse.json(job))
+    }
+
+    // Products, users and orders changed since a cursor, with deleted product ids (lib/adminSync.js)
+    if (route === '/admin/changes' && method === 'GET') {
+      return handleCORS(NextResponse.json(await changesSince(database, new URL(request.url).searchParams)))
+    }
+
     // Admin Users endpoint
     if (route === '/admin/users' && method === 'GET') {
       const users = await database.collection('users').find({}).toArray()
@@ -125,6 +355,34 @@ async function handleRoute(request, { params }) {
     }
 
     // Products endpoints
+    // Batch lookup for cart/wishlist revalidation: /products?ids=a,b,c -> { products, missing }
+    if (route === '/products' && method === 'GET' && new URL(request.url).searchParams.has('ids')) {
+      const ids = [...new Set(new URL(request.url).searchParams.get('ids').split(',').filter(Boolean))]
+      if (ids.length > MAX_BATCH_IDS) {
+        return handleCORS(NextResponse.json(
+          { error: `At most ${MAX_BATCH_IDS} ids per request` },
+          { status: 400 }
+        ))
+      }
+
+      const found = await database.collection('products')
+        .find({ id: { $in: ids } }, { projection: BATCH_PRODUCT_PROJECTION })
+        .toArray()
+
+      const products = found.map(({ active, ...product }) => ({
+        ...product,
+        available: active !== false && (product.stock === undefined || product.stock > 0)
+      }))
+      const foundIds = new Set(products.map(product => product.id))
+      return handleCORS(NextResponse.json({
+        products,
+        missing: ids.filter(id => !foundIds.has(id))
+      }))
+    }
+
+    // Plain /products is the first page as an array; /products?cursor=&limit= pages
+    // through the whole catalog as { products, nextCursor } (empty cursor: first page),
+    // optionally filtered by category=&minPrice=&maxPrice= and ordered by sort=
     if (route === '/products' && method === 'GET') {
       const productsCount = await database.collection('products').countDocuments()
       
@@ -132,24 +390,70 @@ async function handleRoute(request, { params }) {
         await seedProducts(database)
       }
 
-      const products = await database.collection('products')
-        .find({})
-        .limit(50)
+      const { searchParams } = new URL(request.url)
+      if (!searchParams.has('cursor')) {
+        return handleCORS(NextResponse.json((await findCatalogProducts(database)).products))
+      }
+      return handleCORS(NextResponse.json(await findCatalogProducts(database, parseCatalogQuery(searchParams))))
+    }
+
+    // Product search: Arabic-normalized, stemmed keyword match ranked by relevance
+    if (route === '/products/search' && method === 'GET') {
+      const { searchParams } = new URL(request.url)
+      const query = parseQuery(searchParams.get('q') || '')
+      const limit = Math.min(parseInt(searchParams.get('limit')) || 20, 100)
+      const filter = buildSearchFilter(query)
+
+      if (!filter) {
+        return handleCORS(NextResponse.json([]))
+      }
+
+      const candidates = await database.collection('products').aggregate([
+        { $match: filter },
+        searchRankStage(query),
+        { $sort: { searchRank: -1, _id: 1 } },
+        { $limit: SEARCH_CANDIDATE_LIMIT },
+        { $project: { _id: 0, searchPrefixes: 0, searchRank: 0 } }
+      ]).toArray()
+
+      const results = candidates
+        .map(product => ({ product, score: scoreProduct(product, query) }))
+        .sort((a, b) => b.score - a.score)
+        .slice(0, limit)
+        .map(({ product: { searchKeywords, ...rest }, score }) => ({ ...rest, score }))
+
+      return handleCORS(NextResponse.json(results))
+    }
+
+    // Autocomplete: prefix match on product names only
+    if (route === '/products/suggest' && method === 'GET') {
+      const { searchParams } = new URL(request.url)
+      const query = parseQuery(searchParams.get('q') || '')
+      const limit = Math.min(parseInt(searchParams.get('limit')) || 8, 20)
+      const filter = buildSearchFilter(query, { prefixOnly: true })
+
+      if (!filter) {
+        return handleCORS(NextResponse.json([]))
+      }
+
+      const suggestions = await database.collection('products')
+        .find(filter, { projection: { _id: 0, id: 1, name: 1, nameEn: 1, category: 1 } })
+        .sort({ reviews: -1 })
+        .limit(limit)
         .toArray()
 
-      const cleanedProducts = products.map(({ _id, ...rest }) => rest)
-      return handleCORS(NextResponse.json(cleanedProducts))
+      return handleCORS(NextResponse.json(suggestions))
     }
 
     // Admin Products endpoints
     if (route === '/admin/products' && method === 'GET') {
-      const products = await database.collection('products').find({}).toArray()
+      const products = await database.collection('products').find({}, { projection: SEARCH_FIELDS_PROJECTION }).toArray()
       const cleanedProducts = products.map(({ _id, ...rest }) => rest)
       return handleCORS(NextResponse.json(cleanedProducts))
     }
 
     if (route === '/admin/products' && method === 'POST') {
-      const productData = await request.json()
+      const { data: productData } = await parseBody(request, productSchema, BODY_LIMITS.products)
       
       const product = {
         id: uuidv4(),
@@ -158,17 +462,110 @@ async function handleRoute(request, { params }) {
         rating: productData.rating || 4.5,
         reviews: productData.reviews || 0,
         createdAt: new Date(),
-        updatedAt: new Date()
+        updatedAt: new Date(),
+        ...testRunTag(request)
       }
 
-      await database.collection('products').insertOne(product)
+      await database.collection('products').insertOne({ ...product, ...buildSearchFields(product) })
+      revalidateCatalog()
+      // Optimized variants become available once the ingest job has run; until then the original URL is used
+      await queueImageIngest(database, { productIds: [product.id] })
       const { _id, ...productResponse } = product
       return handleCORS(NextResponse.json(productResponse))
     }
 
+    // Queue a download of product images into the local store (`?productId=` for one product,
+    // `?force=true` to redo); follow GET /admin/jobs/:id and its result.nextJobId for progress
+    if (route === '/admin/images/ingest' && method === 'POST') {
+      const { searchParams } = new URL(request.url)
+      const job = await queueImageIngest(database, {
+        productIds: searchParams.get('productId') ? [searchParams.get('productId')] : null,
+        force: searchParams.get('force') === 'true'
+      })
+      return handleCORS(NextResponse.json({ jobId: job.id, status: job.status }, { status: 202 }))
+    }
+
+    // Server-Sent Events: stock changes for the storefront, plus order changes for admins
+    if ((route === '/live' || route === '/admin/live') && method === 'GET') {
+      const channels = route === '/live' ? ['stock'] : ['stock', 'orders']
+      return handleCORS(new NextResponse(openLiveStream(database, channels, request.signal), {
+        headers: {
+          'Content-Type': 'text/event-stream',
+          'Cache-Control': 'no-cache, no-transform',
+          Connection: 'keep-alive',
+          // Stop reverse proxies from buffering the stream
+          'X-Accel-Buffering': 'no'
+        }
+      }))
+    }
+
+    // Regenerate the catalog page after writes made outside the API (seed scripts, bulk loads)
+    if (route === '/admin/catalog/revalidate' && method === 'POST') {
+      revalidateCatalog()
+      return handleCORS(NextResponse.json({ revalidated: true, tag: CATALOG_TAG }))
+    }
+
+    // Test data namespaces (lib/testRuns.js): list them, or delete one with everything it created
+    if (path[0] === 'admin' && path[1] === 'test-runs') {
+      authorizeTestRuns(request)
+
+      if (path.length === 2 && method === 'GET') {
+        return handleCORS(NextResponse.json(await listTestRuns(database)))
+      }
+
+      if (path.length === 3 && method === 'DELETE') {
+        const result = await teardownTestRun(database, path[2])
+        if (result.deleted.products > 0) {
+          revalidateCatalog()
+        }
+        if (result.deleted.products + result.deleted.users + result.deleted.orders > 0) {
+          await recordResync(database, `test run ${result.namespace} torn down`)
+        }
+        return handleCORS(NextResponse.json(result))
+      }
+    }
+
+    // Rebuild search fields for products written outside the API (seed scripts, bulk loads)
+    if (route === '/admin/search/reindex' && method === 'POST') {
+      const { searchParams } = new URL(request.url)
+      const onlyMissing = searchParams.get('all') !== 'true'
+      const filter = onlyMissing ? { searchKeywords: { $exists: false } } : {}
+      const cursor = database.collection('products').find(filter, {
+        projection: SEARCH_SOURCE_PROJECTION
+      })
+
+      let reindexed = 0
+      let batch = []
+      for await (const product of cursor) {
+        batch.push({
+          updateOne: {
+            filter: { _id: product._id },
+            update: { $set: buildSearchFields(product) }
+          }
+        })
+        if (batch.length >= REINDEX_BATCH_SIZE) {
+          await database.collection('products').bulkWrite(batch, { ordered: false })
+          reindexed += batch.length
+          batch = []
+        }
+      }
+      if (batch.length > 0) {
+        await database.collection('products').bulkWrite(batch, { ordered: false })
+        reindexed += batch.length
+      }
+
+      return handleCORS(NextResponse.json({ reindexed }))
+    }
+
     if (route.startsWith('/admin/products/') && method === 'DELETE') {
       const productId = path[2]
-      await database.collection('products').deleteOne({ id: productId })
+      await withTransaction(getMongoClient(), async (session) => {
+        const { deletedCount } = await database.collection('products').deleteOne({ id: productId }, { session })
+        if (deletedCount > 0) {
+          await recordTombstone(database, 'products', productId, session)
+        }
+      })
+      revalidateCatalog()
       return handleCORS(NextResponse.json({ message: 'Product deleted successfully' }))
     }
 
@@ -180,24 +577,29 @@ async function handleRoute(request, { params }) {
         await seedCategories(database)
       }
 
-      const categories = await database.collection('categories')
-        .find({ active: true })
-        .toArray()
-
-      const cleanedCategories = categories.map(({ _id, ...rest }) => rest)
-      return handleCORS(NextResponse.json(cleanedCategories))
+      return handleCORS(NextResponse.json(await findActiveCategories(database)))
     }
 
     // Orders endpoints
     if (route === '/orders' && method === 'POST') {
-      const orderData = await request.json()
+      // Validated before the key is claimed, so a rejected body does not use up the key
+      const { data: orderData, raw } = await parseBody(request, orderSchema, BODY_LIMITS.orders)
+      const tag = testRunTag(request)
+      const idempotency = await beginIdempotentRequest(database, request, 'orders', raw)
+      if (idempotency.response) {
+        return handleCORS(idempotency.response)
+      }
+
+      const { orderNumber, orderSeq } = await nextOrderNumber(database)
+      const now = new Date()
       
       const order = {
         id: uuidv4(),
-        orderNumber: `ORD${Date.now()}`,
-        status: 'pending',
+        orderNumber,
+        orderSeq,
+        ...initialStatusFields(now),
         paymentStatus: 'pending',
-        paymentMethod: orderData.paymentMethod || 'whatsapp',
+        paymentMethod: orderData.paymentMethod,
         total: orderData.total,
         originalTotal: orderData.originalTotal || orderData.total,
         discount: orderData.discount || 0,
@@ -205,48 +607,91 @@ async function handleRoute(request, { params }) {
         items: orderData.items,
         customerInfo: orderData.customerInfo,
         userId: orderData.userId,
-        createdAt: new Date(),
-        updatedAt: new Date()
+        createdAt: now,
+        updatedAt: now,
+        ...tag
       }
 
-      await database.collection('orders').insertOne(order)
-      
-      if (order.paymentMethod === 'wallet') {
-        await database.collection('users').updateOne(
-          { uid: orderData.userId },
-          { 
-            $inc: { walletBalance: -order.total },
-            $set: { updatedAt: new Date() }
+      const { _id, ...orderResponse } = order
+      try {
+        await withTransaction(getMongoClient(), async (session) => {
+          await database.collection('orders').insertOne({ ...order }, { session })
+
+          if (order.paymentMethod === 'wallet') {
+            await postLedgerEntry(database, {
+              userId: order.userId,
+              type: LEDGER_TYPES.ORDER_DEBIT,
+              amount: -order.total,
+              referenceId: order.id
+            }, session)
           }
-        )
+
+          // Stock, coupon redemption and notifications happen after checkout returns
+          await enqueueJob(database, {
+            type: ORDER_CREATED,
+            payload: { orderId: order.id },
+            dedupeKey: `${ORDER_CREATED}:${order.id}`
+          }, session)
+
+          await idempotency.complete(orderResponse, session)
+        })
+      } catch (error) {
+        await idempotency.release()
+        throw error
       }
 
-      const { _id, ...orderResponse } = order
+      kickWorkers()
       return handleCORS(NextResponse.json(orderResponse))
     }
 
     // Admin Orders endpoints
+    // Filtered, keyset-paginated order queue: { orders, nextCursor }
     if (route === '/admin/orders' && method === 'GET') {
-      const orders = await database.collection('orders').find({}).sort({ createdAt: -1 }).toArray()
-      const cleanedOrders = orders.map(({ _id, ...rest }) => rest)
-      return handleCORS(NextResponse.json(cleanedOrders))
+      const page = await listOrders(database, new URL(request.url).searchParams)
+      return handleCORS(NextResponse.json(page))
+    }
+
+    if (route === '/admin/orders/summary' && method === 'GET') {
+      return handleCORS(NextResponse.json(await orderSummary(database)))
+    }
+
+    // Refund a wallet-paid order back to the customer's wallet (once per order)
+    if (path[0] === 'admin' && path[1] === 'orders' && path[3] === 'refund' && method === 'POST') {
+      const orderId = path[2]
+      const order = await database.collection('orders').findOne({ id: orderId })
+
+      if (!order) {
+        return handleCORS(NextResponse.json({ error: 'Order not found' }, { status: 404 }))
+      }
+      if (order.paymentMethod !== 'wallet') {
+        return handleCORS(NextResponse.json({ error: 'Only wallet orders can be refunded to the wallet' }, { status: 400 }))
+      }
+
+      const entry = await withTransaction(getMongoClient(), async (session) => {
+        const refund = await postLedgerEntry(database, {
+          userId: order.userId,
+          type: LEDGER_TYPES.REFUND,
+          amount: order.total,
+          referenceId: order.id
+        }, session)
+        await database.collection('orders').updateOne(
+          { id: orderId },
+          { $set: { paymentStatus: 'refunded', updatedAt: new Date() } },
+          { session }
+        )
+        return refund
+      })
+
+      return handleCORS(NextResponse.json(entry))
     }
 
     if (route.startsWith('/admin/orders/') && method === 'PUT') {
       const orderId = path[2]
       const updateData = await request.json()
       
-      await database.collection('orders').updateOne(
-        { id: orderId },
-        { 
-          $set: { 
-            ...updateData, 
-            updatedAt: new Date() 
-          }
-        }
-      )
+      const order = await updateOrder(database, orderId, updateData)
       
-      return handleCORS(NextResponse.json({ message: 'Order updated successfully' }))
+      return handleCORS(NextResponse.json({ message: 'Order updated successfully', order }))
     }
 
     // Coupons endpoints
@@ -309,6 +754,12 @@ async function handleRoute(request, { params }) {
 
     // Wallet endpoints
     if (route === '/wallet/recharge' && method === 'POST') {
+      const tag = testRunTag(request)
+      const idempotency = await beginIdempotentRequest(database, request, 'wallet_recharge')
+      if (idempotency.response) {
+        return handleCORS(idempotency.response)
+      }
+
       const rechargeData = await request.json()
       
       const transaction = {
@@ -321,23 +772,52 @@ async function handleRoute(request, { params }) {
         reference: rechargeData.reference || '',
         receiptImage: rechargeData.receiptImage || '',
         createdAt: new Date(),
-        updatedAt: new Date()
+        updatedAt: new Date(),
+        ...tag
       }
 
-      await database.collection('wallet_transactions').insertOne(transaction)
+      try {
+        await withTransaction(getMongoClient(), async (session) => {
+          await database.collection('wallet_transactions').insertOne({ ...transaction }, { session })
 
-      if (transaction.method === 'qr_code') {
-        await database.collection('users').updateOne(
-          { uid: rechargeData.userId },
-          { 
-            $inc: { walletBalance: transaction.amount },
-            $set: { updatedAt: new Date() }
+          if (transaction.status === 'completed') {
+            await postLedgerEntry(database, {
+              userId: transaction.userId,
+              type: LEDGER_TYPES.RECHARGE,
+              amount: transaction.amount,
+              referenceId: transaction.id
+            }, session)
           }
-        )
+
+          await idempotency.complete(transaction, session)
+        })
+      } catch (error) {
+        await idempotency.release()
+        throw error
       }
 
-      const { _id, ...transactionResponse } = transaction
-      return handleCORS(NextResponse.json(transactionResponse))
+      return handleCORS(NextResponse.json(transaction))
+    }
+
+    // Wallet balance: a single indexed read of the ledger snapshot
+    if (path[0] === 'wallet' && path.length === 2 && method === 'GET') {
+      const balance = await getBalance(database, path[1])
+
+      if (!balance) {
+        return handleCORS(NextResponse.json({ error: 'User not found' }, { status: 404 }))
+      }
+
+      return handleCORS(NextResponse.json(balance))
+    }
+
+    // Wallet history, newest first; pass `before` from the previous page's `nextBefore`
+    if (path[0] === 'wallet' && path.length === 3 && path[2] === 'history' && method === 'GET') {
+      const { searchParams } = new URL(request.url)
+      const limit = Math.min(parseInt(searchParams.get('limit')) || 20, 100)
+      const before = searchParams.has('before') ? parseInt(searchParams.get('before')) : null
+
+      const history = await getHistory(database, path[1], { limit, before })
+      return handleCORS(NextResponse.json(history))
     }
 
     // Route not found
@@ -347,6 +827,25 @@ async function handleRoute(request, { params }) {
     ))
 
   } catch (error) {
+    if (error instanceof WalletError || error instanceof OrderError || error instanceof ImageError ||
+      error instanceof LiveUpdatesError || error instanceof ProfilerError || error instanceof TestRunError ||
+      error instanceof SyncError || error instanceof CatalogError || error instanceof TransactionError ||
+      error instanceof OrderNumberError) {
+      return handleCORS(NextResponse.json({ error: error.message }, { status: error.status }))
+    }
+    if (error instanceof ValidationError) {
+      return handleCORS(NextResponse.json(
+        { error: error.message, ...(error.issues ? { issues: error.issues } : {}) },
+        { status: error.status }
+      ))
+    }
+    if (error.code === 11000) {
+      return handleCORS(NextResponse.json(
+        { error: 'Duplicate request', details: error.message },
+        { status: 409 }
+      ))
+    }
+
     console.error('API Error:', error)
     return handleCORS(NextResponse.json(
       { error: "Internal server error", details: error.message }, 
@@ -513,7 +1012,9 @@ async function seedProducts(database) {
     }
   ]
 
-  await database.collection('products').insertMany(sampleProducts)
+  await database.collection('products').insertMany(
+    sampleProducts.map(product => ({ ...product, ...buildSearchFields(product) }))
+  )
 }
 
 async function seedCategories(database) {
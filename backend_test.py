@@ -7,9 +7,11 @@ Tests all key endpoints for the e-commerce system with Arabic support
 import requests
 import json
 import uuid
-import time
 from datetime import datetime
 
+from run_history import TestRun
+from store_client import new_run_namespace
+
 # Configuration - Get from environment
 import os
 BASE_URL_ENV = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://souqonline.preview.emergentagent.com')
@@ -19,6 +21,13 @@ HEADERS = {
     'Accept': 'application/json'
 }
 
+# Tag this run's data so it expires by itself and is torn down at the end
+# (needs the server's TEST_RUN_TOKEN; KEEP_TEST_DATA=1 skips the teardown)
+TEST_RUN_TOKEN = os.getenv('TEST_RUN_TOKEN')
+TEST_RUN = os.getenv('TEST_RUN') or (new_run_namespace('backend') if TEST_RUN_TOKEN else None)
+if TEST_RUN:
+    HEADERS.update({'X-Test-Run': TEST_RUN, 'X-Test-Run-Token': TEST_RUN_TOKEN})
+
 def print_test_header(test_name):
     print(f"\n{'='*60}")
     print(f"TESTING: {test_name}")
@@ -177,7 +186,6 @@ def test_create_user():
         "name": "أحمد محمد",
         "nameEn": "Ahmed Mohammed",
         "phone": "+966501234567",
-        "walletBalance": 2000,
         "address": {
             "street": "شارع الملك فهد",
             "city": "الرياض",
@@ -447,7 +455,7 @@ def test_wallet_balance_after_operations(user_uid):
             user = response.json()
             final_balance = user.get('walletBalance', 0)
             
-            # Expected balance: 2000 (initial) - 900000 (order) + 500000 (recharge) = -398000
+            # Expected balance: 2000 (welcome balance set by the server) - 900000 (order) + 500000 (recharge) = -398000
             expected_balance = 2000 - 900000 + 500000
             
             if final_balance == expected_balance:
@@ -471,6 +479,15 @@ def test_wallet_balance_after_operations(user_uid):
         print_result(False, f"Request error: {str(e)}")
         return False
 
+def teardown_test_data():
+    """Delete every user, order and wallet entry this run created"""
+    response = requests.delete(f"{BASE_URL}/admin/test-runs/{TEST_RUN}", headers=HEADERS, timeout=60)
+    if response.status_code == 200:
+        print(f"🧹 Removed {response.json()['total']} documents of test run {TEST_RUN}")
+        return True
+    print(f"⚠️ Teardown of test run {TEST_RUN} failed: HTTP {response.status_code}: {response.text}")
+    return False
+
 def run_all_tests():
     """Run all backend API tests"""
     print(f"\n{'='*80}")
@@ -482,36 +499,46 @@ def run_all_tests():
     results = {}
     test_user_uid = None
     
-    # Test 1: API Root
-    results['api_root'] = test_api_root()
-    
-    # Test 2: Products API
-    results['products_api'] = test_products_api()
-    
-    # Test 3: Categories API  
-    results['categories_api'] = test_categories_api()
-    
-    # Test 4: Create User
-    user_created, test_user_uid = test_create_user()
-    results['create_user'] = user_created
-    
-    # Test 5: Get User (only if user was created)
-    if test_user_uid:
-        results['get_user'] = test_get_user(test_user_uid)
+    # Every run is recorded with per-test and per-request timings (see run_history.py)
+    with TestRun('backend_test', BASE_URL) as run:
+        # Test 1: API Root
+        results['api_root'] = run.test('api_root', test_api_root)
         
-        # Test 6: Create Order (only if user exists)
-        results['create_order'] = test_create_order(test_user_uid)
+        # Test 2: Products API
+        results['products_api'] = run.test('products_api', test_products_api)
         
-        # Test 7: Wallet Recharge (only if user exists)
-        results['wallet_recharge'] = test_wallet_recharge(test_user_uid)
+        # Test 3: Categories API  
+        results['categories_api'] = run.test('categories_api', test_categories_api)
         
-        # Test 8: Verify wallet balance after operations
-        results['wallet_balance_verification'] = test_wallet_balance_after_operations(test_user_uid)
-    else:
-        results['get_user'] = False
-        results['create_order'] = False
-        results['wallet_recharge'] = False
-        results['wallet_balance_verification'] = False
+        # Test 4: Create User
+        user_created, test_user_uid = run.test('create_user', test_create_user, passed=lambda result: result[0])
+        results['create_user'] = user_created
+        
+        # Test 5: Get User (only if user was created)
+        if test_user_uid:
+            results['get_user'] = run.test('get_user', test_get_user, test_user_uid)
+            
+            # Test 6: Create Order (only if user exists)
+            results['create_order'] = run.test('create_order', test_create_order, test_user_uid)
+            
+            # Test 7: Wallet Recharge (only if user exists)
+            results['wallet_recharge'] = run.test('wallet_recharge', test_wallet_recharge, test_user_uid)
+            
+            # Test 8: Verify wallet balance after operations
+            results['wallet_balance_verification'] = run.test(
+                'wallet_balance_verification', test_wallet_balance_after_operations, test_user_uid)
+        else:
+            for name in ('get_user', 'create_order', 'wallet_recharge', 'wallet_balance_verification'):
+                results[name] = False
+                run.record(name, 'skipped', message='create_user failed')
+
+        # Recorded like a test, so a failed cleanup shows up in the run history
+        if not TEST_RUN:
+            run.record('teardown', 'skipped', message='no TEST_RUN_TOKEN, nothing was tagged')
+        elif os.getenv('KEEP_TEST_DATA'):
+            run.record('teardown', 'skipped', message='KEEP_TEST_DATA is set')
+        else:
+            run.test('teardown', teardown_test_data)
     
     # Print summary
     print(f"\n{'='*80}")
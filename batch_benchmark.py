@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Cart Revalidation Benchmark
+Compares one batch GET /api/products?ids=... against N single-product fetches for carts of 1-200 items
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import random
+import statistics
+import time
+
+from load_tools import BASE_URL, make_client, simulated_client_headers
+
+CART_SIZES = [1, 5, 10, 25, 50, 100, 200]
+# Browsers open about six connections per origin
+BROWSER_CONNECTIONS = 6
+
+# Each request poses as its own client so the per-client rate limit does not skew the single fetches
+client_ids = itertools.count()
+
+
+def fetch_ids(client, ids):
+    n = next(client_ids)
+    headers = simulated_client_headers(f"batch-{n}")
+    return client.get('/products', params={'ids': ','.join(ids)}, headers=headers, timeout=30, route='/products?ids')
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch product lookup against single fetches')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print("🛒 CART REVALIDATION BENCHMARK")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    print("=" * 80)
+
+    client = make_client(BROWSER_CONNECTIONS)
+    catalog = [product['id'] for product in client.admin_products()]
+    sizes = [size for size in CART_SIZES if size <= len(catalog)]
+    if len(sizes) < len(CART_SIZES):
+        print(f"⚠️ Only {len(catalog)} products available; larger carts skipped "
+              f"(load more with generate_test_data.py)")
+
+    rng = random.Random(args.seed)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS)
+
+    def singles_sequential(ids):
+        for product_id in ids:
+            fetch_ids(client, [product_id])
+
+    def singles_parallel(ids):
+        list(executor.map(lambda product_id: fetch_ids(client, [product_id]), ids))
+
+    correct = True
+    print(f"\n{'items':>6} {'batch':>10} {'N serial':>10} {'N parallel':>11} {'speedup':>9}   (median of {args.iterations})")
+    for size in sizes:
+        batch, serial, parallel = [], [], []
+        for _ in range(args.iterations):
+            ids = rng.sample(catalog, size)
+            result = fetch_ids(client, ids)
+            correct &= len(result['products']) == size and not result['missing']
+            batch.append(timed(fetch_ids, client, ids))
+            serial.append(timed(singles_sequential, ids))
+            parallel.append(timed(singles_parallel, ids))
+
+        batch_ms = statistics.median(batch)
+        parallel_ms = statistics.median(parallel)
+        print(f"{size:>6} {batch_ms:>8.1f}ms {statistics.median(serial):>8.1f}ms {parallel_ms:>9.1f}ms "
+              f"{parallel_ms / batch_ms:>8.1f}x")
+
+    executor.shutdown()
+    print(f"\n   {'✅' if correct else '❌'} batch responses returned every requested product")
+    return correct
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Catalog Render Benchmark
+Compares time to first byte and to first product content of the server-rendered (ISR) home page
+against the client-rendered sequence it replaced, and checks write-triggered revalidation
+
+Run against a production build (`yarn build && yarn start`); `next dev` renders every request.
+"""
+
+import argparse
+import concurrent.futures
+import re
+import statistics
+import time
+import uuid
+
+from load_tools import BASE_URL_ENV, make_client, percentile
+
+# loadCatalog() stamps its data; the stamp travels in the page's RSC payload (quotes escaped)
+GENERATED_AT_PATTERN = re.compile(rb'generatedAt\\?"\s*:\s*\\?"([0-9T:.\-Z]+)')
+
+
+def fetch_document(session, url, marker=None):
+    """Stream a GET; return (ttfb_ms, marker_ms or None, total_ms, body, headers)"""
+    start = time.perf_counter()
+    response = session.get(url, stream=True, timeout=60)
+    response.raise_for_status()
+    ttfb = marker_at = None
+    body = b''
+    for chunk in response.iter_content(chunk_size=4096):
+        if ttfb is None:
+            ttfb = (time.perf_counter() - start) * 1000
+        body += chunk
+        if marker is not None and marker_at is None and marker in body:
+            marker_at = (time.perf_counter() - start) * 1000
+    total = (time.perf_counter() - start) * 1000
+    return ttfb or total, marker_at, total, body, response.headers
+
+
+def server_rendered(session, marker):
+    """ISR: the first product is in the HTML document itself"""
+    ttfb, content, _, _, headers = fetch_document(session, f"{BASE_URL_ENV}/", marker)
+    return ttfb, content, headers.get('x-nextjs-cache', '-')
+
+
+def client_rendered(client, executor):
+    """The old sequence: document, then /api/products and /api/categories in parallel after
+    hydration. JavaScript download and boot time are not included, so this is a lower bound."""
+    start = time.perf_counter()
+    ttfb, _, _, _, _ = fetch_document(client.session, f"{BASE_URL_ENV}/")
+    calls = [executor.submit(call) for call in (client.products, client.categories)]
+    for call in calls:
+        call.result()
+    return ttfb, (time.perf_counter() - start) * 1000
+
+
+def describe(values):
+    return f"p50 {statistics.median(values):>7.1f}ms  p95 {percentile(values, 95):>7.1f}ms"
+
+
+def generated_at(session):
+    body = fetch_document(session, f"{BASE_URL_ENV}/")[3]
+    match = GENERATED_AT_PATTERN.search(body)
+    return match.group(1).decode() if match else None
+
+
+def wait_for_regeneration(session, before, timeout):
+    """Poll the page until its catalog stamp changes; returns seconds waited or None"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        stamp = generated_at(session)
+        if stamp and stamp != before:
+            return time.perf_counter() - start
+        time.sleep(0.25)
+    return None
+
+
+def check_write_revalidation(client, timeout):
+    """Create and delete a product; each write should regenerate the page well before the time-based refresh"""
+    session = client.session
+    before = generated_at(session)
+    if before is None:
+        print("   ❌ Page has no server-rendered catalog (database unreachable at render?)")
+        return False
+
+    product = {
+        'name': f"منتج اختبار التجديد {uuid.uuid4().hex[:8]}",
+        'nameEn': 'Revalidation probe',
+        'price': 1,
+        'category': 'electronics',
+        'categoryAr': 'إلكترونيات',
+        'stock': 1,
+    }
+    product_id = client.create_product(product)['id']
+
+    created_lag = wait_for_regeneration(session, before, timeout)
+    after_create = generated_at(session)
+    client.delete_product(product_id)
+    deleted_lag = wait_for_regeneration(session, after_create, timeout)
+
+    for action, lag in (('create', created_lag), ('delete', deleted_lag)):
+        print(f"   {'✅' if lag is not None else '❌'} page regenerated after product {action}"
+              + (f" in {lag:.2f}s" if lag is not None else f" (not within {timeout:.0f}s)"))
+    return created_lag is not None and deleted_lag is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the server-rendered catalog page')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--check-write', action='store_true',
+                        help='verify that admin product writes regenerate the page')
+    parser.add_argument('--write-timeout', type=float, default=20.0,
+                        help='seconds to wait for write-triggered regeneration')
+    args = parser.parse_args()
+
+    print("⚡ CATALOG RENDER BENCHMARK")
+    print("=" * 80)
+    print(f"🔗 Site URL: {BASE_URL_ENV}")
+    print("=" * 80)
+
+    with make_client(pool_size=2, timeout=60) as client, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        # Page documents are fetched on the client's pooled session, like the API calls
+        session = client.session
+        products = client.products()
+        if not products:
+            print("❌ No products in the catalog")
+            return False
+        marker = products[0]['id'].encode()
+
+        # Warm up: the first request after a deploy may render the page
+        server_rendered(session, marker)
+
+        ssr_ttfb, ssr_content, cache_states = [], [], []
+        csr_ttfb, csr_content = [], []
+        for _ in range(args.iterations):
+            ttfb, content, cache_state = server_rendered(session, marker)
+            ssr_ttfb.append(ttfb)
+            cache_states.append(cache_state)
+            if content is not None:
+                ssr_content.append(content)
+            ttfb, content = client_rendered(client, executor)
+            csr_ttfb.append(ttfb)
+            csr_content.append(content)
+
+        print(f"\n📊 Home page, {args.iterations} iterations")
+        print(f"   server-rendered  first byte {describe(ssr_ttfb)}")
+        if ssr_content:
+            print(f"   server-rendered  content    {describe(ssr_content)}")
+        print(f"   client-rendered  first byte {describe(csr_ttfb)}")
+        print(f"   client-rendered  content    {describe(csr_content)}   (+ JS boot, not measured)")
+        hits = sum(state == 'HIT' for state in cache_states)
+        print(f"   ISR cache: {hits}/{len(cache_states)} HIT ({', '.join(sorted(set(cache_states)))})")
+
+        checks = {
+            'products are in the server-rendered HTML': len(ssr_content) == args.iterations,
+            'content arrives sooner when server-rendered': bool(ssr_content) and
+                statistics.median(ssr_content) < statistics.median(csr_content),
+        }
+        for name, ok in checks.items():
+            print(f"   {'✅' if ok else '❌'} {name}")
+
+        if args.check_write:
+            print("\n🔄 Write-triggered revalidation")
+            checks['write revalidation'] = check_write_revalidation(client, args.write_timeout)
+
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
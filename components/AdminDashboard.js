@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../contexts/AuthContext';
 import { Button } from './ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './ui/card';
@@ -24,18 +24,51 @@ import {
   TrendingDown
 } from 'lucide-react';
 import toast from 'react-hot-toast';
+import { ORDER_STATUS_LABELS, ORDER_TRANSITIONS } from '../lib/orderStatus';
+import { subscribeLive } from '../lib/liveClient';
+
+const ORDERS_PAGE_SIZE = 50;
+// New orders arriving together trigger one reload of the first page
+const NEW_ORDERS_RELOAD_DELAY_MS = 1000;
+
+// Replace changed records in place, append new ones and drop deleted ones
+function mergeById(records, changed, deletedIds = []) {
+  const updates = new Map(changed.map(record => [record.id, record]));
+  const deleted = new Set(deletedIds);
+  const known = new Set(records.map(record => record.id));
+  return [
+    ...records.filter(record => !deleted.has(record.id)).map(record => updates.get(record.id) || record),
+    ...changed.filter(record => !known.has(record.id) && !deleted.has(record.id))
+  ];
+}
+
+const newestFirst = (a, b) => b.createdAt.localeCompare(a.createdAt) || b.id.localeCompare(a.id);
+
+// The order list is a filtered, paginated prefix of all orders: unlisted orders
+// join it only when they fall within the pages loaded so far
+function mergeOrders(orders, changed, statusFilter, allLoaded) {
+  const updates = new Map(changed.map(order => [order.id, order]));
+  const known = new Set(orders.map(order => order.id));
+  const oldest = orders[orders.length - 1]?.createdAt;
+  return [
+    ...orders.map(order => updates.get(order.id) || order),
+    ...changed.filter(order => !known.has(order.id) && (allLoaded || order.createdAt >= oldest))
+  ]
+    .filter(order => !statusFilter || order.status === statusFilter)
+    .sort(newestFirst);
+}
 
 const AdminDashboard = ({ isOpen, onClose }) => {
   const { user } = useAuth();
   const [activeTab, setActiveTab] = useState('overview');
   const [products, setProducts] = useState([]);
   const [orders, setOrders] = useState([]);
+  const [ordersCursor, setOrdersCursor] = useState(null);
+  const [orderStatusFilter, setOrderStatusFilter] = useState('');
   const [users, setUsers] = useState([]);
   const [stats, setStats] = useState({
     totalOrders: 0,
-    totalRevenue: 0,
-    totalProducts: 0,
-    totalUsers: 0
+    totalRevenue: 0
   });
   const [loading, setLoading] = useState(true);
   const [newProduct, setNewProduct] = useState({
@@ -52,34 +85,79 @@ const AdminDashboard = ({ isOpen, onClose }) => {
 
   useEffect(() => {
     if (isOpen && user?.role === 'admin') {
-      fetchDashboardData();
+      refreshDashboard();
     }
   }, [isOpen, user]);
 
+  // The live handlers outlive renders, so they read the current filter from a ref
+  const orderStatusFilterRef = useRef(orderStatusFilter);
+  orderStatusFilterRef.current = orderStatusFilter;
+  const ordersCursorRef = useRef(ordersCursor);
+  ordersCursorRef.current = ordersCursor;
+
+  // Where the next delta sync starts (lib/adminSync.js); null until a full load has taken one
+  const changesCursorRef = useRef(null);
+  const syncingRef = useRef(null);
+  const syncAgainRef = useRef(false);
+
+  useEffect(() => {
+    if (!isOpen || user?.role !== 'admin') return;
+
+    let reloadTimer = null;
+    const unsubscribe = subscribeLive('/api/admin/live', {
+      stock: ({ productId, stock }) => {
+        setProducts(previous => previous.map(product =>
+          product.id === productId ? { ...product, stock } : product
+        ));
+      },
+      order: (order) => {
+        if (order.operation === 'insert') {
+          toast.success(`طلب جديد #${order.orderNumber}`);
+          setStats(previous => ({
+            ...previous,
+            totalOrders: previous.totalOrders + 1,
+            totalRevenue: previous.totalRevenue + (order.total || 0)
+          }));
+          // Events carry only the order's status fields; the list shows full orders
+          if (!reloadTimer) {
+            reloadTimer = setTimeout(() => {
+              reloadTimer = null;
+              refreshDashboard();
+            }, NEW_ORDERS_RELOAD_DELAY_MS);
+          }
+          return;
+        }
+
+        const filter = orderStatusFilterRef.current;
+        setOrders(previous => previous
+          .map(existing => existing.id === order.id ? { ...existing, status: order.status, updatedAt: order.updatedAt } : existing)
+          .filter(existing => !filter || existing.status === filter)
+        );
+      }
+    }, { onReconnect: refreshDashboard });
+
+    return () => {
+      clearTimeout(reloadTimer);
+      unsubscribe();
+    };
+  }, [isOpen, user]);
+
   const fetchDashboardData = async () => {
     setLoading(true);
     try {
-      const [productsRes, ordersRes, usersRes] = await Promise.all([
+      // The cursor trails the server clock, so taking it alongside the reads misses nothing
+      const [changesRes, productsRes, usersRes] = await Promise.all([
+        fetch('/api/admin/changes'),
         fetch('/api/admin/products'),
-        fetch('/api/admin/orders'),
-        fetch('/api/admin/users')
+        fetch('/api/admin/users'),
+        fetchSummary(),
+        fetchOrders(orderStatusFilterRef.current)
       ]);
 
-      const productsData = await productsRes.json();
-      const ordersData = await ordersRes.json();
-      const usersData = await usersRes.json();
-
-      setProducts(productsData);
-      setOrders(ordersData);
-      setUsers(usersData);
-
-      // Calculate stats
-      setStats({
-        totalOrders: ordersData.length,
-        totalRevenue: ordersData.reduce((sum, order) => sum + (order.total || 0), 0),
-        totalProducts: productsData.length,
-        totalUsers: usersData.length
-      });
+      const { cursor } = await changesRes.json();
+      setProducts(await productsRes.json());
+      setUsers(await usersRes.json());
+      changesCursorRef.current = cursor;
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
       toast.error('خطأ في تحميل بيانات لوحة التحكم');
@@ -88,6 +166,102 @@ const AdminDashboard = ({ isOpen, onClose }) => {
     }
   };
 
+  // Order totals come from a server-side aggregate; the order list is paginated
+  const fetchSummary = async () => {
+    const response = await fetch('/api/admin/orders/summary');
+    if (!response.ok) {
+      throw new Error('Failed to load order summary');
+    }
+    const summary = await response.json();
+    setStats({ totalOrders: summary.totalOrders, totalRevenue: summary.totalRevenue });
+  };
+
+  // Merge only the records changed since the last load, or reload in full when the server asks to
+  const pullChanges = async () => {
+    if (!changesCursorRef.current) {
+      return fetchDashboardData();
+    }
+
+    const params = new URLSearchParams({ since: changesCursorRef.current });
+    const response = await fetch(`/api/admin/changes?${params}`);
+    if (!response.ok) {
+      throw new Error('Failed to load changes');
+    }
+    const changes = await response.json();
+    if (changes.resync) {
+      return fetchDashboardData();
+    }
+
+    changesCursorRef.current = changes.cursor;
+    setProducts(previous => mergeById(previous, changes.products, changes.deleted.products));
+    setUsers(previous => mergeById(previous, changes.users));
+    setOrders(previous => mergeOrders(
+      previous, changes.orders, orderStatusFilterRef.current, !ordersCursorRef.current
+    ));
+    if (changes.orders.length > 0) {
+      await fetchSummary();
+    }
+  };
+
+  // One sync at a time; a request made during a sync runs another one after it,
+  // since the running one may have read before the change being waited for
+  const syncChanges = () => {
+    if (syncingRef.current) {
+      syncAgainRef.current = true;
+      return syncingRef.current;
+    }
+    syncingRef.current = (async () => {
+      try {
+        do {
+          syncAgainRef.current = false;
+          await pullChanges();
+        } while (syncAgainRef.current);
+      } finally {
+        syncingRef.current = null;
+      }
+    })();
+    return syncingRef.current;
+  };
+
+  const refreshDashboard = () => syncChanges().catch(error => {
+    console.error('Error syncing dashboard data:', error);
+    toast.error('خطأ في تحميل بيانات لوحة التحكم');
+  });
+
+  // Load the first page for a status filter, or append the next page when given a cursor
+  const fetchOrders = async (status, cursor = null) => {
+    const params = new URLSearchParams({ limit: ORDERS_PAGE_SIZE });
+    if (status) params.set('status', status);
+    if (cursor) params.set('cursor', cursor);
+
+    const response = await fetch(`/api/admin/orders?${params}`);
+    if (!response.ok) {
+      throw new Error('Failed to load orders');
+    }
+    const page = await response.json();
+    setOrders(previous => cursor ? [...previous, ...page.orders] : page.orders);
+    setOrdersCursor(page.nextCursor);
+  };
+
+  const handleOrderFilterChange = async (status) => {
+    setOrderStatusFilter(status);
+    try {
+      await fetchOrders(status);
+    } catch (error) {
+      console.error('Error loading orders:', error);
+      toast.error('خطأ في تحميل الطلبات');
+    }
+  };
+
+  const handleLoadMoreOrders = async () => {
+    try {
+      await fetchOrders(orderStatusFilter, ordersCursor);
+    } catch (error) {
+      console.error('Error loading orders:', error);
+      toast.error('خطأ في تحميل الطلبات');
+    }
+  };
+
   const handleAddProduct = async () => {
     try {
       const response = await fetch('/api/admin/products', {
@@ -109,7 +283,7 @@ const AdminDashboard = ({ isOpen, onClose }) => {
           image: '',
           stock: 0
         });
-        fetchDashboardData();
+        refreshDashboard();
       } else {
         throw new Error('Failed to add product');
       }
@@ -129,7 +303,11 @@ const AdminDashboard = ({ isOpen, onClose }) => {
 
       if (response.ok) {
         toast.success('تم تحديث حالة الطلب');
-        fetchDashboardData();
+        refreshDashboard();
+      } else if (response.status === 409) {
+        const { error } = await response.json();
+        toast.error(error);
+        refreshDashboard();
       } else {
         throw new Error('Failed to update order');
       }
@@ -149,7 +327,7 @@ const AdminDashboard = ({ isOpen, onClose }) => {
 
       if (response.ok) {
         toast.success('تم حذف المنتج');
-        fetchDashboardData();
+        refreshDashboard();
       } else {
         throw new Error('Failed to delete product');
       }
@@ -223,7 +401,7 @@ const AdminDashboard = ({ isOpen, onClose }) => {
                     <Package className="h-4 w-4 text-muted-foreground" />
                   </CardHeader>
                   <CardContent>
-                    <div className="text-2xl font-bold">{stats.totalProducts}</div>
+                    <div className="text-2xl font-bold">{products.length}</div>
                     <p className="text-xs text-muted-foreground">
                       في المخزون
                     </p>
@@ -236,7 +414,7 @@ const AdminDashboard = ({ isOpen, onClose }) => {
                     <Users className="h-4 w-4 text-muted-foreground" />
                   </CardHeader>
                   <CardContent>
-                    <div className="text-2xl font-bold">{stats.totalUsers}</div>
+                    <div className="text-2xl font-bold">{users.length}</div>
                     <p className="text-xs text-muted-foreground">
                       <TrendingUp className="inline w-3 h-3 mr-1" />
                       +5% من الشهر الماضي
@@ -404,6 +582,25 @@ const AdminDashboard = ({ isOpen, onClose }) => {
                   <CardTitle>إدارة الطلبات</CardTitle>
                 </CardHeader>
                 <CardContent>
+                  <div className="flex flex-wrap gap-2 mb-4">
+                    <Button
+                      size="sm"
+                      variant={orderStatusFilter === '' ? 'default' : 'outline'}
+                      onClick={() => handleOrderFilterChange('')}
+                    >
+                      الكل
+                    </Button>
+                    {Object.entries(ORDER_STATUS_LABELS).map(([status, label]) => (
+                      <Button
+                        key={status}
+                        size="sm"
+                        variant={orderStatusFilter === status ? 'default' : 'outline'}
+                        onClick={() => handleOrderFilterChange(status)}
+                      >
+                        {label}
+                      </Button>
+                    ))}
+                  </div>
                   <div className="space-y-4">
                     {orders.map((order) => (
                       <div key={order.id} className="p-4 border rounded-lg">
@@ -417,35 +614,32 @@ const AdminDashboard = ({ isOpen, onClose }) => {
                           <div className="text-right">
                             <p className="font-semibold">${order.total?.toFixed(2)}</p>
                             <Badge variant={order.status === 'completed' ? 'default' : 'secondary'}>
-                              {order.status}
+                              {ORDER_STATUS_LABELS[order.status] || order.status}
                             </Badge>
                           </div>
                         </div>
                         <div className="flex space-x-2 space-x-reverse mt-4">
-                          <Button 
-                            size="sm" 
-                            variant="outline"
-                            onClick={() => handleUpdateOrderStatus(order.id, 'processing')}
-                          >
-                            قيد المعالجة
-                          </Button>
-                          <Button 
-                            size="sm" 
-                            variant="outline"
-                            onClick={() => handleUpdateOrderStatus(order.id, 'shipped')}
-                          >
-                            تم الشحن
-                          </Button>
-                          <Button 
-                            size="sm"
-                            onClick={() => handleUpdateOrderStatus(order.id, 'completed')}
-                          >
-                            مكتمل
-                          </Button>
+                          {(ORDER_TRANSITIONS[order.status] || []).map((nextStatus) => (
+                            <Button 
+                              key={nextStatus}
+                              size="sm" 
+                              variant={nextStatus === 'cancelled' ? 'outline' : 'default'}
+                              onClick={() => handleUpdateOrderStatus(order.id, nextStatus)}
+                            >
+                              {ORDER_STATUS_LABELS[nextStatus]}
+                            </Button>
+                          ))}
                         </div>
                       </div>
                     ))}
                   </div>
+                  {ordersCursor && (
+                    <div className="flex justify-center mt-4">
+                      <Button variant="outline" onClick={handleLoadMoreOrders}>
+                        عرض المزيد
+                      </Button>
+                    </div>
+                  )}
                 </CardContent>
               </Card>
             </TabsContent>
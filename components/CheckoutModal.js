@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useAuth } from '../contexts/AuthContext';
 import { useStore } from '../contexts/StoreContext';
 import CouponSystem from './CouponSystem';
@@ -34,7 +34,7 @@ import toast from 'react-hot-toast';
 
 const CheckoutModal = ({ isOpen, onClose }) => {
   const { user } = useAuth();
-  const { cart, getCartTotal, formatPrice, clearCart, language } = useStore();
+  const { cart, getCartTotal, formatPrice, clearCart, language, revalidateCart } = useStore();
   const [loading, setLoading] = useState(false);
   const [step, setStep] = useState(1); // 1: Info, 2: Payment, 3: Confirmation
   const [appliedCoupon, setAppliedCoupon] = useState(null);
@@ -56,6 +56,11 @@ const CheckoutModal = ({ isOpen, onClose }) => {
   const [paymentMethod, setPaymentMethod] = useState('whatsapp');
   const [orderSummary, setOrderSummary] = useState(null);
 
+  // Prices in the stored cart may be stale; refresh them before the customer pays
+  useEffect(() => {
+    if (isOpen) revalidateCart();
+  }, [isOpen]);
+
   const totalAmount = getCartTotal();
   const discountAmount = appliedCoupon?.discount || 0;
   const finalAmount = totalAmount - discountAmount;
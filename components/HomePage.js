@@ -0,0 +1,837 @@
+'use client';
+
+import React, { useState, useEffect, useCallback, useMemo, useRef } from 'react';
+import { useAuth } from '../contexts/AuthContext';
+import { useStore } from '../contexts/StoreContext';
+import Header from './Header';
+import ShoppingCart from './ShoppingCart';
+import AdminDashboard from './AdminDashboard';
+import ProductImage from './ProductImage';
+import VirtualProductGrid from './VirtualProductGrid';
+import { subscribeLive } from '../lib/liveClient';
+import { Button } from './ui/button';
+import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
+import { Badge } from './ui/badge';
+import { Input } from './ui/input';
+import { Label } from './ui/label';
+import { 
+  Star, 
+  Heart, 
+  Truck, 
+  Shield, 
+  Headphones, 
+  Globe,
+  Filter,
+  SortAsc,
+  Grid,
+  List,
+  Zap,
+  Gift,
+  Users,
+  TrendingUp,
+  MessageCircle
+} from 'lucide-react';
+import { 
+  Select,
+  SelectContent,
+  SelectItem,
+  SelectTrigger,
+  SelectValue,
+} from './ui/select';
+import toast from 'react-hot-toast';
+
+// Search results (at most 100, ranked by the server) replace the catalog and are
+// filtered and sorted here; catalog pages arrive filtered and sorted (catalogQuery)
+const filterAndSortProducts = (products, { filterCategory, priceRange, sortBy }) => {
+  let filtered = [...products];
+
+  // Category filter
+  if (filterCategory !== 'all') {
+    filtered = filtered.filter(product => product.category === filterCategory);
+  }
+
+  // Price range filter
+  if (priceRange !== 'all') {
+    const [min, max] = priceRange.split('-').map(Number);
+    filtered = filtered.filter(product => {
+      const price = product.price;
+      return max ? (price >= min && price <= max) : price >= min;
+    });
+  }
+
+  // Sorting
+  switch (sortBy) {
+    case 'price-low':
+      filtered.sort((a, b) => a.price - b.price);
+      break;
+    case 'price-high':
+      filtered.sort((a, b) => b.price - a.price);
+      break;
+    case 'rating':
+      filtered.sort((a, b) => (b.rating || 0) - (a.rating || 0));
+      break;
+    case 'newest':
+      filtered.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt));
+      break;
+    default: // featured: keep the search relevance order
+      break;
+  }
+
+  return filtered;
+};
+
+const PRODUCTS_PAGE_SIZE = 100;
+
+// /api/products query for a catalog page. Filtering and sorting on the server keeps
+// every page in its final order, and a selective filter still fills the grid.
+const catalogQuery = ({ filterCategory, priceRange, sortBy }, cursor = '') => {
+  const params = new URLSearchParams({ cursor, limit: PRODUCTS_PAGE_SIZE, sort: sortBy });
+  if (filterCategory !== 'all') {
+    params.set('category', filterCategory);
+  }
+  if (priceRange !== 'all') {
+    const [min, max] = priceRange.split('-');
+    params.set('minPrice', min);
+    if (max) {
+      params.set('maxPrice', max);
+    }
+  }
+  return params;
+};
+
+// Memoized: a card re-renders only when its product, wishlist state or the
+// price format changes, not on every scroll or page load of the grid
+const ProductCard = React.memo(({ product, viewMode, inWishlist, onToggleWishlist, onAddToCart, formatPrice }) => {
+  const price = useMemo(() => formatPrice(product.price), [formatPrice, product.price]);
+  const originalPrice = useMemo(
+    () => (product.originalPrice && product.originalPrice > product.price ? formatPrice(product.originalPrice) : null),
+    [formatPrice, product.price, product.originalPrice]
+  );
+
+  return (
+    <Card className="group cursor-pointer hover:shadow-xl transition-all duration-300 overflow-hidden">
+      <CardContent className="p-0">
+        <div className="relative">
+          <ProductImage
+            product={product}
+            sizes={viewMode === 'grid' ? '(min-width: 1280px) 25vw, (min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw' : '100vw'}
+            className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
+          />
+          {product.discount && (
+            <Badge className="absolute top-2 left-2 bg-red-500 text-white">
+              -{product.discount}%
+            </Badge>
+          )}
+          <Button
+            variant="ghost"
+            size="sm"
+            className={`absolute top-2 right-2 bg-white/80 hover:bg-white transition-colors ${
+              inWishlist ? 'text-red-500' : 'text-gray-600'
+            }`}
+            onClick={(e) => {
+              e.stopPropagation();
+              onToggleWishlist(product, inWishlist);
+            }}
+          >
+            <Heart className={`w-4 h-4 ${inWishlist ? 'fill-current' : ''}`} />
+          </Button>
+        </div>
+                
+        <div className="p-4">
+          <h4 className="font-semibold mb-2 line-clamp-2 min-h-[3rem] group-hover:text-primary transition-colors">
+            {product.name}
+          </h4>
+                  
+          <div className="flex items-center mb-2">
+            <div className="flex items-center">
+              {[...Array(5)].map((_, i) => (
+                <Star
+                  key={i}
+                  className={`w-3 h-3 ${
+                    i < Math.floor(product.rating || 0) 
+                      ? 'text-yellow-400 fill-current' 
+                      : 'text-gray-300'
+                  }`}
+                />
+              ))}
+            </div>
+            <span className="text-sm text-gray-500 mr-1">
+              ({product.reviews || 0})
+            </span>
+          </div>
+                  
+          <div className="flex items-center justify-between mb-3">
+            <div>
+              <span className="text-lg font-bold text-primary">
+                {price}
+              </span>
+              {originalPrice && (
+                <span className="text-sm text-gray-500 line-through mr-2">
+                  {originalPrice}
+                </span>
+              )}
+            </div>
+            <Badge variant="secondary" className="text-xs">
+              {product.stock > 0 ? `متوفر (${product.stock})` : 'نفد المخزون'}
+            </Badge>
+          </div>
+                  
+          <Button 
+            className="w-full" 
+            onClick={(e) => {
+              e.stopPropagation();
+              onAddToCart(product);
+            }}
+            disabled={product.stock === 0}
+          >
+            {product.stock > 0 ? '🛒 أضف للسلة' : 'نفد المخزون'}
+          </Button>
+        </div>
+      </CardContent>
+    </Card>
+  );
+});
+ProductCard.displayName = 'ProductCard';
+
+
+// `initialCatalog` comes from the server-rendered page (app/page.js); without
+// it the first page is fetched from the API after hydration. Further pages
+// load as the grid scrolls near its end.
+const HomePage = ({ initialCatalog = null }) => {
+  const { user } = useAuth();
+  const { 
+    addToCart, 
+    addToWishlist, 
+    removeFromWishlist, 
+    wishlist, 
+    formatPrice, 
+    language,
+    currency
+  } = useStore();
+  
+  const [products, setProducts] = useState(initialCatalog?.products || []);
+  const [nextCursor, setNextCursor] = useState(initialCatalog?.nextCursor || null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const loadingMoreRef = useRef(false);
+  const catalogRequestRef = useRef(null);
+  const [categories, setCategories] = useState(initialCatalog?.categories || []);
+  const [showAuth, setShowAuth] = useState(false);
+  const [showCart, setShowCart] = useState(false);
+  const [showAdmin, setShowAdmin] = useState(false);
+  const [loading, setLoading] = useState(!initialCatalog);
+  const [viewMode, setViewMode] = useState('grid');
+  const [sortBy, setSortBy] = useState('featured');
+  const [filterCategory, setFilterCategory] = useState('all');
+  const [priceRange, setPriceRange] = useState('all');
+  const [searchQuery, setSearchQuery] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
+
+  const filters = useMemo(() => ({ filterCategory, priceRange, sortBy }), [filterCategory, priceRange, sortBy]);
+  const filtersKey = useMemo(() => catalogQuery(filters).toString(), [filters]);
+  // Filters the loaded pages belong to; the server-rendered page uses the defaults
+  const loadedFiltersRef = useRef(initialCatalog ? filtersKey : null);
+
+  useEffect(() => {
+    if (!initialCatalog) {
+      fetchInitialData();
+    }
+  }, []);
+
+  // Live stock; the server-rendered catalog may be up to a minute old
+  useEffect(() => subscribeLive('/api/live', {
+    stock: ({ productId, stock }) => {
+      setProducts(previous => previous.map(product =>
+        product.id === productId ? { ...product, stock } : product
+      ));
+    }
+  }), []);
+
+  const displayedProducts = useMemo(
+    () => (searchResults ? filterAndSortProducts(searchResults, filters) : products),
+    [products, searchResults, filters]
+  );
+
+  // Server-side search, debounced so typing does not fire a request per keystroke
+  useEffect(() => {
+    if (!searchQuery.trim()) {
+      setSearchResults(null);
+      return;
+    }
+
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(
+          `/api/products/search?q=${encodeURIComponent(searchQuery)}&limit=100`,
+          { signal: controller.signal }
+        );
+        setSearchResults(await response.json());
+      } catch (error) {
+        if (error.name !== 'AbortError') {
+          console.error('Error searching products:', error);
+        }
+      }
+    }, 250);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [searchQuery]);
+
+  const fetchInitialData = async () => {
+    loadedFiltersRef.current = filtersKey;
+    try {
+      const [productsRes, categoriesRes] = await Promise.all([
+        fetch(`/api/products?${filtersKey}`),
+        fetch('/api/categories')
+      ]);
+      
+      const productsPage = await productsRes.json();
+      const categoriesData = await categoriesRes.json();
+      
+      setProducts(productsPage.products);
+      setNextCursor(productsPage.nextCursor);
+      setCategories(categoriesData);
+    } catch (error) {
+      console.error('Error fetching data:', error);
+      toast.error('خطأ في تحميل البيانات');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // A catalog page for the current filters. The first page (empty cursor) replaces the
+  // list and cancels any page still loading for the previous filters.
+  const loadCatalogPage = useCallback(async (cursor) => {
+    const firstPage = !cursor;
+    if (firstPage) {
+      catalogRequestRef.current?.abort();
+    } else if (loadingMoreRef.current) {
+      return;
+    }
+    const controller = new AbortController();
+    catalogRequestRef.current = controller;
+    loadingMoreRef.current = true;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(`/api/products?${catalogQuery(filters, cursor)}`, { signal: controller.signal });
+      if (!response.ok) {
+        throw new Error('Failed to load products');
+      }
+      const page = await response.json();
+      setProducts(previous => (firstPage ? page.products : [...previous, ...page.products]));
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      if (error.name !== 'AbortError') {
+        console.error('Error loading products:', error);
+        toast.error('خطأ في تحميل المنتجات');
+      }
+    } finally {
+      if (catalogRequestRef.current === controller) {
+        catalogRequestRef.current = null;
+        loadingMoreRef.current = false;
+        setLoadingMore(false);
+      }
+    }
+  }, [filters]);
+
+  useEffect(() => {
+    if (loadedFiltersRef.current === filtersKey) return;
+    loadedFiltersRef.current = filtersKey;
+    loadCatalogPage('');
+  }, [filtersKey, loadCatalogPage]);
+
+  // Next page, appended when the grid nears its end; search results are not paged
+  const loadMoreProducts = useCallback(() => {
+    if (nextCursor && !searchResults) {
+      loadCatalogPage(nextCursor);
+    }
+  }, [nextCursor, searchResults, loadCatalogPage]);
+
+  const wishlistIds = useMemo(() => new Set(wishlist.map(item => item.id)), [wishlist]);
+
+  const handleWishlistToggle = useCallback((product, inWishlist) => {
+    if (inWishlist) {
+      removeFromWishlist(product.id);
+    } else {
+      addToWishlist(product);
+    }
+  }, [addToWishlist, removeFromWishlist]);
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center min-h-screen">
+        <div className="animate-spin rounded-full h-32 w-32 border-b-2 border-primary"></div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="min-h-screen bg-background">
+      <Header 
+        onAuthClick={() => setShowAuth(true)}
+        onCartClick={() => setShowCart(true)}
+      />
+
+      {/* Hero Section */}
+      <section className="bg-gradient-to-r from-blue-600 via-purple-600 to-blue-800 text-white py-20">
+        <div className="container mx-auto px-4 text-center">
+          <div className="max-w-4xl mx-auto">
+            <h2 className="text-4xl md:text-6xl font-bold mb-6 animate-fade-in">
+              {language === 'ar' ? 'متجرك الإلكتروني الشامل' : 'Your Complete Online Store'}
+            </h2>
+            <p className="text-xl md:text-2xl mb-8 opacity-90">
+              {language === 'ar' 
+                ? 'إلكترونيات • ملابس • مواد غذائية • وأكثر - دعم العملات المتعددة'
+                : 'Electronics • Clothing • Food • and More - Multi-Currency Support'
+              }
+            </p>
+            
+            {/* Feature Highlights */}
+            <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mb-8">
+              {[
+                { icon: Zap, text: 'سرعة في التوصيل' },
+                { icon: Shield, text: 'دفع آمن' },
+                { icon: Gift, text: 'عروض حصرية' },
+                { icon: MessageCircle, text: 'دعم WhatsApp' }
+              ].map((feature, index) => (
+                <div key={index} className="flex flex-col items-center p-4 bg-white/10 rounded-lg backdrop-blur-sm">
+                  <feature.icon className="w-8 h-8 mb-2" />
+                  <span className="text-sm">{feature.text}</span>
+                </div>
+              ))}
+            </div>
+
+            <div className="flex justify-center mb-8">
+              <img 
+                src="https://images.unsplash.com/photo-1592839930500-3445eb72b8ad?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzV8MHwxfHNlYXJjaHwxfHxvbmxpbmUlMjBzaG9wcGluZ3xlbnwwfHx8Ymx1ZXwxNzUzNTYyMzc1fDA&ixlib=rb-4.1.0&q=85" 
+                alt="متجر إلكتروني" 
+                className="rounded-lg shadow-2xl max-w-md w-full transform hover:scale-105 transition-transform"
+              />
+            </div>
+            
+            <Button 
+              size="lg" 
+              variant="secondary" 
+              className="text-lg px-8 py-3 hover:scale-105 transition-transform"
+            >
+              {language === 'ar' ? 'ابدأ التسوق الآن' : 'Start Shopping Now'}
+            </Button>
+          </div>
+        </div>
+      </section>
+
+      {/* Quick Stats */}
+      <section className="py-12 bg-white">
+        <div className="container mx-auto px-4">
+          <div className="grid grid-cols-2 md:grid-cols-4 gap-6 text-center">
+            {[
+              { number: '1000+', label: 'منتج متنوع', icon: Package },
+              { number: '50+', label: 'علامة تجارية', icon: Star },
+              { number: '24/7', label: 'دعم العملاء', icon: Headphones },
+              { number: '99%', label: 'رضا العملاء', icon: Users }
+            ].map((stat, index) => (
+              <div key={index} className="p-6">
+                <stat.icon className="w-12 h-12 text-primary mx-auto mb-4" />
+                <div className="text-3xl font-bold text-primary mb-2">{stat.number}</div>
+                <div className="text-gray-600">{stat.label}</div>
+              </div>
+            ))}
+          </div>
+        </div>
+      </section>
+
+      {/* Categories */}
+      <section className="py-16 bg-gray-50">
+        <div className="container mx-auto px-4">
+          <h3 className="text-3xl font-bold text-center mb-12">
+            {language === 'ar' ? 'تسوق حسب القسم' : 'Shop by Category'}
+          </h3>
+          <div className="grid grid-cols-2 md:grid-cols-4 gap-6">
+            {categories.map((category) => (
+              <Card 
+                key={category.id} 
+                className="cursor-pointer hover:shadow-xl transition-all duration-300 group overflow-hidden"
+                onClick={() => setFilterCategory(category.slug)}
+              >
+                <CardContent className="p-6 text-center">
+                  <div className="w-full h-32 mb-4 rounded-lg overflow-hidden">
+                    <img 
+                      src={category.image} 
+                      alt={category.name}
+                      className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
+                    />
+                  </div>
+                  <span className="text-4xl mb-2 block">{category.icon}</span>
+                  <h4 className="font-semibold text-lg">{category.name}</h4>
+                  <p className="text-sm text-gray-500 mt-1">{category.description}</p>
+                </CardContent>
+              </Card>
+            ))}
+          </div>
+        </div>
+      </section>
+
+      {/* Products Section */}
+      <section className="py-16">
+        <div className="container mx-auto px-4">
+          {/* Section Header with Filters */}
+          <div className="flex flex-col md:flex-row items-center justify-between mb-12">
+            <h3 className="text-3xl font-bold mb-4 md:mb-0">
+              {language === 'ar' ? 'منتجاتنا المميزة' : 'Featured Products'}
+            </h3>
+            
+            <div className="flex items-center space-x-4 space-x-reverse">
+              {/* Search */}
+              <div className="relative">
+                <Input
+                  placeholder="البحث..."
+                  value={searchQuery}
+                  onChange={(e) => setSearchQuery(e.target.value)}
+                  className="w-48"
+                />
+              </div>
+
+              {/* Category Filter */}
+              <Select value={filterCategory} onValueChange={setFilterCategory}>
+                <SelectTrigger className="w-40">
+                  <SelectValue placeholder="القسم" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="all">كل الأقسام</SelectItem>
+                  {categories.map((cat) => (
+                    <SelectItem key={cat.slug} value={cat.slug}>
+                      {cat.name}
+                    </SelectItem>
+                  ))}
+                </SelectContent>
+              </Select>
+
+              {/* Price Range Filter */}
+              <Select value={priceRange} onValueChange={setPriceRange}>
+                <SelectTrigger className="w-40">
+                  <SelectValue placeholder="السعر" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="all">كل الأسعار</SelectItem>
+                  <SelectItem value="0-50">أقل من $50</SelectItem>
+                  <SelectItem value="50-200">$50 - $200</SelectItem>
+                  <SelectItem value="200-500">$200 - $500</SelectItem>
+                  <SelectItem value="500">أكثر من $500</SelectItem>
+                </SelectContent>
+              </Select>
+
+              {/* Sort */}
+              <Select value={sortBy} onValueChange={setSortBy}>
+                <SelectTrigger className="w-40">
+                  <SelectValue placeholder="الترتيب" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="featured">المميز</SelectItem>
+                  <SelectItem value="newest">الأحدث</SelectItem>
+                  <SelectItem value="price-low">السعر: منخفض إلى عالي</SelectItem>
+                  <SelectItem value="price-high">السعر: عالي إلى منخفض</SelectItem>
+                  <SelectItem value="rating">الأعلى تقييماً</SelectItem>
+                </SelectContent>
+              </Select>
+
+              {/* View Mode */}
+              <div className="flex border rounded-lg">
+                <Button
+                  variant={viewMode === 'grid' ? 'default' : 'ghost'}
+                  size="sm"
+                  onClick={() => setViewMode('grid')}
+                >
+                  <Grid className="w-4 h-4" />
+                </Button>
+                <Button
+                  variant={viewMode === 'list' ? 'default' : 'ghost'}
+                  size="sm"
+                  onClick={() => setViewMode('list')}
+                >
+                  <List className="w-4 h-4" />
+                </Button>
+              </div>
+            </div>
+          </div>
+
+          {/* Products Grid: only the rows near the viewport are rendered */}
+          <VirtualProductGrid
+            items={displayedProducts}
+            className={`grid gap-6 ${
+              viewMode === 'grid'
+                ? 'grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4'
+                : 'grid-cols-1'
+            }`}
+            onEndReached={loadMoreProducts}
+            renderItem={(product) => (
+              <ProductCard
+                product={product}
+                viewMode={viewMode}
+                inWishlist={wishlistIds.has(product.id)}
+                onToggleWishlist={handleWishlistToggle}
+                onAddToCart={addToCart}
+                formatPrice={formatPrice}
+              />
+            )}
+          />
+
+          {loadingMore && (
+            <div className="flex justify-center py-6">
+              <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-primary"></div>
+            </div>
+          )}
+
+          {displayedProducts.length === 0 && !loadingMore && (
+            <div className="text-center py-12">
+              <p className="text-gray-500 text-lg">لا توجد منتجات تطابق البحث</p>
+            </div>
+          )}
+        </div>
+      </section>
+
+      {/* Features */}
+      <section className="py-16 bg-gray-50">
+        <div className="container mx-auto px-4">
+          <h3 className="text-3xl font-bold text-center mb-12">لماذا تختار متجرنا؟</h3>
+          <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-8">
+            {[
+              { 
+                icon: Truck, 
+                title: 'شحن سريع', 
+                description: 'توصيل مجاني للطلبات أكثر من $100',
+                color: 'text-blue-500'
+              },
+              { 
+                icon: Shield, 
+                title: 'دفع آمن', 
+                description: 'معاملات محمية بأحدث التقنيات',
+                color: 'text-green-500'
+              },
+              { 
+                icon: Headphones, 
+                title: 'دعم 24/7', 
+                description: 'خدمة عملاء متاحة على مدار الساعة',
+                color: 'text-purple-500'
+              },
+              { 
+                icon: Globe, 
+                title: 'عملات متعددة', 
+                description: 'ادفع بالعملة التي تناسبك',
+                color: 'text-orange-500'
+              }
+            ].map((feature, index) => (
+              <div key={index} className="text-center p-6 bg-white rounded-lg hover:shadow-lg transition-shadow">
+                <feature.icon className={`w-12 h-12 ${feature.color} mx-auto mb-4`} />
+                <h4 className="font-semibold mb-2 text-lg">{feature.title}</h4>
+                <p className="text-gray-600 text-sm leading-relaxed">{feature.description}</p>
+              </div>
+            ))}
+          </div>
+        </div>
+      </section>
+
+      {/* Auth Modal */}
+      {showAuth && (
+        <AuthModal onClose={() => setShowAuth(false)} />
+      )}
+
+      {/* Shopping Cart */}
+      <ShoppingCart isOpen={showCart} onClose={() => setShowCart(false)} />
+
+      {/* Admin Dashboard */}
+      {user?.role === 'admin' && (
+        <>
+          <Button
+            onClick={() => setShowAdmin(true)}
+            className="fixed bottom-4 left-4 z-40"
+            size="lg"
+          >
+            🔧 لوحة التحكم
+          </Button>
+          <AdminDashboard isOpen={showAdmin} onClose={() => setShowAdmin(false)} />
+        </>
+      )}
+
+      {/* Footer */}
+      <footer className="bg-gray-900 text-white py-16">
+        <div className="container mx-auto px-4">
+          <div className="grid grid-cols-1 md:grid-cols-4 gap-8 mb-8">
+            <div>
+              <h5 className="font-bold text-lg mb-4">متجري</h5>
+              <p className="text-gray-400 mb-4">
+                متجرك الإلكتروني الشامل لكل احتياجاتك مع دعم العملات المتعددة
+              </p>
+              <div className="flex space-x-4 space-x-reverse">
+                <Button variant="ghost" size="sm" className="text-gray-400 hover:text-white">
+                  📘
+                </Button>
+                <Button variant="ghost" size="sm" className="text-gray-400 hover:text-white">
+                  📷
+                </Button>
+                <Button variant="ghost" size="sm" className="text-gray-400 hover:text-white">
+                  🐦
+                </Button>
+              </div>
+            </div>
+            
+            <div>
+              <h6 className="font-semibold mb-4">روابط سريعة</h6>
+              <ul className="space-y-2 text-gray-400">
+                <li className="hover:text-white cursor-pointer">الرئيسية</li>
+                <li className="hover:text-white cursor-pointer">المنتجات</li>
+                <li className="hover:text-white cursor-pointer">العروض</li>
+                <li className="hover:text-white cursor-pointer">اتصل بنا</li>
+              </ul>
+            </div>
+            
+            <div>
+              <h6 className="font-semibold mb-4">الدعم</h6>
+              <ul className="space-y-2 text-gray-400">
+                <li className="hover:text-white cursor-pointer">مركز المساعدة</li>
+                <li className="hover:text-white cursor-pointer">سياسة الإرجاع</li>
+                <li className="hover:text-white cursor-pointer">الشحن والتوصيل</li>
+                <li className="hover:text-white cursor-pointer">الأمان والخصوصية</li>
+              </ul>
+            </div>
+            
+            <div>
+              <h6 className="font-semibold mb-4">تواصل معنا</h6>
+              <ul className="space-y-2 text-gray-400">
+                <li className="flex items-center">
+                  <MessageCircle className="w-4 h-4 mr-2" />
+                  +963 955 186 181
+                </li>
+                <li>📧 info@mystore.com</li>
+                <li>🌍 دمشق، سوريا</li>
+              </ul>
+              <div className="mt-4">
+                <h6 className="font-semibold mb-2">العملات المدعومة</h6>
+                <div className="flex flex-wrap gap-2">
+                  {['USD', 'EUR', 'SAR', 'AED', 'SYP'].map(curr => (
+                    <Badge key={curr} variant="outline" className="text-gray-400">
+                      {curr}
+                    </Badge>
+                  ))}
+                </div>
+              </div>
+            </div>
+          </div>
+          
+          <div className="border-t border-gray-800 pt-8 text-center text-gray-400">
+            <p>&copy; 2024 متجري. جميع الحقوق محفوظة. | Built with ❤️ for modern e-commerce</p>
+          </div>
+        </div>
+      </footer>
+    </div>
+  );
+};
+
+// Auth Modal Component (existing code...)
+const AuthModal = ({ onClose }) => {
+  const { signup, login } = useAuth();
+  const [isLogin, setIsLogin] = useState(true);
+  const [email, setEmail] = useState('');
+  const [password, setPassword] = useState('');
+  const [name, setName] = useState('');
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState('');
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+    setError('');
+
+    try {
+      if (isLogin) {
+        await login(email, password);
+      } else {
+        await signup(email, password, name);
+      }
+      onClose();
+      toast.success(isLogin ? 'مرحباً بك مرة أخرى!' : 'مرحباً بك في متجرنا!');
+    } catch (error) {
+      setError(error.message);
+      toast.error('خطأ في تسجيل الدخول');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50">
+      <Card className="w-full max-w-md m-4">
+        <CardHeader>
+          <CardTitle className="text-center">
+            {isLogin ? '🔐 تسجيل دخول' : '🎉 حساب جديد'}
+          </CardTitle>
+          <CardDescription className="text-center">
+            {isLogin 
+              ? 'أدخل بياناتك لتسجيل الدخول' 
+              : 'انشئ حساباً جديداً واحصل على 2000 ل.س رصيد ترحيبي'
+            }
+          </CardDescription>
+        </CardHeader>
+        <CardContent>
+          <form onSubmit={handleSubmit} className="space-y-4">
+            {!isLogin && (
+              <div>
+                <Label className="block text-sm font-medium mb-1">الاسم الكامل</Label>
+                <Input
+                  type="text"
+                  value={name}
+                  onChange={(e) => setName(e.target.value)}
+                  required={!isLogin}
+                  placeholder="أدخل اسمك الكامل"
+                />
+              </div>
+            )}
+            <div>
+              <Label className="block text-sm font-medium mb-1">البريد الإلكتروني</Label>
+              <Input
+                type="email"
+                value={email}
+                onChange={(e) => setEmail(e.target.value)}
+                required
+                placeholder="example@email.com"
+              />
+            </div>
+            <div>
+              <Label className="block text-sm font-medium mb-1">كلمة المرور</Label>
+              <Input
+                type="password"
+                value={password}
+                onChange={(e) => setPassword(e.target.value)}
+                required
+                placeholder="أدخل كلمة المرور"
+              />
+            </div>
+            {error && (
+              <div className="text-red-500 text-sm text-center">{error}</div>
+            )}
+            <Button type="submit" className="w-full" disabled={loading}>
+              {loading ? 'جارٍ التحميل...' : (isLogin ? '🚀 تسجيل دخول' : '🎊 إنشاء حساب')}
+            </Button>
+          </form>
+          
+          <div className="mt-6 text-center">
+            <button
+              type="button"
+              onClick={() => setIsLogin(!isLogin)}
+              className="text-primary hover:underline text-sm"
+            >
+              {isLogin ? 'ليس لديك حساب؟ سجل الآن' : 'لديك حساب؟ سجل دخول'}
+            </button>
+          </div>
+          
+          <Button variant="ghost" onClick={onClose} className="w-full mt-4">
+            إغلاق
+          </Button>
+        </CardContent>
+      </Card>
+    </div>
+  );
+};
+
+export default HomePage;
\ No newline at end of file
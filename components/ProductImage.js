@@ -0,0 +1,27 @@
+'use client';
+
+import React from 'react';
+import { productImageSources } from '../lib/imageUrls';
+
+// Responsive product image: AVIF/WebP variants from /api/images when the
+// product's image has been ingested, otherwise the original URL
+const ProductImage = ({ product, sizes = '100vw', className, alt }) => {
+  const { sources, src } = productImageSources(product);
+
+  return (
+    <picture>
+      {sources.map((source) => (
+        <source key={source.type} type={source.type} srcSet={source.srcSet} sizes={sizes} />
+      ))}
+      <img
+        src={src}
+        alt={alt || product.name}
+        className={className}
+        loading="lazy"
+        decoding="async"
+      />
+    </picture>
+  );
+};
+
+export default ProductImage;
@@ -0,0 +1,101 @@
+'use client';
+
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+
+// Window-scrolled virtual grid: only the rows near the viewport are in the DOM,
+// with padding standing in for the rows above and below. Columns come from the
+// CSS grid itself (responsive classes), and the row pitch is measured from the
+// rendered rows, so cards only need roughly uniform heights. The first
+// INITIAL_ROWS rows are rendered on the server and before the first measure.
+
+const INITIAL_ROWS = 8;
+const OVERSCAN_ROWS = 3;
+// onEndReached fires when the rendered rows come this close to the last one
+const END_THRESHOLD_ROWS = 4;
+const ESTIMATED_ROW_PITCH = 440;
+
+function gridColumns(grid) {
+  return getComputedStyle(grid).gridTemplateColumns.split(' ').filter(Boolean).length || 1;
+}
+
+const VirtualProductGrid = ({ items, className, renderItem, onEndReached, getKey = item => item.id }) => {
+  const containerRef = useRef(null);
+  const gridRef = useRef(null);
+  const [layout, setLayout] = useState({ columns: 1, pitch: ESTIMATED_ROW_PITCH });
+  const [rows, setRows] = useState({ start: 0, end: INITIAL_ROWS });
+
+  const totalRows = Math.ceil(items.length / layout.columns);
+  const start = Math.min(rows.start, Math.max(totalRows - 1, 0));
+  const end = Math.min(Math.max(rows.end, start + 1), totalRows);
+
+  // Which rows the viewport (plus overscan) covers; state only changes when that range does
+  const updateRows = useCallback(() => {
+    const container = containerRef.current;
+    if (!container) return;
+    const offset = Math.max(0, -container.getBoundingClientRect().top);
+    const first = Math.floor(offset / layout.pitch);
+    const visible = Math.ceil(window.innerHeight / layout.pitch) + 1;
+    const next = { start: Math.max(0, first - OVERSCAN_ROWS), end: first + visible + OVERSCAN_ROWS };
+    setRows(previous => (previous.start === next.start && previous.end === next.end ? previous : next));
+  }, [layout.pitch]);
+
+  // Re-measure after rendering: column count from the CSS grid, pitch from the rendered rows
+  useEffect(() => {
+    const grid = gridRef.current;
+    const renderedRows = end - start;
+    if (!grid || renderedRows <= 0) return;
+    const columns = gridColumns(grid);
+    const rowGap = parseFloat(getComputedStyle(grid).rowGap) || 0;
+    const pitch = Math.round((grid.offsetHeight + rowGap) / Math.ceil(grid.childElementCount / columns));
+    setLayout(previous => (
+      previous.columns === columns && Math.abs(previous.pitch - pitch) < 2 ? previous : { columns, pitch }
+    ));
+  });
+
+  useEffect(() => {
+    let frame = null;
+    const schedule = () => {
+      if (frame === null) {
+        frame = requestAnimationFrame(() => {
+          frame = null;
+          updateRows();
+        });
+      }
+    };
+    updateRows();
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule);
+    return () => {
+      cancelAnimationFrame(frame);
+      window.removeEventListener('scroll', schedule);
+      window.removeEventListener('resize', schedule);
+    };
+  }, [updateRows]);
+
+  useEffect(() => {
+    if (onEndReached && items.length > 0 && end >= totalRows - END_THRESHOLD_ROWS) {
+      onEndReached();
+    }
+  }, [end, totalRows, items.length, onEndReached]);
+
+  const visibleItems = items.slice(start * layout.columns, end * layout.columns);
+
+  return (
+    <div
+      ref={containerRef}
+      data-product-count={items.length}
+      style={{
+        paddingTop: start * layout.pitch,
+        paddingBottom: Math.max(0, totalRows - end) * layout.pitch
+      }}
+    >
+      <div ref={gridRef} className={className}>
+        {visibleItems.map(item => (
+          <React.Fragment key={getKey(item)}>{renderItem(item)}</React.Fragment>
+        ))}
+      </div>
+    </div>
+  );
+};
+
+export default VirtualProductGrid;
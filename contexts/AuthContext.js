@@ -50,7 +50,7 @@ export const AuthProvider = ({ children }) => {
       const { user } = await createUserWithEmailAndPassword(auth, email, password);
       await updateProfile(user, { displayName: name });
       
-      // Create user in our database with initial wallet balance
+      // Create user in our database; the server opens the wallet with the welcome balance
       await fetch('/api/users', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -58,7 +58,6 @@ export const AuthProvider = ({ children }) => {
           uid: user.uid,
           email: user.email,
           name: name,
-          walletBalance: 2000, // Initial balance in Syrian Pounds
           role: 'user',
           createdAt: new Date().toISOString()
         })
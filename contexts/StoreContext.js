@@ -1,10 +1,36 @@
 'use client';
 
-import React, { createContext, useContext, useEffect, useState } from 'react';
+import React, { createContext, useCallback, useContext, useEffect, useMemo, useState } from 'react';
 import toast from 'react-hot-toast';
 
 const StoreContext = createContext();
 
+// Matches the server's limit on ids per /api/products?ids= request
+const MAX_BATCH_IDS = 200;
+
+// Building an Intl.NumberFormat is far slower than using one, so each
+// (language, currency) formatter is built once and kept for the page's lifetime
+const formatters = new Map();
+
+function priceFormatter(language, currency) {
+  const key = currency === 'SYP' ? currency : `${language}:${currency}`;
+  let formatter = formatters.get(key);
+  if (!formatter) {
+    formatter = currency === 'SYP'
+      ? new Intl.NumberFormat('ar-SA', { maximumFractionDigits: 0 })
+      : new Intl.NumberFormat(language === 'ar' ? 'ar-SA' : 'en-US', {
+        style: 'currency',
+        currency,
+        minimumFractionDigits: 2
+      });
+    formatters.set(key, formatter);
+  }
+  return formatter;
+}
+
+// Formatted prices are cached per currency; the cache is dropped when the language or a rate changes
+const PRICE_CACHE_LIMIT = 20000;
+
 export const useStore = () => {
   const context = useContext(StoreContext);
   if (!context) {
@@ -16,6 +42,7 @@ export const useStore = () => {
 export const StoreProvider = ({ children }) => {
   const [cart, setCart] = useState([]);
   const [wishlist, setWishlist] = useState([]);
+  const [cartLoaded, setCartLoaded] = useState(false);
   const [currency, setCurrency] = useState('USD');
   const [language, setLanguage] = useState('ar');
   const [exchangeRates, setExchangeRates] = useState({
@@ -27,42 +54,35 @@ export const StoreProvider = ({ children }) => {
   });
 
   // Currency conversion
-  const convertPrice = (price, fromCurrency = 'USD', toCurrency = null) => {
+  const convertPrice = useCallback((price, fromCurrency = 'USD', toCurrency = null) => {
     const targetCurrency = toCurrency || currency;
     if (fromCurrency === targetCurrency) return price;
     
     const usdPrice = price / exchangeRates[fromCurrency];
     return usdPrice * exchangeRates[targetCurrency];
-  };
+  }, [currency, exchangeRates]);
 
-  // Format price with currency symbol
-  const formatPrice = (price, currencyCode = null) => {
-    const targetCurrency = currencyCode || currency;
-    const convertedPrice = convertPrice(price, 'USD', targetCurrency);
-    
-    const currencySymbols = {
-      USD: '$',
-      EUR: '€',
-      SAR: 'ر.س',
-      AED: 'د.إ',
-      SYP: 'ل.س'
-    };
-
-    const formatter = new Intl.NumberFormat(language === 'ar' ? 'ar-SA' : 'en-US', {
-      style: 'currency',
-      currency: targetCurrency === 'SYP' ? 'USD' : targetCurrency,
-      minimumFractionDigits: targetCurrency === 'SYP' ? 0 : 2
-    });
+  const priceCache = useMemo(() => new Map(), [language, exchangeRates]);
 
-    if (targetCurrency === 'SYP') {
-      return `${Math.round(convertedPrice).toLocaleString('ar-SA')} ل.س`;
+  // Format price with currency symbol. Stable until the currency, language or
+  // rates change, so memoized product cards only re-render when prices do
+  const formatPrice = useCallback((price, currencyCode = null) => {
+    const targetCurrency = currencyCode || currency;
+    const key = `${targetCurrency}:${price}`;
+    let formatted = priceCache.get(key);
+    if (formatted === undefined) {
+      const convertedPrice = convertPrice(price, 'USD', targetCurrency);
+      formatted = targetCurrency === 'SYP'
+        ? `${priceFormatter(language, targetCurrency).format(Math.round(convertedPrice))} ل.س`
+        : priceFormatter(language, targetCurrency).format(convertedPrice);
+      if (priceCache.size >= PRICE_CACHE_LIMIT) priceCache.clear();
+      priceCache.set(key, formatted);
     }
-
-    return formatter.format(convertedPrice);
-  };
+    return formatted;
+  }, [currency, language, convertPrice, priceCache]);
 
   // Add to cart
-  const addToCart = (product, quantity = 1) => {
+  const addToCart = useCallback((product, quantity = 1) => {
     setCart(prevCart => {
       const existingItem = prevCart.find(item => item.id === product.id);
       if (existingItem) {
@@ -78,7 +98,7 @@ export const StoreProvider = ({ children }) => {
       toast.success('تم إضافة المنتج إلى السلة');
       return [...prevCart, { ...product, quantity }];
     });
-  };
+  }, []);
 
   // Remove from cart
   const removeFromCart = (productId) => {
@@ -112,7 +132,7 @@ export const StoreProvider = ({ children }) => {
   };
 
   // Add to wishlist
-  const addToWishlist = (product) => {
+  const addToWishlist = useCallback((product) => {
     setWishlist(prevWishlist => {
       const existingItem = prevWishlist.find(item => item.id === product.id);
       if (existingItem) {
@@ -123,16 +143,16 @@ export const StoreProvider = ({ children }) => {
       toast.success('تم إضافة المنتج إلى قائمة الأمنيات');
       return [...prevWishlist, product];
     });
-  };
+  }, []);
 
   // Remove from wishlist
-  const removeFromWishlist = (productId) => {
+  const removeFromWishlist = useCallback((productId) => {
     setWishlist(prevWishlist => {
       const updatedWishlist = prevWishlist.filter(item => item.id !== productId);
       toast.success('تم إزالة المنتج من قائمة الأمنيات');
       return updatedWishlist;
     });
-  };
+  }, []);
 
   // Get cart total
   const getCartTotal = () => {
@@ -147,6 +167,50 @@ export const StoreProvider = ({ children }) => {
     return cart.reduce((count, item) => count + item.quantity, 0);
   };
 
+  // Refresh price and stock of the stored cart and wishlist copies with one
+  // batch request; unavailable products are dropped from the cart
+  const revalidateCart = async () => {
+    const ids = [...new Set([...cart, ...wishlist].map(item => item.id))];
+    if (ids.length === 0) return;
+
+    try {
+      const chunks = [];
+      for (let start = 0; start < ids.length; start += MAX_BATCH_IDS) {
+        chunks.push(ids.slice(start, start + MAX_BATCH_IDS));
+      }
+      const batches = await Promise.all(chunks.map(async (chunk) => {
+        const response = await fetch(`/api/products?ids=${chunk.map(encodeURIComponent).join(',')}`);
+        if (!response.ok) {
+          throw new Error(`Product batch lookup failed: HTTP ${response.status}`);
+        }
+        return response.json();
+      }));
+      const products = batches.flatMap(batch => batch.products);
+      const missing = batches.flatMap(batch => batch.missing);
+
+      const latest = new Map(products.map(product => [product.id, product]));
+      const gone = new Set(missing);
+      const inStock = (item) => !gone.has(item.id) && latest.get(item.id)?.available !== false;
+      const refresh = (item) => {
+        const current = latest.get(item.id);
+        return current
+          ? { ...item, price: current.price, originalPrice: current.originalPrice, stock: current.stock }
+          : item;
+      };
+
+      const removed = cart.some(item => !inStock(item));
+      const priceChanged = cart.some(item => latest.has(item.id) && latest.get(item.id).price !== item.price);
+
+      setCart(prevCart => prevCart.filter(inStock).map(refresh));
+      setWishlist(prevWishlist => prevWishlist.filter(item => !gone.has(item.id)).map(refresh));
+
+      if (removed) toast.error('تمت إزالة منتجات غير متوفرة من السلة');
+      if (priceChanged) toast('تم تحديث أسعار بعض المنتجات');
+    } catch (error) {
+      console.error('Error revalidating cart:', error);
+    }
+  };
+
   // Load cart from localStorage on mount
   useEffect(() => {
     const savedCart = localStorage.getItem('cart');
@@ -172,8 +236,14 @@ export const StoreProvider = ({ children }) => {
 
     if (savedCurrency) setCurrency(savedCurrency);
     if (savedLanguage) setLanguage(savedLanguage);
+    setCartLoaded(true);
   }, []);
 
+  // Saved copies may be stale; check them once after loading
+  useEffect(() => {
+    if (cartLoaded) revalidateCart();
+  }, [cartLoaded]);
+
   // Save to localStorage when state changes
   useEffect(() => {
     localStorage.setItem('cart', JSON.stringify(cart));
@@ -200,6 +270,7 @@ export const StoreProvider = ({ children }) => {
     clearCart,
     getCartTotal,
     getCartCount,
+    revalidateCart,
     
     // Wishlist
     wishlist,
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+MongoDB Fault-Injection Proxy
+asyncio TCP proxy between the API and a local mongod that injects latency, resets, stalls and bandwidth limits
+
+Start the API with MONGO_URL pointing at the proxy and directConnection=true
+(otherwise the driver discovers the replica set members and connects to them
+directly, bypassing the proxy):
+
+    python local_replica_set.py start --members 1   # transactions need a replica set
+    python fault_proxy.py --listen 27020 --upstream localhost:27017 \\
+        --schedule "30:latency=500,60:reset,61:clear,90:stall,100:clear"
+    MONGO_URL="mongodb://localhost:27020/?directConnection=true" yarn dev
+
+Faults:
+    latency=MS      delay every chunk in both directions by MS milliseconds
+    bandwidth=BPS   throttle every connection to BPS bytes per second per direction
+    stall           hold all traffic (connections stay open, nothing is forwarded)
+    reset           abort every open connection with a TCP RST
+    refuse          reset new connections as soon as they are accepted
+    clear           remove all faults
+"""
+
+import argparse
+import asyncio
+import socket
+import struct
+import threading
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_fault(spec):
+    """Parse 'latency=200', 'stall', 'clear', ... into a fault dict"""
+    name, _, value = spec.strip().partition('=')
+    if name == 'clear':
+        return {}
+    if name in ('latency', 'bandwidth'):
+        return {name: float(value)}
+    if name in ('stall', 'reset', 'refuse'):
+        return {name: True}
+    raise ValueError(f"Unknown fault: {spec}")
+
+
+def parse_schedule(text):
+    """Parse 'SECONDS:FAULT[+FAULT],...' into a sorted list of (seconds, fault dict)"""
+    schedule = []
+    for entry in filter(None, (part.strip() for part in text.split(','))):
+        at, _, faults = entry.partition(':')
+        fault = {}
+        for spec in faults.split('+'):
+            fault.update(parse_fault(spec))
+        schedule.append((float(at), fault))
+    return sorted(schedule, key=lambda item: item[0])
+
+
+def abort_with_reset(writer):
+    """Close a connection with RST instead of FIN, the way a crashed peer or middlebox would"""
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+
+class FaultProxy:
+    """TCP proxy whose current fault can be changed at any time, from its loop or another thread"""
+
+    def __init__(self, listen_port, upstream_host, upstream_port, listen_host='127.0.0.1'):
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.fault = {}
+        self.stats = {'accepted': 0, 'refused': 0, 'reset': 0, 'bytes': 0}
+        self._connections = set()
+        self._resumed = None
+        self._server = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self._server = await asyncio.start_server(self._handle, self.listen_host, self.listen_port)
+
+    async def stop(self):
+        self._server.close()
+        for writer in list(self._connections):
+            writer.transport.abort()
+        await self._server.wait_closed()
+
+    def apply(self, fault):
+        """Replace the current fault; resets take effect immediately on open connections"""
+        self.fault = dict(fault)
+        if fault.get('stall'):
+            self._resumed.clear()
+        else:
+            self._resumed.set()
+        if fault.get('reset'):
+            for writer in list(self._connections):
+                abort_with_reset(writer)
+                self.stats['reset'] += 1
+            self._connections.clear()
+            # A reset is a one-off event; keep any other faults that came with it
+            self.fault.pop('reset')
+
+    def apply_threadsafe(self, fault):
+        self._loop.call_soon_threadsafe(self.apply, fault)
+
+    async def run_schedule(self, schedule):
+        start = time.monotonic()
+        for at, fault in schedule:
+            await asyncio.sleep(max(0.0, start + at - time.monotonic()))
+            print(f"[{at:7.1f}s] fault -> {fault or 'clear'}")
+            self.apply(fault)
+
+    async def _handle(self, client_reader, client_writer):
+        if self.fault.get('refuse'):
+            self.stats['refused'] += 1
+            abort_with_reset(client_writer)
+            return
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host, self.upstream_port)
+        except OSError:
+            abort_with_reset(client_writer)
+            return
+
+        self.stats['accepted'] += 1
+        self._connections.update((client_writer, upstream_writer))
+        try:
+            await asyncio.gather(
+                self._pipe(client_reader, upstream_writer),
+                self._pipe(upstream_reader, client_writer),
+            )
+        finally:
+            for writer in (client_writer, upstream_writer):
+                self._connections.discard(writer)
+                writer.transport.abort()
+
+    async def _pipe(self, reader, writer):
+        try:
+            while True:
+                data = await reader.read(CHUNK_SIZE)
+                if not data:
+                    break
+                await self._resumed.wait()
+                if self.fault.get('latency'):
+                    await asyncio.sleep(self.fault['latency'] / 1000)
+                if self.fault.get('bandwidth'):
+                    await asyncio.sleep(len(data) / self.fault['bandwidth'])
+                writer.write(data)
+                await writer.drain()
+                self.stats['bytes'] += len(data)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.transport.abort()
+
+
+def start_in_thread(listen_port, upstream_host, upstream_port):
+    """Run a FaultProxy on a background event loop; returns the proxy once it is listening"""
+    ready = threading.Event()
+    holder = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        proxy = FaultProxy(listen_port, upstream_host, upstream_port)
+        loop.run_until_complete(proxy.start())
+        holder['proxy'] = proxy
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name='fault-proxy', daemon=True).start()
+    ready.wait()
+    return holder['proxy']
+
+
+async def serve(args):
+    upstream_host, _, upstream_port = args.upstream.rpartition(':')
+    proxy = FaultProxy(args.listen, upstream_host or 'localhost', int(upstream_port))
+    await proxy.start()
+    print(f"🔌 Proxying 127.0.0.1:{args.listen} -> {args.upstream}")
+    if args.schedule:
+        await proxy.run_schedule(parse_schedule(args.schedule))
+        print(f"📋 Schedule finished; stats: {proxy.stats}")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TCP fault-injection proxy for MongoDB')
+    parser.add_argument('--listen', type=int, default=27020)
+    parser.add_argument('--upstream', default='localhost:27017')
+    parser.add_argument('--schedule', default='',
+                        help="comma-separated SECONDS:FAULT entries, e.g. '10:latency=300,20:reset+refuse,25:clear'")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Generator
+Generates large, reproducible users/products/orders/coupons datasets matching the
+route.js schemas and bulk-loads them into MongoDB with streaming batched inserts
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from test_data import TEST_RUN_COLLECTIONS, ensure_test_run_indexes
+
+# Configuration - Get from environment
+MONGO_URL = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+DB_NAME = os.getenv('DB_NAME', 'mystoreapp')
+
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 5000
+
+# Fixed reference point so two runs with the same seed produce identical documents
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+CATEGORIES = [
+    {'slug': 'electronics', 'name': 'الإلكترونيات', 'nameEn': 'Electronics', 'icon': '📱',
+     'description': 'أجهزة إلكترونية وتقنية متطورة', 'descriptionEn': 'Electronic devices and advanced technology'},
+    {'slug': 'clothing', 'name': 'الملابس', 'nameEn': 'Clothing', 'icon': '👕',
+     'description': 'أزياء وملابس للرجال والنساء', 'descriptionEn': 'Fashion and clothing for men and women'},
+    {'slug': 'food', 'name': 'المواد الغذائية', 'nameEn': 'Food', 'icon': '🍎',
+     'description': 'مواد غذائية طازجة وعالية الجودة', 'descriptionEn': 'Fresh and high-quality food products'},
+    {'slug': 'accessories', 'name': 'الإكسسوارات', 'nameEn': 'Accessories', 'icon': '👜',
+     'description': 'حقائب وإكسسوارات عصرية', 'descriptionEn': 'Modern bags and accessories'},
+]
+
+# (Arabic noun, English noun, price range, specification builder key) per category
+PRODUCT_TYPES = {
+    'electronics': [
+        ('هاتف ذكي', 'Smartphone', (150, 1200), 'phone'),
+        ('حاسوب محمول', 'Laptop', (400, 2500), 'computer'),
+        ('سماعات لاسلكية', 'Wireless Headphones', (30, 400), 'audio'),
+        ('ساعة ذكية', 'Smart Watch', (60, 600), 'watch'),
+        ('جهاز لوحي', 'Tablet', (120, 1400), 'computer'),
+        ('شاحن سريع', 'Fast Charger', (10, 80), 'generic'),
+    ],
+    'clothing': [
+        ('قميص قطني', 'Cotton Shirt', (15, 90), 'apparel'),
+        ('فستان سهرة', 'Evening Dress', (40, 400), 'apparel'),
+        ('بنطال جينز', 'Jeans', (20, 120), 'apparel'),
+        ('معطف شتوي', 'Winter Coat', (50, 350), 'apparel'),
+        ('حذاء رياضي', 'Sneakers', (30, 250), 'apparel'),
+    ],
+    'food': [
+        ('كيكة الشوكولاتة', 'Chocolate Cake', (8, 60), 'food'),
+        ('زيت زيتون', 'Olive Oil', (6, 45), 'food'),
+        ('تمر مجدول', 'Medjool Dates', (5, 50), 'food'),
+        ('قهوة عربية', 'Arabic Coffee', (7, 40), 'food'),
+        ('عسل طبيعي', 'Natural Honey', (10, 80), 'food'),
+    ],
+    'accessories': [
+        ('حقيبة جلدية', 'Leather Bag', (25, 300), 'bag'),
+        ('محفظة رجالية', "Men's Wallet", (10, 120), 'bag'),
+        ('نظارة شمسية', 'Sunglasses', (15, 250), 'generic'),
+        ('حزام جلدي', 'Leather Belt', (10, 90), 'generic'),
+    ],
+}
+
+ADJECTIVES = [
+    ('فاخر', 'Premium'), ('أنيق', 'Elegant'), ('عصري', 'Modern'), ('كلاسيكي', 'Classic'),
+    ('متطور', 'Advanced'), ('خفيف', 'Lightweight'), ('احترافي', 'Professional'), ('مميز', 'Special'),
+]
+
+BRANDS = ['Apple', 'Samsung', 'Xiaomi', 'Huawei', 'Sony', 'LG', 'Zara', 'Nike', 'Adidas',
+          'Al Rifai', 'Ghraoui', 'Damascus Crafts', 'Aleppo Soap Co', 'Generic']
+COLORS = ['White', 'Black', 'Blue', 'Red', 'Gray', 'Beige', 'Brown', 'Green', 'Gold', 'Silver']
+SIZES = ['XS', 'S', 'M', 'L', 'XL', 'XXL']
+
+FIRST_NAMES = [
+    ('أحمد', 'Ahmed'), ('محمد', 'Mohammed'), ('فاطمة', 'Fatima'), ('علي', 'Ali'), ('ليلى', 'Layla'),
+    ('يوسف', 'Youssef'), ('مريم', 'Maryam'), ('خالد', 'Khaled'), ('سارة', 'Sara'), ('عمر', 'Omar'),
+    ('نور', 'Nour'), ('حسن', 'Hassan'), ('رنا', 'Rana'), ('زياد', 'Ziad'), ('هبة', 'Hiba'),
+]
+LAST_NAMES = [
+    ('الحسن', 'Al-Hassan'), ('نجيب', 'Najib'), ('الخطيب', 'Al-Khatib'), ('الشامي', 'Al-Shami'),
+    ('العلي', 'Al-Ali'), ('حداد', 'Haddad'), ('المصري', 'Al-Masri'), ('قباني', 'Kabbani'),
+]
+CITIES = [
+    ('دمشق', 'سوريا', '+963'), ('حلب', 'سوريا', '+963'), ('حمص', 'سوريا', '+963'),
+    ('الرياض', 'السعودية', '+966'), ('جدة', 'السعودية', '+966'), ('دبي', 'الإمارات', '+971'),
+]
+STREETS = ['شارع الملك فهد', 'شارع بغداد', 'شارع الثورة', 'شارع الحمراء', 'شارع النصر', 'شارع الجامعة']
+
+ORDER_STATUSES = [('pending', 0.3), ('confirmed', 0.2), ('shipped', 0.15), ('delivered', 0.3), ('cancelled', 0.05)]
+# Transitions an order took to reach each generated status (lib/orderStatus.js)
+STATUS_PATHS = {
+    'pending': ['pending'],
+    'confirmed': ['pending', 'confirmed'],
+    'shipped': ['pending', 'confirmed', 'processing', 'shipped'],
+    'delivered': ['pending', 'confirmed', 'processing', 'shipped', 'delivered'],
+    'cancelled': ['pending', 'cancelled'],
+}
+PAYMENT_METHODS = [('whatsapp', 0.6), ('wallet', 0.4)]
+RECHARGE_METHODS = ['qr_code', 'bank_transfer', 'receipt']
+
+IMAGES = [
+    'https://images.unsplash.com/photo-1652862938332-815e45390b3c',
+    'https://images.pexels.com/photos/7563569/pexels-photo-7563569.jpeg',
+    'https://images.unsplash.com/photo-1716535232783-38a9e49eeffa',
+    'https://images.pexels.com/photos/6995253/pexels-photo-6995253.jpeg',
+]
+
+
+def seeded_uuid(rng):
+    """Build a version-4 UUID string from the generator's own random stream"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def weighted_choice(rng, choices):
+    """Pick a value from a list of (value, weight) pairs"""
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def random_time(rng, days_back=365):
+    """Return a timestamp within `days_back` days before BASE_TIME"""
+    return BASE_TIME - timedelta(seconds=rng.randint(0, days_back * 24 * 3600))
+
+
+def status_fields(rng, status, created_at):
+    """statusChangedAt, statusTimestamps and statusHistory for an order that walked to `status`"""
+    at, previous = created_at, None
+    timestamps, history = {}, []
+    for step in STATUS_PATHS[status]:
+        if previous:
+            at += timedelta(minutes=rng.randint(10, 72 * 60))
+        timestamps[step] = at
+        history.append({'from': previous, 'to': step, 'at': at})
+        previous = step
+    return {'statusChangedAt': at, 'statusTimestamps': timestamps, 'statusHistory': history}
+
+
+def build_specifications(rng, kind):
+    """Generate a plausible `specifications` sub-document for a product type"""
+    if kind == 'phone':
+        return {'brand': rng.choice(BRANDS[:6]), 'storage': rng.choice(['64GB', '128GB', '256GB', '512GB']),
+                'color': rng.choice(COLORS)}
+    if kind == 'computer':
+        return {'brand': rng.choice(BRANDS[:6]), 'ram': rng.choice(['8GB', '16GB', '32GB']),
+                'storage': rng.choice(['256GB SSD', '512GB SSD', '1TB SSD'])}
+    if kind == 'audio':
+        return {'brand': rng.choice(BRANDS[:6]), 'battery': f"{rng.randint(10, 60)} hours",
+                'noiseCancelling': rng.random() < 0.5}
+    if kind == 'watch':
+        return {'display': rng.choice(['AMOLED 1.4"', 'LCD 1.3"', 'OLED 1.9"']),
+                'battery': f"{rng.randint(1, 14)} days", 'waterproof': rng.choice(['IP67', 'IP68', '5ATM'])}
+    if kind == 'apparel':
+        return {'material': rng.choice(['100% Cotton', 'Polyester', 'Linen', 'Wool Blend', 'Denim']),
+                'sizes': sorted(rng.sample(SIZES, rng.randint(2, 5)), key=SIZES.index),
+                'colors': rng.sample(COLORS, rng.randint(1, 4))}
+    if kind == 'food':
+        return {'weight': rng.choice(['250g', '500g', '1kg', '2kg']),
+                'origin': rng.choice(['Syria', 'Saudi Arabia', 'Lebanon', 'Jordan']),
+                'shelfLife': f"{rng.randint(1, 24)} months"}
+    if kind == 'bag':
+        return {'material': rng.choice(['Genuine Leather', 'Synthetic Leather', 'Canvas']),
+                'dimensions': f"{rng.randint(20, 50)}x{rng.randint(15, 40)}x{rng.randint(5, 20)} cm",
+                'colors': rng.sample(COLORS, rng.randint(1, 4))}
+    return {'brand': rng.choice(BRANDS), 'color': rng.choice(COLORS)}
+
+
+def generate_categories():
+    """Yield the category documents (stable ids so reruns stay reproducible)"""
+    rng = random.Random(DEFAULT_SEED)
+    for category in CATEGORIES:
+        created_at = random_time(rng)
+        yield {
+            'id': seeded_uuid(rng),
+            'name': category['name'],
+            'nameEn': category['nameEn'],
+            'slug': category['slug'],
+            'description': category['description'],
+            'descriptionEn': category['descriptionEn'],
+            'image': rng.choice(IMAGES),
+            'icon': category['icon'],
+            'parentId': None,
+            'active': True,
+            'createdAt': created_at,
+            'updatedAt': created_at,
+        }
+
+
+def generate_products(count, seed=DEFAULT_SEED):
+    """Yield `count` product documents"""
+    rng = random.Random(f"products:{seed}")
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        name_ar, name_en, (low, high), spec_kind = rng.choice(PRODUCT_TYPES[category['slug']])
+        adj_ar, adj_en = rng.choice(ADJECTIVES)
+        brand = rng.choice(BRANDS)
+        original_price = round(rng.uniform(low, high), 2)
+        discount = rng.choice([0, 0, 0, 5, 10, 15, 20, 25, 30])
+        price = round(original_price * (100 - discount) / 100, 2)
+        image = f"{rng.choice(IMAGES)}?sig={i}"
+        created_at = random_time(rng)
+
+        yield {
+            'id': seeded_uuid(rng),
+            'name': f"{name_ar} {adj_ar} {brand}",
+            'nameEn': f"{adj_en} {brand} {name_en}",
+            'price': price,
+            'originalPrice': original_price,
+            'description': f"{name_ar} {adj_ar} من {brand} بجودة عالية ومناسب للاستخدام اليومي",
+            'descriptionEn': f"{adj_en} {name_en.lower()} by {brand}, high quality and suitable for daily use",
+            'category': category['slug'],
+            'categoryAr': category['name'],
+            'image': image,
+            'images': [image],
+            'rating': round(rng.uniform(3.0, 5.0), 1),
+            'reviews': rng.randint(0, 2000),
+            'stock': rng.choice([0, rng.randint(1, 10), rng.randint(10, 500)]),
+            'discount': discount,
+            'featured': rng.random() < 0.05,
+            'specifications': build_specifications(rng, spec_kind),
+            'createdAt': created_at,
+            'updatedAt': created_at,
+        }
+
+
+def generate_users(count, seed=DEFAULT_SEED):
+    """Yield `count` user documents"""
+    rng = random.Random(f"users:{seed}")
+    for i in range(count):
+        first_ar, first_en = rng.choice(FIRST_NAMES)
+        last_ar, last_en = rng.choice(LAST_NAMES)
+        city, country, dial_code = rng.choice(CITIES)
+        uid = f"synthetic_user_{seed}_{i:08d}"
+        created_at = random_time(rng)
+
+        yield {
+            'id': seeded_uuid(rng),
+            'uid': uid,
+            'email': f"{uid}@example.com",
+            'name': f"{first_ar} {last_ar}",
+            'nameEn': f"{first_en} {last_en}",
+            'phone': f"{dial_code}9{rng.randint(10000000, 99999999)}",
+            'walletBalance': 2000,
+            'walletSeq': 1,
+            'role': 'admin' if rng.random() < 0.001 else 'user',
+            'address': {'street': rng.choice(STREETS), 'city': city, 'country': country},
+            'createdAt': created_at,
+            'updatedAt': created_at,
+        }
+
+
+def generate_orders(count, user_count, product_count, seed=DEFAULT_SEED):
+    """Yield `count` orders referencing the users/products generated with the same seed
+
+    Product references are re-derived from the product stream, so the
+    product catalog is regenerated once here and kept as a compact
+    (id, name, price) table.
+    """
+    catalog = [(p['id'], p['name'], p['price']) for p in generate_products(product_count, seed)]
+    rng = random.Random(f"orders:{seed}")
+    # Separate stream, so adding the status timeline left the other fields unchanged
+    status_rng = random.Random(f"order-status:{seed}")
+    for i in range(count):
+        user_index = rng.randrange(user_count)
+        city, country, dial_code = rng.choice(CITIES)
+        first_ar, _ = rng.choice(FIRST_NAMES)
+        items = []
+        for product_id, name, price in rng.sample(catalog, min(rng.randint(1, 5), len(catalog))):
+            items.append({'productId': product_id, 'name': name, 'price': price,
+                          'quantity': rng.randint(1, 3)})
+        total = round(sum(item['price'] * item['quantity'] for item in items), 2)
+        discount = round(total * 0.1, 2) if rng.random() < 0.1 else 0
+        created_at = random_time(rng)
+        status = weighted_choice(rng, ORDER_STATUSES)
+        timeline = status_fields(status_rng, status, created_at)
+
+        yield {
+            'id': seeded_uuid(rng),
+            'orderNumber': f"ORD{int(created_at.timestamp() * 1000)}{i % 1000:03d}",
+            'status': status,
+            'paymentStatus': 'paid' if status in ('shipped', 'delivered') else 'pending',
+            'paymentMethod': weighted_choice(rng, PAYMENT_METHODS),
+            'total': round(total - discount, 2),
+            'originalTotal': total,
+            'discount': discount,
+            'couponCode': 'WELCOME20' if discount else None,
+            'items': items,
+            'customerInfo': {
+                'name': first_ar,
+                'phone': f"{dial_code}9{rng.randint(10000000, 99999999)}",
+                'address': f"{rng.choice(STREETS)}، {city}، {country}",
+            },
+            'userId': f"synthetic_user_{seed}_{user_index:08d}",
+            **timeline,
+            'createdAt': created_at,
+            'updatedAt': timeline['statusChangedAt'],
+        }
+
+
+def generate_wallet_openings(user_count, seed=DEFAULT_SEED):
+    """Yield the opening wallet_ledger entry backing each generated user's balance"""
+    rng = random.Random(f"ledger:{seed}")
+    for user in generate_users(user_count, seed):
+        yield {
+            'id': seeded_uuid(rng),
+            'userId': user['uid'],
+            'seq': 1,
+            'type': 'opening',
+            'amount': user['walletBalance'],
+            'balanceAfter': user['walletBalance'],
+            'referenceId': None,
+            'note': '',
+            'createdAt': user['createdAt'],
+        }
+
+
+def generate_wallet_transactions(count, user_count, seed=DEFAULT_SEED):
+    """Yield `count` wallet recharge transactions"""
+    rng = random.Random(f"wallet:{seed}")
+    for i in range(count):
+        method = rng.choice(RECHARGE_METHODS)
+        created_at = random_time(rng)
+        yield {
+            'id': seeded_uuid(rng),
+            'type': 'recharge',
+            'method': method,
+            'amount': rng.choice([1000, 2000, 5000, 10000, 25000, 50000]),
+            'status': 'completed' if method == 'qr_code' else rng.choice(['pending', 'completed']),
+            'userId': f"synthetic_user_{seed}_{rng.randrange(user_count):08d}",
+            'reference': f"REF{i:010d}",
+            'receiptImage': '',
+            'createdAt': created_at,
+            'updatedAt': created_at,
+        }
+
+
+def generate_coupons(count, seed=DEFAULT_SEED):
+    """Yield `count` coupon documents with unique codes"""
+    rng = random.Random(f"coupons:{seed}")
+    for i in range(count):
+        is_percentage = rng.random() < 0.6
+        value = rng.choice([5, 10, 15, 20, 25, 50]) if is_percentage else rng.choice([5, 10, 20, 50])
+        created_at = random_time(rng)
+        coupon = {
+            'id': seeded_uuid(rng),
+            'code': f"SYN{seed}X{i:07d}",
+            'type': 'percentage' if is_percentage else 'fixed',
+            'value': value,
+            'minOrderAmount': rng.choice([0, 30, 50, 100, 200]),
+            'description': f"خصم {value}%" if is_percentage else f"خصم ثابت ${value}",
+            'active': rng.random() < 0.9,
+            'expiresAt': BASE_TIME + timedelta(days=rng.randint(-30, 365)),
+            'usedBy': [],
+            'createdAt': created_at,
+        }
+        if is_percentage:
+            coupon['maxDiscount'] = rng.choice([25, 50, 100])
+        yield coupon
+
+
+def batched(iterable, size):
+    """Split an iterable into lists of at most `size` items without materialising it"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_load(database, collection_name, documents, batch_size, total):
+    """Stream documents into a collection with unordered insert_many batches"""
+    collection = database[collection_name]
+    inserted = 0
+    start = time.perf_counter()
+    for batch in batched(documents, batch_size):
+        collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+        elapsed = time.perf_counter() - start
+        rate = inserted / elapsed if elapsed else 0
+        print(f"\r   {collection_name}: {inserted}/{total} ({rate:,.0f} docs/s)", end='', flush=True)
+    print()
+    return inserted
+
+
+def build_plan(args):
+    """Return (collection, generator, count) tuples for the requested dataset"""
+    return [
+        ('categories', generate_categories(), len(CATEGORIES)),
+        ('products', generate_products(args.products, args.seed), args.products),
+        ('users', generate_users(args.users, args.seed), args.users),
+        ('wallet_ledger', generate_wallet_openings(args.users, args.seed), args.users),
+        ('orders', generate_orders(args.orders, args.users, args.products, args.seed), args.orders),
+        ('wallet_transactions', generate_wallet_transactions(args.transactions, args.users, args.seed),
+         args.transactions),
+        ('coupons', generate_coupons(args.coupons, args.seed), args.coupons),
+    ]
+
+
+def tag_plan(plan, namespace, ttl_hours):
+    """Tag the documents of collections that support test run namespaces; categories and coupons stay as they are"""
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=ttl_hours)
+    tag = {'testRun': namespace, 'expiresAt': expires_at}
+    return [
+        (name, (dict(document, **tag) for document in documents) if name in TEST_RUN_COLLECTIONS else documents, total)
+        for name, documents, total in plan
+    ]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate and bulk-load a synthetic store dataset')
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--orders', type=int, default=1000000)
+    parser.add_argument('--transactions', type=int, default=200000)
+    parser.add_argument('--coupons', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--drop', action='store_true', help='drop the target collections first')
+    parser.add_argument('--dry-run', action='store_true', help='generate documents without inserting')
+    parser.add_argument('--run', help='tag documents with this test run namespace (see test_data.py)')
+    parser.add_argument('--ttl-hours', type=float, default=24, help='lifetime of documents tagged with --run')
+    return parser.parse_args()
+
+
+def main():
+    """Generate the dataset and load it into MongoDB"""
+    args = parse_args()
+
+    print("🏭 SYNTHETIC DATASET GENERATOR")
+    print("=" * 80)
+    print(f"🔗 Database: {DB_NAME}")
+    print(f"🎲 Seed: {args.seed}  📦 Batch size: {args.batch_size}")
+    print("=" * 80)
+
+    plan = build_plan(args)
+    if args.run:
+        plan = tag_plan(plan, args.run, args.ttl_hours)
+        print(f"🏷️ Test run {args.run}: tagged documents expire after {args.ttl_hours:g}h")
+
+    if args.dry_run:
+        for name, documents, total in plan:
+            start = time.perf_counter()
+            generated = sum(1 for _ in documents)
+            print(f"   {name}: {generated} documents generated in {time.perf_counter() - start:.2f}s")
+        return True
+
+    from pymongo import MongoClient
+
+    client = MongoClient(MONGO_URL)
+    database = client[DB_NAME]
+
+    if args.drop:
+        for name, _, _ in plan:
+            database[name].drop()
+        print("🧹 Dropped existing collections")
+
+    # After the drop, which would take the TTL indexes with it
+    if args.run:
+        ensure_test_run_indexes(database)
+
+    start = time.perf_counter()
+    totals = {}
+    for name, documents, total in plan:
+        totals[name] = bulk_load(database, name, documents, args.batch_size, total)
+
+    print(f"\n📊 Loaded {sum(totals.values()):,} documents in {time.perf_counter() - start:.1f}s")
+    client.close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
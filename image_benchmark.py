@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Product Image Benchmark
+Compares the image bytes of the product grid using original URLs against the optimized /api/images variants
+"""
+
+import argparse
+import time
+
+from load_tools import BASE_URL, BASE_URL_ENV, make_client
+
+# Formats a <picture> can pick from; browsers take the first one they support
+FORMATS = ('avif', 'webp', 'jpeg')
+
+
+def fetch_bytes(session, url):
+    """GET an image and return (bytes, latency_ms, response headers)"""
+    start = time.perf_counter()
+    response = session.get(url, timeout=60)
+    response.raise_for_status()
+    return len(response.content), (time.perf_counter() - start) * 1000, response.headers
+
+
+def ingest(client):
+    start = time.perf_counter()
+    result = client.wait_for_ingest(client.ingest_images()['jobId'])
+    print(f"📥 Ingested {result['ingested']} products in {time.perf_counter() - start:.1f}s "
+          f"({len(result['failed'])} failed)")
+    for failure in result['failed'][:5]:
+        print(f"   {failure['productId']}: {failure['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark product grid image bytes before and after optimization')
+    parser.add_argument('--products', type=int, default=12, help='products on one page of the grid')
+    parser.add_argument('--width', type=int, default=480, help='variant width a grid card requests')
+    parser.add_argument('--ingest', action='store_true', help='ingest product images before measuring')
+    args = parser.parse_args()
+
+    print("🖼️ PRODUCT IMAGE BENCHMARK")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    print("=" * 80)
+
+    # Image URLs (external originals and variants alike) are fetched on the client's pooled session
+    with make_client(timeout=30) as client:
+        session = client.session
+        if args.ingest:
+            ingest(client)
+
+        products = client.products()[:args.products]
+        optimized = [product for product in products if product.get('imageHash')]
+        print(f"📦 {len(products)} products on the page, {len(optimized)} with optimized images")
+        if not optimized:
+            print("❌ No ingested images; run with --ingest")
+            return False
+
+        original_bytes = 0
+        original_latency = 0.0
+        variant_bytes = {name: 0 for name in FORMATS}
+        variant_latency = {name: 0.0 for name in FORMATS}
+        cache_headers_ok = True
+
+        for product in optimized:
+            size, latency, _ = fetch_bytes(session, product['image'])
+            original_bytes += size
+            original_latency += latency
+            for name in FORMATS:
+                url = f"{BASE_URL_ENV}/api/images/{product['imageHash']}/{args.width}.{name}"
+                size, latency, headers = fetch_bytes(session, url)
+                variant_bytes[name] += size
+                variant_latency[name] += latency
+                cache_headers_ok &= 'immutable' in headers.get('Cache-Control', '')
+
+        # Second pass: variants now come from the disk cache
+        warm_latency = sum(
+            fetch_bytes(session, f"{BASE_URL_ENV}/api/images/{product['imageHash']}/{args.width}.webp")[1]
+            for product in optimized
+        )
+
+    print(f"\n📊 Page image bytes for {len(optimized)} products (variant width {args.width}px)")
+    print(f"   {'source':<12} {'bytes':>12} {'vs original':>12} {'fetch time':>12}")
+    print(f"   {'original':<12} {original_bytes:>12,} {'':>12} {original_latency:>10.0f}ms")
+    for name in FORMATS:
+        ratio = variant_bytes[name] / original_bytes if original_bytes else 0
+        print(f"   {name:<12} {variant_bytes[name]:>12,} {ratio:>11.1%} {variant_latency[name]:>10.0f}ms")
+    print(f"   webp (cached) fetch time: {warm_latency:.0f}ms")
+
+    checks = {
+        'variants are smaller than the originals': all(size < original_bytes for size in variant_bytes.values()),
+        'variants are served with immutable Cache-Control': cache_headers_ok,
+    }
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,153 @@
+import { SEARCH_FIELDS_PROJECTION } from './search'
+
+// Incremental sync for the admin dashboard
+//
+// GET /admin/changes?since=<cursor> returns the products, users and orders
+// whose `updatedAt` is at or after the cursor, the ids of products deleted
+// since then (from tombstones), and the cursor to send next time. Without
+// `since` only a starting cursor is returned; take it before a full load.
+//
+// The cursor is a timestamp SETTLE_MS behind the server clock, because a
+// write is stamped before its transaction commits and can become visible
+// after a later read. Records from that window are sent again next time, so
+// clients merge by id. `resync: true` means the client must reload in full:
+// the cursor is older than the tombstones are kept, more records changed
+// than `limit`, or a bulk delete (test run teardown) left no tombstones.
+//
+// Tagged test documents (lib/testRuns.js) are removed by their TTL index,
+// which leaves no tombstones either. The cursor therefore also carries the
+// earliest expiry among them (`<time>~<expiry>`), and the first sync once
+// that has passed, plus time for the TTL monitor to run, reloads in full.
+
+export const TOMBSTONES = 'tombstones'
+export const SYNCED_COLLECTIONS = ['products', 'users', 'orders']
+
+const SETTLE_MS = 10000
+// The TTL monitor deletes expired documents once a minute, and may lag
+const TTL_MONITOR_SLACK_MS = 2 * 60 * 1000
+const TOMBSTONE_RETENTION_SECONDS = (parseFloat(process.env.SYNC_TOMBSTONE_DAYS) || 7) * 24 * 60 * 60
+const DEFAULT_LIMIT = 500
+const MAX_LIMIT = 5000
+
+// Same fields as the full admin listings
+const PROJECTIONS = {
+  products: { _id: 0, ...SEARCH_FIELDS_PROJECTION },
+  users: { _id: 0 },
+  orders: { _id: 0, statusHistory: 0 }
+}
+
+export class SyncError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+export async function ensureSyncIndexes(database) {
+  await Promise.all([
+    ...SYNCED_COLLECTIONS.map(name => database.collection(name).createIndex({ updatedAt: 1 })),
+    database.collection(TOMBSTONES).createIndex(
+      { deletedAt: 1 },
+      { expireAfterSeconds: TOMBSTONE_RETENTION_SECONDS }
+    )
+  ])
+}
+
+export async function recordTombstone(database, collection, id, session) {
+  await database.collection(TOMBSTONES).insertOne({ collection, id, deletedAt: new Date() }, { session })
+}
+
+// For deletes too large to tombstone one by one: every client syncing past it reloads
+export async function recordResync(database, reason) {
+  await database.collection(TOMBSTONES).insertOne({ resync: true, reason, deletedAt: new Date() })
+}
+
+function parseDate(value) {
+  const date = new Date(/^\d+$/.test(value) ? Number(value) : value)
+  if (Number.isNaN(date.getTime())) {
+    throw new SyncError('Invalid since cursor')
+  }
+  return date
+}
+
+// `since` is a cursor from an earlier response, an ISO date, or milliseconds since the epoch
+function parseSince(value) {
+  const [since, expiry] = value.split('~')
+  return { since: parseDate(since), expiry: expiry === undefined ? null : parseDate(expiry).getTime() }
+}
+
+function encodeCursor(time, expiry) {
+  const cursor = new Date(time).toISOString()
+  return expiry === null ? cursor : `${cursor}~${new Date(expiry).toISOString()}`
+}
+
+// Earliest expiry among tagged documents the TTL monitor may not have removed
+// yet (via the partial TTL indexes). Never before `now`, so the reloads it
+// causes are at least TTL_MONITOR_SLACK_MS apart while test data expires.
+async function nextExpiry(database, now) {
+  const next = await Promise.all(SYNCED_COLLECTIONS.map(name => database.collection(name)
+    .find(
+      { testRun: { $exists: true }, expiresAt: { $gt: new Date(now - TTL_MONITOR_SLACK_MS) } },
+      { projection: { _id: 0, testRun: 1, expiresAt: 1 } }
+    )
+    .sort({ expiresAt: 1 })
+    .limit(1)
+    .toArray()))
+  const expiry = earliestExpiry(next.flat())
+  return expiry === null ? null : Math.max(expiry, now)
+}
+
+function earliestExpiry(documents) {
+  return earliest(...documents.filter(document => document.testRun).map(document => new Date(document.expiresAt).getTime()))
+}
+
+function earliest(...times) {
+  const known = times.filter(time => time !== null)
+  return known.length ? Math.min(...known) : null
+}
+
+export async function changesSince(database, searchParams) {
+  const now = Date.now()
+  const cursor = new Date(now - SETTLE_MS).toISOString()
+  if (!searchParams.get('since')) {
+    return { cursor: encodeCursor(now - SETTLE_MS, await nextExpiry(database, now)) }
+  }
+
+  const { since, expiry } = parseSince(searchParams.get('since'))
+  if (since.getTime() < now - TOMBSTONE_RETENTION_SECONDS * 1000 ||
+      (expiry !== null && now >= expiry + TTL_MONITOR_SLACK_MS)) {
+    return { cursor, resync: true }
+  }
+  const limit = Math.min(Math.max(parseInt(searchParams.get('limit')) || DEFAULT_LIMIT, 1), MAX_LIMIT)
+
+  const [upcoming, tombstones, ...changed] = await Promise.all([
+    nextExpiry(database, now),
+    database.collection(TOMBSTONES)
+      .find({ deletedAt: { $gte: since } }, { projection: { _id: 0 } })
+      .sort({ deletedAt: 1 })
+      .limit(limit + 1)
+      .toArray(),
+    ...SYNCED_COLLECTIONS.map(name => database.collection(name)
+      .find({ updatedAt: { $gte: since } }, { projection: PROJECTIONS[name] })
+      .sort({ updatedAt: 1 })
+      .limit(limit + 1)
+      .toArray())
+  ])
+
+  if ([tombstones, ...changed].some(documents => documents.length > limit) ||
+      tombstones.some(tombstone => tombstone.resync)) {
+    return { cursor, resync: true }
+  }
+
+  const deleted = Object.fromEntries(SYNCED_COLLECTIONS.map(name => [name, []]))
+  for (const tombstone of tombstones) {
+    deleted[tombstone.collection]?.push(tombstone.id)
+  }
+  // Documents written after the expiry query ran are only in `changed`
+  return {
+    cursor: encodeCursor(now - SETTLE_MS, earliest(expiry, upcoming, earliestExpiry(changed.flat()))),
+    resync: false,
+    ...Object.fromEntries(SYNCED_COLLECTIONS.map((name, index) => [name, changed[index]])),
+    deleted
+  }
+}
@@ -0,0 +1,230 @@
+import { NextResponse } from 'next/server'
+import { hasTestRunToken } from './testRuns'
+
+// Admission control in front of the MongoDB pool
+//
+// Each request is classified (catalog / checkout / admin) and must pass two
+// gates before it touches the database:
+//   1. a per-client token bucket for its class -> 429 when empty
+//   2. a per-class concurrency limit with a short bounded wait queue -> 503 when
+//      the queue is full or the wait times out
+// Rejections carry Retry-After so well-behaved clients back off instead of
+// piling up behind a saturated pool.
+//
+// Limits are configured per class with environment variables, e.g.
+//   ADMISSION_CATALOG=rate:50,burst:100,concurrency:6,queue:64,queueTimeoutMs:1000
+// The default concurrency limits add up to the default MongoDB maxPoolSize of
+// 10; raise them together with MONGO_MAX_POOL_SIZE. While anyone is subscribed
+// to live updates (lib/liveUpdates.js), its change stream or poller also uses
+// a pool connection.
+//
+// Clients are told apart by address: `request.ip` where the platform sets it,
+// or, behind TRUSTED_PROXY_HOPS reverse proxies that append to
+// X-Forwarded-For, the entry the outermost of them added. Entries to the left
+// of it come from the client and are never trusted. Requests with no known
+// address skip the token bucket (the concurrency gate still applies) rather
+// than sharing one bucket for everybody. Load tests simulate many clients
+// with `X-Test-Client`, honoured only together with the TEST_RUN_TOKEN.
+
+const DEFAULT_LIMITS = {
+  catalog: { rate: 50, burst: 100, concurrency: 6, queue: 64, queueTimeoutMs: 1000 },
+  checkout: { rate: 5, burst: 10, concurrency: 3, queue: 32, queueTimeoutMs: 3000 },
+  admin: { rate: 5, burst: 20, concurrency: 1, queue: 8, queueTimeoutMs: 5000 },
+  // Image variants are served from disk and resized with sharp; this class
+  // bounds CPU work and is not part of the MongoDB pool budget
+  images: { rate: 100, burst: 200, concurrency: 4, queue: 128, queueTimeoutMs: 2000 }
+}
+
+export const TEST_CLIENT_HEADER = 'X-Test-Client'
+
+const TRUSTED_PROXY_HOPS = Math.max(0, parseInt(process.env.TRUSTED_PROXY_HOPS) || 0)
+const BUCKET_IDLE_MS = 10 * 60 * 1000
+const MAX_BUCKETS = 50000
+
+function parseLimits(name) {
+  const limits = { ...DEFAULT_LIMITS[name] }
+  const raw = process.env[`ADMISSION_${name.toUpperCase()}`]
+  if (raw) {
+    for (const pair of raw.split(',')) {
+      const [key, value] = pair.split(':').map(part => part.trim())
+      if (key in limits && !Number.isNaN(Number(value))) {
+        limits[key] = Number(value)
+      }
+    }
+  }
+  return limits
+}
+
+class TokenBuckets {
+  constructor({ rate, burst }) {
+    this.rate = rate
+    this.burst = burst
+    this.buckets = new Map()
+  }
+
+  // Returns 0 when a token was taken, otherwise seconds until one is available
+  take(clientId, now = Date.now()) {
+    let bucket = this.buckets.get(clientId)
+    if (!bucket) {
+      if (this.buckets.size >= MAX_BUCKETS) this.prune(now)
+      bucket = { tokens: this.burst, updatedAt: now }
+      this.buckets.set(clientId, bucket)
+    }
+
+    bucket.tokens = Math.min(this.burst, bucket.tokens + ((now - bucket.updatedAt) / 1000) * this.rate)
+    bucket.updatedAt = now
+
+    if (bucket.tokens >= 1) {
+      bucket.tokens -= 1
+      return 0
+    }
+    return (1 - bucket.tokens) / this.rate
+  }
+
+  prune(now) {
+    for (const [clientId, bucket] of this.buckets) {
+      if (now - bucket.updatedAt > BUCKET_IDLE_MS) {
+        this.buckets.delete(clientId)
+      }
+    }
+    // Still full of active clients: drop the oldest entries (Map keeps insertion order)
+    for (const clientId of this.buckets.keys()) {
+      if (this.buckets.size < MAX_BUCKETS) break
+      this.buckets.delete(clientId)
+    }
+  }
+}
+
+class ConcurrencyGate {
+  constructor({ concurrency, queue, queueTimeoutMs }) {
+    this.limit = concurrency
+    this.maxQueue = queue
+    this.queueTimeoutMs = queueTimeoutMs
+    this.active = 0
+    this.waiters = []
+  }
+
+  // Resolves true once a slot is held, false when shed
+  async acquire() {
+    if (this.active < this.limit) {
+      this.active++
+      return true
+    }
+    if (this.waiters.length >= this.maxQueue) {
+      return false
+    }
+
+    return new Promise(resolve => {
+      const waiter = { resolve, timer: null }
+      waiter.timer = setTimeout(() => {
+        this.waiters.splice(this.waiters.indexOf(waiter), 1)
+        resolve(false)
+      }, this.queueTimeoutMs)
+      this.waiters.push(waiter)
+    })
+  }
+
+  release() {
+    const next = this.waiters.shift()
+    if (next) {
+      // Hand the slot straight to the next waiter; `active` is unchanged
+      clearTimeout(next.timer)
+      next.resolve(true)
+    } else {
+      this.active--
+    }
+  }
+}
+
+const classes = Object.fromEntries(Object.keys(DEFAULT_LIMITS).map(name => {
+  const limits = parseLimits(name)
+  return [name, {
+    limits,
+    buckets: new TokenBuckets(limits),
+    gate: new ConcurrencyGate(limits),
+    stats: { admitted: 0, rateLimited: 0, shed: 0, unidentified: 0 }
+  }]
+}))
+
+export function classifyRoute(path, method) {
+  if (path.length === 0) return null
+  if (path[0] === 'admin') return 'admin'
+  if (method === 'GET' && path[0] === 'images') return 'images'
+  // Live update streams (/live) hold their slot only until the response starts
+  if (method === 'GET' && ['products', 'categories', 'coupons', 'live'].includes(path[0])) return 'catalog'
+  return 'checkout'
+}
+
+// The client's address, or null when it cannot be known
+export function clientIdFor(request) {
+  const simulated = request.headers.get(TEST_CLIENT_HEADER)
+  if (simulated && hasTestRunToken(request)) return `test:${simulated}`
+
+  if (TRUSTED_PROXY_HOPS > 0) {
+    const hops = (request.headers.get('x-forwarded-for') || '')
+      .split(',')
+      .map(hop => hop.trim())
+      .filter(Boolean)
+    // Each trusted proxy appends the address it received the request from
+    if (hops.length >= TRUSTED_PROXY_HOPS) return hops[hops.length - TRUSTED_PROXY_HOPS]
+  }
+  return request.ip || null
+}
+
+let warnedUnidentified = false
+
+function reject(error, status, retryAfterSeconds) {
+  return NextResponse.json({ error }, {
+    status,
+    headers: { 'Retry-After': String(Math.max(1, Math.ceil(retryAfterSeconds))) }
+  })
+}
+
+const admittedWithoutGate = { response: null, release: () => {} }
+
+// Returns `{ response }` when the request is rejected, otherwise `{ release }`
+// which the caller must invoke once the request has finished with the database
+export async function admitRequest(request, routeClass) {
+  const entry = classes[routeClass]
+  if (!entry) return admittedWithoutGate
+
+  const clientId = clientIdFor(request)
+  if (clientId === null) {
+    entry.stats.unidentified++
+    if (!warnedUnidentified) {
+      warnedUnidentified = true
+      console.warn('Admission: no client address on requests; set TRUSTED_PROXY_HOPS behind a reverse proxy. ' +
+        'Per-client rate limits are off until then.')
+    }
+  }
+  const waitSeconds = clientId === null ? 0 : entry.buckets.take(clientId)
+  if (waitSeconds > 0) {
+    entry.stats.rateLimited++
+    return { response: reject('Too many requests', 429, waitSeconds), release: () => {} }
+  }
+
+  if (!(await entry.gate.acquire())) {
+    entry.stats.shed++
+    return { response: reject('Server busy, please retry', 503, entry.limits.queueTimeoutMs / 1000), release: () => {} }
+  }
+
+  entry.stats.admitted++
+  let released = false
+  return {
+    response: null,
+    release: () => {
+      if (released) return
+      released = true
+      entry.gate.release()
+    }
+  }
+}
+
+export function admissionStats() {
+  return Object.fromEntries(Object.entries(classes).map(([name, entry]) => [name, {
+    ...entry.stats,
+    active: entry.gate.active,
+    queued: entry.gate.waiters.length,
+    limits: entry.limits
+  }]))
+}
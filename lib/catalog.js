@@ -0,0 +1,176 @@
+import { unstable_cache, revalidateTag } from 'next/cache'
+import { ObjectId } from 'mongodb'
+import { getDatabase } from './mongodb'
+import { SEARCH_FIELDS_PROJECTION } from './search'
+
+// Storefront catalog reads, shared by GET /api/products, GET /api/categories
+// and the server-rendered home page
+//
+// The page is regenerated incrementally: its catalog data is cached under
+// CATALOG_TAG and rebuilt at most every CATALOG_REVALIDATE_SECONDS, or right
+// away when an admin write calls revalidateCatalog(). Stock changes from orders
+// only show up on the time-based refresh; the cart revalidates stock itself.
+//
+// The page carries the first CATALOG_PAGE_SIZE products; the storefront loads
+// the rest as the shopper scrolls. Category, price range and sort order are
+// applied here, not in the browser, so every page arrives in its final order
+// and a selective filter still fills the grid. Pages are keyset pages on
+// (sort field, _id); the cursor is opaque to clients.
+
+export const CATALOG_TAG = 'catalog'
+export const CATALOG_REVALIDATE_SECONDS = 60
+export const CATALOG_PAGE_SIZE = 50
+export const MAX_CATALOG_PAGE_SIZE = 200
+
+// Storefront sort options; without one, products come in insertion (_id) order
+const CATALOG_SORTS = {
+  featured: { field: 'featured', direction: -1 },
+  newest: { field: null, direction: -1 },
+  'price-low': { field: 'price', direction: 1 },
+  'price-high': { field: 'price', direction: -1 },
+  rating: { field: 'rating', direction: -1 }
+}
+const DEFAULT_SORT = { field: null, direction: 1 }
+
+export class CatalogError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+export async function ensureCatalogIndexes(database) {
+  const products = database.collection('products')
+  await Promise.all(Object.values(CATALOG_SORTS).flatMap(({ field, direction }) => {
+    const key = field ? { [field]: direction, _id: direction } : { _id: direction }
+    return [products.createIndex(key), products.createIndex({ category: 1, ...key })]
+  }))
+}
+
+function encodeCursor(product, { field }) {
+  const value = field ? [product[field] ?? null] : []
+  return Buffer.from(JSON.stringify([...value, product._id.toHexString()])).toString('base64url')
+}
+
+function decodeCursor(cursor, { field }) {
+  try {
+    const values = JSON.parse(Buffer.from(cursor, 'base64url').toString())
+    const id = values.at(-1)
+    if (values.length !== (field ? 2 : 1) || !ObjectId.isValid(id)) throw new Error()
+    return { value: field ? values[0] : undefined, id: new ObjectId(id) }
+  } catch {
+    throw new CatalogError('Invalid cursor')
+  }
+}
+
+// Products after the cursor in { [field]: direction, _id: direction } order.
+// Missing values sort as null: first ascending, last descending.
+function afterCursor({ value, id }, { field, direction }) {
+  const past = direction === 1 ? '$gt' : '$lt'
+  if (!field) return { _id: { [past]: id } }
+
+  const clauses = [{ [field]: value, _id: { [past]: id } }]
+  if (value === null) {
+    if (direction === 1) clauses.push({ [field]: { $ne: null } })
+  } else {
+    clauses.push({ [field]: { [past]: value } })
+    if (direction === -1) clauses.push({ [field]: null })
+  }
+  return { $or: clauses }
+}
+
+function parsePrice(value, name) {
+  if (value === null || value === '') return undefined
+  const price = Number(value)
+  if (!Number.isFinite(price) || price < 0) {
+    throw new CatalogError(`Invalid ${name}`)
+  }
+  return price
+}
+
+// ?cursor=&limit=&category=&minPrice=&maxPrice=&sort= as findCatalogProducts options
+export function parseCatalogQuery(searchParams) {
+  const sort = searchParams.get('sort') || null
+  if (sort && !(sort in CATALOG_SORTS)) {
+    throw new CatalogError(`Unknown sort ${sort}; use one of ${Object.keys(CATALOG_SORTS).join(', ')}`)
+  }
+  return {
+    cursor: searchParams.get('cursor') || null,
+    limit: Math.min(Math.max(parseInt(searchParams.get('limit')) || CATALOG_PAGE_SIZE, 1), MAX_CATALOG_PAGE_SIZE),
+    category: searchParams.get('category') || null,
+    minPrice: parsePrice(searchParams.get('minPrice'), 'minPrice'),
+    maxPrice: parsePrice(searchParams.get('maxPrice'), 'maxPrice'),
+    sort
+  }
+}
+
+// One page of products: { products, nextCursor }; nextCursor is null on the last page
+export async function findCatalogProducts(database, {
+  cursor = null,
+  limit = CATALOG_PAGE_SIZE,
+  category = null,
+  minPrice,
+  maxPrice,
+  sort = null
+} = {}) {
+  const order = sort ? CATALOG_SORTS[sort] : DEFAULT_SORT
+  const filters = []
+  if (category) filters.push({ category })
+  if (minPrice !== undefined || maxPrice !== undefined) {
+    filters.push({
+      price: {
+        ...(minPrice !== undefined ? { $gte: minPrice } : {}),
+        ...(maxPrice !== undefined ? { $lte: maxPrice } : {})
+      }
+    })
+  }
+  if (cursor) filters.push(afterCursor(decodeCursor(cursor, order), order))
+
+  const products = await database.collection('products')
+    .find(filters.length ? { $and: filters } : {}, { projection: SEARCH_FIELDS_PROJECTION })
+    .sort(order.field ? { [order.field]: order.direction, _id: order.direction } : { _id: order.direction })
+    .limit(limit + 1)
+    .toArray()
+
+  const hasMore = products.length > limit
+  const page = hasMore ? products.slice(0, limit) : products
+  return {
+    products: page.map(({ _id, ...rest }) => rest),
+    nextCursor: hasMore ? encodeCursor(page[page.length - 1], order) : null
+  }
+}
+
+export async function findActiveCategories(database) {
+  const categories = await database.collection('categories')
+    .find({ active: true })
+    .toArray()
+  return categories.map(({ _id, ...rest }) => rest)
+}
+
+// First product page and categories for the home page, in the same JSON shape as the API.
+// `generatedAt` tells how old a served page's data is.
+export const loadCatalog = unstable_cache(
+  async () => {
+    // Primary, not the catalog route's secondaries: a regeneration triggered by
+    // an admin write must see that write
+    const database = await getDatabase()
+    const [{ products, nextCursor }, categories] = await Promise.all([
+      // The storefront's default sort, so scrolling continues from this page's cursor
+      findCatalogProducts(database, { sort: 'featured' }),
+      findActiveCategories(database)
+    ])
+    return JSON.parse(JSON.stringify({ products, nextCursor, categories, generatedAt: new Date() }))
+  },
+  ['storefront-catalog'],
+  { revalidate: CATALOG_REVALIDATE_SECONDS, tags: [CATALOG_TAG] }
+)
+
+// Call after writes that change what the catalog page shows
+export function revalidateCatalog() {
+  try {
+    revalidateTag(CATALOG_TAG)
+  } catch (error) {
+    // Outside a Next.js request (scripts, workers) there is no cache to invalidate
+    console.error('Catalog revalidation error:', error)
+  }
+}
@@ -0,0 +1,115 @@
+import crypto from 'crypto'
+import { NextResponse } from 'next/server'
+
+// Idempotency-Key support for unsafe POST endpoints
+//
+// The first request with a key claims it (`in_progress`), runs, and stores its
+// response (`completed`). Replays with the same key and body get the stored
+// response back; a different body under the same key is rejected. Keys expire
+// through a TTL index so the collection stays small.
+
+export const IDEMPOTENCY_COLLECTION = 'idempotency_keys'
+export const IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+const KEY_TTL_SECONDS = 24 * 60 * 60
+// How long an in-progress claim blocks retries before another request may take it over
+const LOCK_LEASE_MS = 30 * 1000
+const MAX_KEY_LENGTH = 255
+
+export async function ensureIdempotencyIndexes(database) {
+  await Promise.all([
+    database.collection(IDEMPOTENCY_COLLECTION).createIndex({ scope: 1, key: 1 }, { unique: true }),
+    database.collection(IDEMPOTENCY_COLLECTION).createIndex({ expiresAt: 1 }, { expireAfterSeconds: 0 })
+  ])
+}
+
+const passthrough = {
+  response: null,
+  complete: async () => {},
+  release: async () => {}
+}
+
+function errorResponse(message, status, headers = {}) {
+  return NextResponse.json({ error: message }, { status, headers })
+}
+
+// Claim the request's idempotency key. Returns `{ response }` when the caller
+// should short-circuit (replay or conflict), otherwise `complete(body, session)`
+// to record the result (inside the caller's transaction when it has one) and
+// `release()` to free the key if the handler fails. Pass `body` when the
+// caller has already read the request body.
+export async function beginIdempotentRequest(database, request, scope, body = null) {
+  const key = request.headers.get(IDEMPOTENCY_HEADER)
+  if (!key) return passthrough
+
+  if (key.length > MAX_KEY_LENGTH) {
+    return { ...passthrough, response: errorResponse('Idempotency-Key is too long', 400) }
+  }
+
+  const collection = database.collection(IDEMPOTENCY_COLLECTION)
+  const requestHash = crypto.createHash('sha256').update(body ?? await request.clone().text()).digest('hex')
+  const now = new Date()
+  const claim = {
+    state: 'in_progress',
+    lockedUntil: new Date(now.getTime() + LOCK_LEASE_MS)
+  }
+
+  let claimed = false
+  try {
+    await collection.insertOne({
+      scope,
+      key,
+      requestHash,
+      ...claim,
+      createdAt: now,
+      expiresAt: new Date(now.getTime() + KEY_TTL_SECONDS * 1000)
+    })
+    claimed = true
+  } catch (error) {
+    if (error.code !== 11000) throw error
+  }
+
+  if (!claimed) {
+    const existing = await collection.findOne({ scope, key })
+
+    if (!existing) {
+      // Expired between our insert attempt and the lookup; let the client retry
+      return { ...passthrough, response: errorResponse('Request in progress', 409, { 'Retry-After': '1' }) }
+    }
+    if (existing.requestHash !== requestHash) {
+      return { ...passthrough, response: errorResponse('Idempotency-Key was reused with a different request body', 422) }
+    }
+    if (existing.state === 'completed') {
+      return {
+        ...passthrough,
+        response: NextResponse.json(existing.response.body, {
+          status: existing.response.status,
+          headers: { 'Idempotent-Replayed': 'true' }
+        })
+      }
+    }
+
+    // Take over a claim whose owner has presumably died
+    const takeover = await collection.updateOne(
+      { scope, key, state: 'in_progress', lockedUntil: { $lt: now } },
+      { $set: claim }
+    )
+    if (takeover.modifiedCount === 0) {
+      return { ...passthrough, response: errorResponse('Request in progress', 409, { 'Retry-After': '1' }) }
+    }
+  }
+
+  return {
+    response: null,
+    complete: async (body, session, status = 200) => {
+      await collection.updateOne(
+        { scope, key },
+        { $set: { state: 'completed', response: { status, body }, completedAt: new Date() } },
+        { session }
+      )
+    },
+    release: async () => {
+      await collection.deleteOne({ scope, key, state: 'in_progress' })
+    }
+  }
+}
@@ -0,0 +1,29 @@
+// Client-safe helpers for the optimized product image URLs served by lib/images.js
+
+// Widths generated for every image; the product grid shows images at most ~400px wide
+export const IMAGE_WIDTHS = [160, 320, 480, 640, 960, 1280]
+export const IMAGE_FORMATS = ['avif', 'webp', 'jpeg']
+
+// Content-addressed, so a URL never changes meaning and can be cached forever
+export function imageVariantUrl(hash, width, format) {
+  return `/api/images/${hash}/${width}.${format}`
+}
+
+export function imageSrcSet(hash, format) {
+  return IMAGE_WIDTHS.map(width => `${imageVariantUrl(hash, width, format)} ${width}w`).join(', ')
+}
+
+// Sources for a <picture>: AVIF and WebP srcsets plus a JPEG fallback. Products
+// whose image has not been ingested yet keep their original URL.
+export function productImageSources(product, fallbackWidth = 480) {
+  if (!product.imageHash) {
+    return { sources: [], src: product.image }
+  }
+  return {
+    sources: [
+      { type: 'image/avif', srcSet: imageSrcSet(product.imageHash, 'avif') },
+      { type: 'image/webp', srcSet: imageSrcSet(product.imageHash, 'webp') }
+    ],
+    src: imageVariantUrl(product.imageHash, fallbackWidth, 'jpeg')
+  }
+}
@@ -0,0 +1,235 @@
+import { createHash } from 'crypto'
+import { promises as fs } from 'fs'
+import path from 'path'
+import { ObjectId } from 'mongodb'
+import sharp from 'sharp'
+import { revalidateCatalog } from './catalog'
+import { JOBS_COLLECTION, enqueueJob, kickWorkers } from './jobs'
+import { singleFlight } from './singleflight'
+import { IMAGE_FORMATS, IMAGE_WIDTHS } from './imageUrls'
+
+// Local image pipeline
+//
+// Product images are downloaded once into IMAGE_STORE_DIR and named by the
+// SHA-256 of their bytes. Resized variants are produced on first request
+// (one sharp run per variant even under concurrent requests) and kept on disk
+// next to the original. Because the hash is in the URL, a variant never
+// changes and is served with an immutable, year-long Cache-Control.
+//
+// Ingesting runs on the job queue (IMAGES_INGEST), never inside a request.
+// A job works through products for INGEST_JOB_BUDGET_MS, well inside the job
+// lease, and queues a follow-up job for the rest; each job's `result` names
+// the next one, so a caller can follow the chain to the end.
+
+const STORE_DIR = process.env.IMAGE_STORE_DIR || path.join(process.cwd(), '.data', 'images')
+const ORIGINALS_DIR = path.join(STORE_DIR, 'originals')
+const VARIANTS_DIR = path.join(STORE_DIR, 'variants')
+
+const HASH_PATTERN = /^[0-9a-f]{64}$/
+const MAX_SOURCE_BYTES = 25 * 1024 * 1024
+const DOWNLOAD_TIMEOUT_MS = 30000
+const INGEST_JOB_BUDGET_MS = 20000
+
+export const IMAGES_INGEST = 'images.ingest'
+
+const CONTENT_TYPES = { avif: 'image/avif', webp: 'image/webp', jpeg: 'image/jpeg' }
+const ENCODERS = {
+  avif: image => image.avif({ quality: 50, effort: 4 }),
+  webp: image => image.webp({ quality: 75 }),
+  jpeg: image => image.jpeg({ quality: 78, progressive: true, mozjpeg: true })
+}
+
+export const IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+export class ImageError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+async function writeAtomically(file, data) {
+  await fs.mkdir(path.dirname(file), { recursive: true })
+  const temporary = `${file}.${process.pid}.${Date.now()}.tmp`
+  await fs.writeFile(temporary, data)
+  await fs.rename(temporary, file)
+}
+
+async function exists(file) {
+  try {
+    await fs.access(file)
+    return true
+  } catch {
+    return false
+  }
+}
+
+async function download(url) {
+  const response = await fetch(url, { signal: AbortSignal.timeout(DOWNLOAD_TIMEOUT_MS) })
+  if (!response.ok) {
+    throw new ImageError(`Download failed with HTTP ${response.status}: ${url}`, 502)
+  }
+  const tooLarge = () => new ImageError(`Image larger than ${MAX_SOURCE_BYTES} bytes: ${url}`, 413)
+  if (Number(response.headers.get('content-length')) > MAX_SOURCE_BYTES) {
+    await response.body?.cancel()
+    throw tooLarge()
+  }
+  if (!response.body) {
+    return Buffer.alloc(0)
+  }
+
+  // The declared length can be missing or wrong; count the bytes as they arrive
+  const reader = response.body.getReader()
+  const chunks = []
+  let received = 0
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    received += value.byteLength
+    if (received > MAX_SOURCE_BYTES) {
+      await reader.cancel()
+      throw tooLarge()
+    }
+    chunks.push(value)
+  }
+  return Buffer.concat(chunks, received)
+}
+
+// Store one source image; returns { source, hash, width, height, bytes }
+export async function ingestImage(url) {
+  const bytes = await download(url)
+  const hash = createHash('sha256').update(bytes).digest('hex')
+  const metadata = await sharp(bytes).metadata()
+  const original = path.join(ORIGINALS_DIR, hash)
+  if (!(await exists(original))) {
+    await writeAtomically(original, bytes)
+  }
+  return { source: url, hash, width: metadata.width, height: metadata.height, bytes: bytes.length }
+}
+
+// Ingest the images of the given products (all of them when no ids are given),
+// in _id order after `after`, and record the hashes on each product. Images
+// already ingested are skipped. Stops at `deadline`; `after` in the result is
+// where to continue, null once every product has been handled.
+export async function ingestProductImages(database, {
+  productIds = null,
+  force = false,
+  after = null,
+  deadline = Infinity
+} = {}) {
+  const filter = productIds ? { id: { $in: productIds } } : {}
+  if (!force) {
+    filter.imageHash = { $exists: false }
+  }
+  if (after) {
+    filter._id = { $gt: new ObjectId(after) }
+  }
+  const products = database.collection('products')
+    .find(filter, { projection: { id: 1, image: 1, images: 1 } })
+    .sort({ _id: 1 })
+
+  const results = { ingested: 0, failed: [], after: null }
+  let last = null
+  for await (const product of products) {
+    if (last && Date.now() >= deadline) {
+      results.after = last.toHexString()
+      break
+    }
+    last = product._id
+    const sources = [...new Set([product.image, ...(product.images || [])].filter(Boolean))]
+    if (sources.length === 0) continue
+
+    try {
+      const assets = []
+      for (const source of sources) {
+        assets.push(await ingestImage(source))
+      }
+      await database.collection('products').updateOne({ id: product.id }, {
+        $set: {
+          imageHash: assets[0].hash,
+          imageAssets: assets.map(({ bytes, ...asset }) => asset),
+          updatedAt: new Date()
+        }
+      })
+      results.ingested++
+    } catch (error) {
+      results.failed.push({ productId: product.id, error: error.message })
+    }
+  }
+  return results
+}
+
+// Queue an ingest of the given products (all of them when no ids are given); returns the job
+export async function queueImageIngest(database, { productIds = null, force = false } = {}) {
+  const job = await enqueueJob(database, { type: IMAGES_INGEST, payload: { productIds, force, after: null } })
+  kickWorkers()
+  return job
+}
+
+async function ingestBatch({ database }, payload, job) {
+  const result = await ingestProductImages(database, { ...payload, deadline: Date.now() + INGEST_JOB_BUDGET_MS })
+  await database.collection(JOBS_COLLECTION).updateOne({ id: job.id }, { $set: { result } })
+  job.result = result
+  if (result.ingested > 0) {
+    revalidateCatalog()
+  }
+}
+
+// One follow-up per job (dedupeKey), even when this step is retried
+async function queueRest({ database }, payload, job) {
+  if (!job.result?.after) return
+  const dedupeKey = `${IMAGES_INGEST}:${job.id}`
+  let next
+  try {
+    next = await enqueueJob(database, { type: IMAGES_INGEST, payload: { ...payload, after: job.result.after }, dedupeKey })
+  } catch (error) {
+    if (error.code !== 11000) throw error
+    next = await database.collection(JOBS_COLLECTION).findOne({ dedupeKey })
+  }
+  await database.collection(JOBS_COLLECTION).updateOne({ id: job.id }, { $set: { 'result.nextJobId': next.id } })
+  kickWorkers()
+}
+
+export const imageJobHandlers = {
+  [IMAGES_INGEST]: { ingestBatch, queueRest }
+}
+
+function parseVariant(hash, name) {
+  const [width, format] = (name || '').split('.')
+  if (!HASH_PATTERN.test(hash)) {
+    throw new ImageError('Image not found', 404)
+  }
+  // Only the configured widths and formats, so the cache cannot be filled with arbitrary sizes
+  if (!IMAGE_WIDTHS.includes(Number(width)) || !IMAGE_FORMATS.includes(format)) {
+    throw new ImageError(`Unsupported variant; widths: ${IMAGE_WIDTHS.join(', ')}, formats: ${IMAGE_FORMATS.join(', ')}`, 404)
+  }
+  return { width: Number(width), format }
+}
+
+async function renderVariant(hash, width, format, file) {
+  const original = path.join(ORIGINALS_DIR, hash)
+  if (!(await exists(original))) {
+    throw new ImageError('Image not found', 404)
+  }
+  const image = sharp(original).rotate().resize({ width, withoutEnlargement: true })
+  const output = await ENCODERS[format](image).toBuffer()
+  await writeAtomically(file, output)
+  return output
+}
+
+// Returns { body, contentType, etag } for /api/images/:hash/:width.:format
+export async function getImageVariant(hash, name) {
+  const { width, format } = parseVariant(hash, name)
+  const file = path.join(VARIANTS_DIR, hash, `${width}.${format}`)
+
+  let body
+  try {
+    body = await fs.readFile(file)
+  } catch (error) {
+    if (error.code !== 'ENOENT') throw error
+    const { value } = await singleFlight(file, () => renderVariant(hash, width, format, file), 'images')
+    body = value
+  }
+
+  return { body, contentType: CONTENT_TYPES[format], etag: `"${hash.slice(0, 16)}-${width}-${format}"` }
+}
@@ -0,0 +1,207 @@
+import { v4 as uuidv4 } from 'uuid'
+
+// Durable job queue on a MongoDB collection (transactional outbox)
+//
+// Jobs are inserted in the same transaction as the write that caused them, so
+// a committed order always has its follow-up job and a rolled-back one never
+// does. Workers claim jobs with an atomic findOneAndUpdate and a lease; a job
+// whose worker dies is picked up again once the lease runs out. Failed jobs
+// are retried with exponential backoff and parked as `dead` after MAX_ATTEMPTS.
+
+export const JOBS_COLLECTION = 'jobs'
+
+export const JOB_STATUS = {
+  PENDING: 'pending',
+  PROCESSING: 'processing',
+  DONE: 'done',
+  DEAD: 'dead'
+}
+
+const MAX_ATTEMPTS = 8
+const LEASE_MS = 60 * 1000
+const BASE_BACKOFF_MS = 1000
+const MAX_BACKOFF_MS = 5 * 60 * 1000
+const POLL_INTERVAL_MS = 500
+// Finished jobs are kept for a week for inspection, then expire
+const DONE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+export async function ensureJobIndexes(database) {
+  await Promise.all([
+    database.collection(JOBS_COLLECTION).createIndex({ status: 1, availableAt: 1 }),
+    database.collection(JOBS_COLLECTION).createIndex(
+      { dedupeKey: 1 },
+      { unique: true, partialFilterExpression: { dedupeKey: { $type: 'string' } } }
+    ),
+    database.collection(JOBS_COLLECTION).createIndex({ expiresAt: 1 }, { expireAfterSeconds: 0 })
+  ])
+}
+
+export async function enqueueJob(database, { type, payload, dedupeKey = null }, session) {
+  const now = new Date()
+  const job = {
+    id: uuidv4(),
+    type,
+    payload,
+    dedupeKey,
+    status: JOB_STATUS.PENDING,
+    attempts: 0,
+    completedSteps: [],
+    availableAt: now,
+    lockedUntil: null,
+    lastError: null,
+    createdAt: now,
+    updatedAt: now
+  }
+  await database.collection(JOBS_COLLECTION).insertOne(job, { session })
+  return job
+}
+
+async function claimJob(database, workerId) {
+  const now = new Date()
+  return database.collection(JOBS_COLLECTION).findOneAndUpdate(
+    {
+      $or: [
+        { status: JOB_STATUS.PENDING, availableAt: { $lte: now } },
+        { status: JOB_STATUS.PROCESSING, lockedUntil: { $lt: now } }
+      ]
+    },
+    {
+      $set: {
+        status: JOB_STATUS.PROCESSING,
+        lockedUntil: new Date(now.getTime() + LEASE_MS),
+        workerId,
+        updatedAt: now
+      },
+      $inc: { attempts: 1 }
+    },
+    { sort: { availableAt: 1 }, returnDocument: 'after' }
+  )
+}
+
+function backoffMs(attempts) {
+  const delay = Math.min(MAX_BACKOFF_MS, BASE_BACKOFF_MS * 2 ** (attempts - 1))
+  return delay / 2 + Math.random() * delay / 2
+}
+
+// Handlers are objects of named steps run in order; completed step names are
+// recorded on the job so a retry resumes after the last step that succeeded.
+// Steps receive `{ client, database }` so they can open their own transactions.
+async function runJob(context, job, handlers) {
+  const steps = handlers[job.type]
+  const collection = context.database.collection(JOBS_COLLECTION)
+
+  try {
+    if (!steps) {
+      throw new Error(`No handler for job type ${job.type}`)
+    }
+
+    for (const [name, step] of Object.entries(steps)) {
+      if (job.completedSteps.includes(name)) continue
+      await step(context, job.payload, job)
+      await collection.updateOne({ id: job.id }, { $addToSet: { completedSteps: name } })
+      job.completedSteps.push(name)
+    }
+
+    const now = new Date()
+    await collection.updateOne({ id: job.id }, {
+      $set: {
+        status: JOB_STATUS.DONE,
+        lockedUntil: null,
+        completedAt: now,
+        updatedAt: now,
+        expiresAt: new Date(now.getTime() + DONE_TTL_SECONDS * 1000)
+      }
+    })
+    return true
+  } catch (error) {
+    const dead = !steps || job.attempts >= MAX_ATTEMPTS
+    const now = new Date()
+    await collection.updateOne({ id: job.id }, {
+      $set: {
+        status: dead ? JOB_STATUS.DEAD : JOB_STATUS.PENDING,
+        availableAt: new Date(now.getTime() + (dead ? 0 : backoffMs(job.attempts))),
+        lockedUntil: null,
+        lastError: error.message,
+        updatedAt: now
+      }
+    })
+    if (dead) {
+      console.error(`Job ${job.id} (${job.type}) moved to dead letter:`, error)
+    }
+    return false
+  }
+}
+
+// Claim and run jobs until none are due or `limit` have been processed
+export async function drainJobs(context, handlers, { limit = Infinity, workerId = 'drain' } = {}) {
+  let processed = 0
+  let failed = 0
+  while (processed < limit) {
+    const job = await claimJob(context.database, workerId)
+    if (!job) break
+    processed++
+    if (!(await runJob(context, job, handlers))) failed++
+  }
+  return { processed, failed }
+}
+
+let wakeWorkers = null
+
+// Wake idle in-process workers; call after the transaction that enqueued jobs commits
+export function kickWorkers() {
+  if (wakeWorkers) wakeWorkers()
+}
+
+// Background workers inside the API process. Each worker drains the queue,
+// then sleeps until the poll interval passes or a new job is enqueued here.
+export function startWorkers(context, handlers, { concurrency = 2 } = {}) {
+  if (wakeWorkers) return
+
+  let sleepers = []
+  wakeWorkers = () => {
+    const waiting = sleepers
+    sleepers = []
+    waiting.forEach(wake => wake())
+  }
+
+  for (let i = 0; i < concurrency; i++) {
+    const workerId = `${process.pid}-${i}`
+    ;(async () => {
+      for (;;) {
+        try {
+          await drainJobs(context, handlers, { workerId })
+        } catch (error) {
+          console.error('Job worker error:', error)
+        }
+        await new Promise(resolve => {
+          const timer = setTimeout(resolve, POLL_INTERVAL_MS)
+          sleepers.push(() => {
+            clearTimeout(timer)
+            resolve()
+          })
+        })
+      }
+    })()
+  }
+}
+
+export async function jobStats(database) {
+  const statuses = Object.values(JOB_STATUS)
+  const counts = await Promise.all(statuses.map(status =>
+    database.collection(JOBS_COLLECTION).countDocuments({ status })
+  ))
+  return Object.fromEntries(statuses.map((status, index) => [status, counts[index]]))
+}
+
+export async function findJob(database, id) {
+  return database.collection(JOBS_COLLECTION).findOne({ id }, { projection: { _id: 0 } })
+}
+
+export async function retryDeadJobs(database) {
+  const result = await database.collection(JOBS_COLLECTION).updateMany(
+    { status: JOB_STATUS.DEAD },
+    { $set: { status: JOB_STATUS.PENDING, attempts: 0, availableAt: new Date(), updatedAt: new Date() } }
+  )
+  kickWorkers()
+  return result.modifiedCount
+}
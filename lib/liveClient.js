@@ -0,0 +1,23 @@
+// Browser side of the live update streams (/api/live, /api/admin/live)
+
+// Calls handlers[event](data) for each event; `onReconnect` runs when the
+// stream comes back after a drop, since events sent meanwhile are lost.
+// Returns a function that closes the stream.
+export function subscribeLive(path, handlers, { onReconnect } = {}) {
+  if (typeof EventSource === 'undefined') {
+    return () => {}
+  }
+
+  const source = new EventSource(path)
+  let connected = false
+
+  source.addEventListener('ready', () => {
+    if (connected && onReconnect) onReconnect()
+    connected = true
+  })
+  for (const [event, handler] of Object.entries(handlers)) {
+    source.addEventListener(event, message => handler(JSON.parse(message.data)))
+  }
+
+  return () => source.close()
+}
@@ -0,0 +1,275 @@
+// Live stock and order-status updates for Server-Sent Events subscribers
+//
+// One feed per process reads the changes and fans them out to every open
+// stream, so a thousand subscribers cost one change stream, not a thousand.
+// The feed runs only while someone is subscribed. It uses a MongoDB change
+// stream, or polls `updatedAt` when the server has none (standalone mongod).
+// Each event is serialized once and the same bytes go to every subscriber.
+//
+//   LIVE_UPDATES_MODE=auto|changeStream|poll   (default auto)
+//   LIVE_POLL_INTERVAL_MS=1000                 polling period
+//   LIVE_MAX_SUBSCRIBERS=10000                 further streams get 503
+//
+// Events:
+//   stock  { productId, stock, updatedAt }
+//   order  { id, orderNumber, status, userId, total, createdAt, updatedAt, operation }
+
+export const LIVE_CHANNELS = { stock: 'stock', orders: 'order' }
+
+const MODE = process.env.LIVE_UPDATES_MODE || 'auto'
+const POLL_INTERVAL_MS = parseInt(process.env.LIVE_POLL_INTERVAL_MS) || 1000
+const MAX_SUBSCRIBERS = parseInt(process.env.LIVE_MAX_SUBSCRIBERS) || 10000
+const POLL_BATCH_SIZE = 500
+const HEARTBEAT_MS = 15000
+const RESTART_DELAY_MS = 1000
+// A subscriber this many events behind is too slow to keep up and is dropped
+const MAX_QUEUED_EVENTS = 1000
+// "The $changeStream stage is only supported on replica sets"
+const CHANGE_STREAMS_UNSUPPORTED = 40573
+
+const CHANGE_PIPELINE = [
+  {
+    $match: {
+      $or: [
+        { 'ns.coll': 'products', operationType: 'update', 'updateDescription.updatedFields.stock': { $exists: true } },
+        { 'ns.coll': 'orders', operationType: 'insert' },
+        { 'ns.coll': 'orders', operationType: 'update', 'updateDescription.updatedFields.status': { $exists: true } }
+      ]
+    }
+  },
+  {
+    $project: {
+      operationType: 1,
+      'ns.coll': 1,
+      'fullDocument.id': 1,
+      'fullDocument.stock': 1,
+      'fullDocument.orderNumber': 1,
+      'fullDocument.status': 1,
+      'fullDocument.userId': 1,
+      'fullDocument.total': 1,
+      'fullDocument.createdAt': 1,
+      'fullDocument.updatedAt': 1
+    }
+  }
+]
+
+const ORDER_EVENT_PROJECTION = {
+  _id: 0, id: 1, orderNumber: 1, status: 1, userId: 1, total: 1, createdAt: 1, updatedAt: 1
+}
+
+const encoder = new TextEncoder()
+const subscribers = new Set()
+const stats = { mode: null, events: 0, delivered: 0, dropped: 0, restarts: 0 }
+let feed = null
+let heartbeat = null
+
+export class LiveUpdatesError extends Error {
+  constructor(message, status = 503) {
+    super(message)
+    this.status = status
+  }
+}
+
+export async function ensureLiveUpdateIndexes(database) {
+  // Only the polling fallback queries these
+  await Promise.all([
+    database.collection('products').createIndex({ updatedAt: 1, id: 1 }),
+    database.collection('orders').createIndex({ updatedAt: 1, id: 1 })
+  ])
+}
+
+function stockEvent(product) {
+  return { productId: product.id, stock: product.stock, updatedAt: product.updatedAt }
+}
+
+function orderEvent(order, operation) {
+  const { _id, ...fields } = order
+  return { ...fields, operation }
+}
+
+function frame(event, data) {
+  return encoder.encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`)
+}
+
+function publish(event, data) {
+  stats.events++
+  const bytes = frame(event, data)
+  for (const subscriber of subscribers) {
+    if (subscriber.events.has(event)) {
+      subscriber.write(bytes)
+    }
+  }
+}
+
+// Change streams resume after transient errors from the last token they delivered
+function changeStreamFeed(database, onUnsupported) {
+  let stream = null
+  let resumeAfter
+  let stopped = false
+  let timer = null
+
+  const open = () => {
+    stream = database.watch(CHANGE_PIPELINE, {
+      fullDocument: 'updateLookup',
+      ...(resumeAfter ? { resumeAfter } : {})
+    })
+    stream.on('change', change => {
+      resumeAfter = change._id
+      const document = change.fullDocument
+      if (!document) return // deleted before the lookup
+      if (change.ns.coll === 'products') {
+        publish(LIVE_CHANNELS.stock, stockEvent(document))
+      } else {
+        publish(LIVE_CHANNELS.orders, orderEvent(document, change.operationType))
+      }
+    })
+    stream.on('error', error => {
+      stream.close().catch(() => {})
+      if (stopped) return
+      if (error.code === CHANGE_STREAMS_UNSUPPORTED && MODE === 'auto') {
+        onUnsupported()
+        return
+      }
+      console.error('Live updates change stream error:', error)
+      stats.restarts++
+      timer = setTimeout(open, RESTART_DELAY_MS)
+    })
+  }
+
+  open()
+  return {
+    stop() {
+      stopped = true
+      clearTimeout(timer)
+      stream?.close().catch(() => {})
+    }
+  }
+}
+
+// Polls documents in (updatedAt, id) order, resuming after the last one seen,
+// so the feed keeps moving even when a bulk update stamps more documents with
+// one updatedAt than fit in a batch. Any product update is reported as a stock event and any order update as an
+// order event, including writes that did not change those fields. Orders
+// created since the previous poll are reported with operation 'insert'.
+function pollingFeed(database) {
+  const cursors = {
+    products: { updatedAt: new Date(), id: '' },
+    orders: { updatedAt: new Date(), id: '' }
+  }
+  let stopped = false
+  let timer = null
+
+  const pollCollection = async (name, projection, emit) => {
+    const { updatedAt, id } = cursors[name]
+    const documents = await database.collection(name)
+      .find({ $or: [{ updatedAt: { $gt: updatedAt } }, { updatedAt, id: { $gt: id } }] }, { projection })
+      .sort({ updatedAt: 1, id: 1 })
+      .limit(POLL_BATCH_SIZE)
+      .toArray()
+
+    for (const document of documents) {
+      emit(document, document.createdAt >= updatedAt)
+    }
+    const last = documents.at(-1)
+    if (last) {
+      cursors[name] = { updatedAt: last.updatedAt, id: last.id ?? '' }
+    }
+  }
+
+  const poll = async () => {
+    try {
+      await Promise.all([
+        pollCollection('products', { _id: 0, id: 1, stock: 1, updatedAt: 1 },
+          product => publish(LIVE_CHANNELS.stock, stockEvent(product))),
+        pollCollection('orders', ORDER_EVENT_PROJECTION,
+          (order, created) => publish(LIVE_CHANNELS.orders, orderEvent(order, created ? 'insert' : 'update')))
+      ])
+    } catch (error) {
+      console.error('Live updates polling error:', error)
+    }
+    if (!stopped) {
+      timer = setTimeout(poll, POLL_INTERVAL_MS)
+    }
+  }
+
+  poll()
+  return {
+    stop() {
+      stopped = true
+      clearTimeout(timer)
+    }
+  }
+}
+
+function startFeed(database) {
+  const startPolling = () => {
+    console.log('Change streams unavailable; polling for live updates')
+    stats.mode = 'poll'
+    feed = pollingFeed(database)
+  }
+
+  if (MODE === 'poll') {
+    startPolling()
+  } else {
+    stats.mode = 'changeStream'
+    feed = changeStreamFeed(database, () => {
+      if (subscribers.size > 0) startPolling()
+    })
+  }
+
+  heartbeat = setInterval(() => {
+    const bytes = encoder.encode(': ping\n\n')
+    subscribers.forEach(subscriber => subscriber.write(bytes))
+  }, HEARTBEAT_MS)
+}
+
+function stopFeed() {
+  feed?.stop()
+  clearInterval(heartbeat)
+  feed = null
+  heartbeat = null
+  stats.mode = null
+}
+
+// An SSE body streaming the given channels until the client disconnects
+export function openLiveStream(database, channels, signal) {
+  if (subscribers.size >= MAX_SUBSCRIBERS) {
+    throw new LiveUpdatesError('Too many live update subscribers')
+  }
+
+  let subscriber
+  const unsubscribe = () => {
+    if (!subscribers.delete(subscriber)) return
+    if (subscribers.size === 0) stopFeed()
+  }
+
+  const stream = new ReadableStream({
+    start(controller) {
+      subscriber = {
+        events: new Set(channels.map(channel => LIVE_CHANNELS[channel])),
+        write(bytes) {
+          if (controller.desiredSize < -MAX_QUEUED_EVENTS) {
+            stats.dropped++
+            unsubscribe()
+            controller.close()
+            return
+          }
+          stats.delivered++
+          controller.enqueue(bytes)
+        }
+      }
+      subscribers.add(subscriber)
+      if (!feed) startFeed(database)
+      // Reconnect delay for EventSource, and an event so clients know they are live
+      controller.enqueue(encoder.encode(`retry: 3000\nevent: ready\ndata: ${JSON.stringify({ channels })}\n\n`))
+    },
+    cancel: unsubscribe
+  })
+
+  signal?.addEventListener('abort', unsubscribe)
+  return stream
+}
+
+export function liveStats() {
+  return { ...stats, subscribers: subscribers.size }
+}
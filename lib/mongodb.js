@@ -0,0 +1,129 @@
+import { MongoClient, ReadPreference } from 'mongodb'
+import { monitorPool } from './poolMetrics'
+
+// MongoDB client singleton shared by the API route and server-rendered pages
+//
+// Next.js bundles each route handler and page separately, so module-level
+// variables would give each of them its own client and pool. The state lives
+// on globalThis instead, making every bundle in the process share one pool.
+//
+// Each admission route class (lib/admission.js) gets its own database handle
+// on that client, with its own read preference and write concern:
+//   catalog   secondaries when available, at most maxStalenessSeconds behind
+//   checkout  primary, majority write concern
+//   admin     primary
+// Configured like admission limits, e.g.
+//   MONGO_ROUTE_CATALOG=readPreference:nearest,maxStalenessSeconds:120
+// maxStalenessSeconds must be at least 90. Without a replica set every
+// preference reads from the one server.
+
+const ROUTE_DEFAULTS = {
+  catalog: { readPreference: 'secondaryPreferred', maxStalenessSeconds: 90, w: null },
+  checkout: { readPreference: 'primary', maxStalenessSeconds: null, w: 'majority' },
+  admin: { readPreference: 'primary', maxStalenessSeconds: null, w: null }
+}
+
+const state = globalThis.__mongo || (globalThis.__mongo = { client: null, db: null, connecting: null, routeDbs: {} })
+
+function parseRouteOptions(routeClass) {
+  const options = { ...ROUTE_DEFAULTS[routeClass] }
+  const raw = process.env[`MONGO_ROUTE_${routeClass.toUpperCase()}`]
+  if (raw) {
+    for (const pair of raw.split(',')) {
+      const [key, value] = pair.split(':').map(part => part.trim())
+      if (key in options) {
+        options[key] = key === 'maxStalenessSeconds' ? Number(value) || null : value
+      }
+    }
+  }
+  return options
+}
+
+const routeOptions = Object.fromEntries(Object.keys(ROUTE_DEFAULTS).map(name => [name, parseRouteOptions(name)]))
+
+function databaseOptions({ readPreference, maxStalenessSeconds, w }) {
+  const options = {
+    // Staleness bounds only apply to secondary reads; the driver rejects them for primary
+    readPreference: readPreference === 'primary' || !maxStalenessSeconds
+      ? readPreference
+      : new ReadPreference(readPreference, undefined, { maxStalenessSeconds })
+  }
+  if (w) {
+    options.writeConcern = { w: Number(w) || w }
+  }
+  return options
+}
+
+export async function getDatabase() {
+  // If already connected, return existing database
+  if (state.db) {
+    return state.db
+  }
+
+  // Concurrent callers share one connection attempt, so while the database is
+  // unreachable every one of them gets the connection error (never an unset db)
+  if (!state.connecting) {
+    state.connecting = openConnection().finally(() => {
+      state.connecting = null
+    })
+  }
+  return state.connecting
+}
+
+// Database handle for a route class; classes without routing options use the default handle
+export async function getDatabaseFor(routeClass) {
+  const database = await getDatabase()
+  const options = routeOptions[routeClass]
+  if (!options) {
+    return database
+  }
+  if (!state.routeDbs[routeClass]) {
+    state.routeDbs[routeClass] = state.client.db(process.env.DB_NAME, databaseOptions(options))
+  }
+  return state.routeDbs[routeClass]
+}
+
+export function routingStats() {
+  return routeOptions
+}
+
+// The connected client (for sessions and transactions); call after getDatabase()
+export function getMongoClient() {
+  return state.client
+}
+
+async function openConnection() {
+  try {
+    if (!state.client) {
+      console.log('Initializing MongoDB connection...')
+      state.client = new MongoClient(process.env.MONGO_URL, {
+        // Keep the admission concurrency limits (lib/admission.js) summing to this
+        maxPoolSize: parseInt(process.env.MONGO_MAX_POOL_SIZE) || 10,
+        serverSelectionTimeoutMS: 5000,
+        socketTimeoutMS: 45000,
+        family: 4
+      })
+      monitorPool(state.client)
+      await state.client.connect()
+      console.log('MongoDB client connected successfully')
+    }
+
+    state.db = state.client.db(process.env.DB_NAME)
+    console.log(`Connected to database: ${process.env.DB_NAME}`)
+    return state.db
+
+  } catch (error) {
+    console.error('MongoDB connection error:', error)
+
+    // Reset client and db on error, closing the failed client so its monitors stop
+    const failed = state.client
+    state.client = null
+    state.db = null
+    state.routeDbs = {}
+    if (failed) {
+      failed.close().catch(() => {})
+    }
+
+    throw new Error(`Database connection failed: ${error.message}`)
+  }
+}
@@ -0,0 +1,74 @@
+// Order numbers: ORD-YYMMDD-NNNNNN (UTC day plus a per-day sequence)
+//
+// Sequences come from one counter document per day, but each process reserves
+// them in blocks with a single $inc and hands them out from memory, so the
+// counter is written once per block rather than once per order. Numbers are
+// unique across processes; a block left unused at restart or at midnight just
+// leaves a gap. Within a day they sort in allocation order. Past 999999 orders
+// in a day the field would have to widen and break that order, so checkout
+// fails with a 503 instead.
+
+export const COUNTERS_COLLECTION = 'counters'
+
+const PREFIX = 'ORD'
+const SEQUENCE_DIGITS = 6
+const MAX_SEQUENCE = 10 ** SEQUENCE_DIGITS - 1
+const BLOCK_SIZE = parseInt(process.env.ORDER_NUMBER_BLOCK) || 20
+
+export class OrderNumberError extends Error {
+  constructor(message, status = 503) {
+    super(message)
+    this.status = status
+  }
+}
+
+let block = { day: null, next: 0, end: -1 }
+let refilling = null
+
+function utcDay(date) {
+  return date.toISOString().slice(2, 10).replace(/-/g, '')
+}
+
+export function formatOrderNumber(day, sequence) {
+  if (sequence > MAX_SEQUENCE) {
+    throw new OrderNumberError(`Order numbers for ${day} are used up (more than ${MAX_SEQUENCE} orders)`)
+  }
+  return `${PREFIX}-${day}-${String(sequence).padStart(SEQUENCE_DIGITS, '0')}`
+}
+
+async function reserveBlock(database, day) {
+  const counter = await database.collection(COUNTERS_COLLECTION).findOneAndUpdate(
+    { _id: `orderNumber:${day}` },
+    { $inc: { value: BLOCK_SIZE } },
+    { upsert: true, returnDocument: 'after' }
+  )
+  block = { day, next: counter.value - BLOCK_SIZE + 1, end: counter.value }
+}
+
+// Returns { orderNumber, orderSeq }. Call outside the checkout transaction so
+// the shared counter never becomes part of (and a conflict point for) it.
+export async function nextOrderNumber(database, now = new Date()) {
+  const day = utcDay(now)
+  for (;;) {
+    if (block.day === day && block.next <= block.end) {
+      const orderSeq = block.next++
+      return { orderNumber: formatOrderNumber(day, orderSeq), orderSeq }
+    }
+    // One refill at a time; everyone waiting retries against the new block
+    if (!refilling) {
+      refilling = reserveBlock(database, day).finally(() => {
+        refilling = null
+      })
+    }
+    await refilling
+  }
+}
+
+// Orders numbered before this scheme have no orderSeq and may contain
+// duplicates, so uniqueness is enforced for new orders only
+export async function ensureOrderNumberIndexes(database) {
+  await database.collection('orders').createIndex(
+    { orderNumber: 1 },
+    { unique: true, partialFilterExpression: { orderSeq: { $exists: true } } }
+  )
+}
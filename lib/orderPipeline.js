@@ -0,0 +1,126 @@
+import { v4 as uuidv4 } from 'uuid'
+import { inheritTestRun } from './testRuns'
+import { withTransaction } from './wallet'
+
+// Side effects of a placed order, run by the job workers after checkout has
+// already returned. Steps run in order and each one is safe to repeat, since a
+// crash between a step and its bookkeeping makes the worker run it again.
+
+export const ORDER_CREATED = 'order.created'
+
+const STORE_WHATSAPP_NUMBER = '963955186181'
+
+async function loadOrder(database, orderId) {
+  const order = await database.collection('orders').findOne({ id: orderId })
+  if (!order) {
+    throw new Error(`Order ${orderId} not found`)
+  }
+  return order
+}
+
+// Decrement stock once per order. The reservation records (unique per order)
+// are written in the same transaction as the stock change, so a repeated step
+// fails on the duplicate reservation instead of decrementing twice.
+async function reserveStock({ client, database }, { orderId }) {
+  const order = await loadOrder(database, orderId)
+  const items = (order.items || []).filter(item => (item.productId || item.id) && item.quantity > 0)
+  if (items.length === 0) return
+
+  try {
+    await withTransaction(client, async (session) => {
+      await database.collection('stock_reservations').insertOne({
+        orderId,
+        items: items.map(item => ({ productId: item.productId || item.id, quantity: item.quantity })),
+        createdAt: new Date(),
+        ...inheritTestRun(order)
+      }, { session })
+      await database.collection('products').bulkWrite(items.map(item => ({
+        updateOne: {
+          filter: { id: item.productId || item.id },
+          update: { $inc: { stock: -item.quantity }, $set: { updatedAt: new Date() } }
+        }
+      })), { ordered: false, session })
+    })
+  } catch (error) {
+    if (error.code !== 11000) throw error
+  }
+}
+
+async function redeemCoupon({ database }, { orderId }) {
+  const order = await loadOrder(database, orderId)
+  if (!order.couponCode) return
+
+  await database.collection('coupons').updateOne(
+    { code: order.couponCode.toUpperCase() },
+    { $addToSet: { usedBy: order.userId } }
+  )
+}
+
+function whatsappMessage(order) {
+  const items = (order.items || [])
+    .map((item, index) => `${index + 1}. ${item.name} × ${item.quantity}`)
+    .join('\n')
+
+  return `🛍️ طلب جديد من متجري\nرقم الطلب: #${order.orderNumber}\n\n📦 تفاصيل الطلب:\n${items}\n\n💰 الإجمالي: ${order.total}`
+}
+
+// Notifications are upserted by (orderId, channel), so repeats do not duplicate them
+async function notify({ database }, { orderId }) {
+  const order = await loadOrder(database, orderId)
+  const now = new Date()
+  const notifications = [{
+    channel: 'in_app',
+    userId: order.userId,
+    message: `تم استلام طلبك رقم #${order.orderNumber}`
+  }]
+
+  if (order.paymentMethod === 'whatsapp') {
+    const message = whatsappMessage(order)
+    notifications.push({
+      channel: 'whatsapp',
+      userId: order.userId,
+      message,
+      link: `https://wa.me/${STORE_WHATSAPP_NUMBER}?text=${encodeURIComponent(message)}`
+    })
+  }
+
+  await database.collection('notifications').bulkWrite(notifications.map(notification => ({
+    updateOne: {
+      filter: { orderId, channel: notification.channel },
+      update: {
+        $setOnInsert: {
+          id: uuidv4(),
+          orderId,
+          ...notification,
+          status: 'queued',
+          createdAt: now,
+          ...inheritTestRun(order)
+        }
+      },
+      upsert: true
+    }
+  })), { ordered: false })
+}
+
+async function markProcessed({ database }, { orderId }) {
+  await database.collection('orders').updateOne(
+    { id: orderId },
+    { $set: { postProcessedAt: new Date(), updatedAt: new Date() } }
+  )
+}
+
+export const orderJobHandlers = {
+  [ORDER_CREATED]: {
+    reserveStock,
+    redeemCoupon,
+    notify,
+    markProcessed
+  }
+}
+
+export async function ensureOrderPipelineIndexes(database) {
+  await Promise.all([
+    database.collection('stock_reservations').createIndex({ orderId: 1 }, { unique: true }),
+    database.collection('notifications').createIndex({ orderId: 1, channel: 1 }, { unique: true })
+  ])
+}
@@ -0,0 +1,36 @@
+// Order status state machine, shared by the API and the admin dashboard
+
+export const ORDER_STATUS = {
+  PENDING: 'pending',
+  CONFIRMED: 'confirmed',
+  PROCESSING: 'processing',
+  SHIPPED: 'shipped',
+  DELIVERED: 'delivered',
+  COMPLETED: 'completed',
+  CANCELLED: 'cancelled'
+}
+
+// Allowed next statuses; completed and cancelled are terminal
+export const ORDER_TRANSITIONS = {
+  pending: ['confirmed', 'processing', 'cancelled'],
+  confirmed: ['processing', 'cancelled'],
+  processing: ['shipped', 'cancelled'],
+  shipped: ['delivered', 'completed'],
+  delivered: ['completed'],
+  completed: [],
+  cancelled: []
+}
+
+export const ORDER_STATUS_LABELS = {
+  pending: 'قيد الانتظار',
+  confirmed: 'مؤكد',
+  processing: 'قيد المعالجة',
+  shipped: 'تم الشحن',
+  delivered: 'تم التسليم',
+  completed: 'مكتمل',
+  cancelled: 'ملغي'
+}
+
+export function canTransition(from, to) {
+  return (ORDER_TRANSITIONS[from] || []).includes(to)
+}
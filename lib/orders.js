@@ -0,0 +1,192 @@
+import { ORDER_STATUS, ORDER_TRANSITIONS, canTransition } from './orderStatus'
+
+// Admin order queries and status transitions
+//
+// Every status change is checked against ORDER_TRANSITIONS and applied with
+// the previous status in the filter, so two admins racing on the same order
+// cannot both succeed. Each transition is stamped in statusTimestamps and
+// appended to statusHistory; statusChangedAt backs "pending since X" queues.
+
+const DEFAULT_PAGE_SIZE = 50
+const MAX_PAGE_SIZE = 200
+const DATE_FIELDS = ['createdAt', 'statusChangedAt']
+
+// Fields an admin may edit besides the status
+const EDITABLE_FIELDS = ['customerInfo', 'trackingNumber', 'adminNotes']
+
+export class OrderError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+export async function ensureOrderIndexes(database) {
+  const orders = database.collection('orders')
+  await Promise.all([
+    orders.createIndex({ createdAt: -1, id: -1 }),
+    orders.createIndex({ status: 1, createdAt: -1, id: -1 }),
+    orders.createIndex({ status: 1, statusChangedAt: -1, id: -1 }),
+    orders.createIndex({ userId: 1, createdAt: -1, id: -1 })
+  ])
+  await backfillStatusFields(database)
+}
+
+// Orders written before statusChangedAt existed, or loaded in bulk without it,
+// would be missing from statusChangedAt listings. They get it from their last
+// write, with a one-entry history. Idempotent; with nothing left to fill it is
+// an index scan over the { status, statusChangedAt } index.
+export async function backfillStatusFields(database) {
+  const changedAt = { $toDate: { $ifNull: ['$updatedAt', '$createdAt'] } }
+  await database.collection('orders').updateMany(
+    { status: { $in: Object.values(ORDER_STATUS) }, statusChangedAt: null },
+    [{
+      $set: {
+        statusChangedAt: changedAt,
+        statusTimestamps: { $ifNull: ['$statusTimestamps', { $arrayToObject: [[{ k: '$status', v: changedAt }]] }] },
+        statusHistory: { $ifNull: ['$statusHistory', [{ from: null, to: '$status', at: changedAt }]] }
+      }
+    }]
+  )
+}
+
+// Status fields for a new order
+export function initialStatusFields(now) {
+  return {
+    status: ORDER_STATUS.PENDING,
+    statusChangedAt: now,
+    statusTimestamps: { [ORDER_STATUS.PENDING]: now },
+    statusHistory: [{ from: null, to: ORDER_STATUS.PENDING, at: now }]
+  }
+}
+
+function encodeCursor(order, dateField) {
+  const value = order[dateField] instanceof Date ? order[dateField].toISOString() : order[dateField]
+  return Buffer.from(JSON.stringify([value, order.id])).toString('base64url')
+}
+
+function decodeCursor(cursor) {
+  try {
+    const [value, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString())
+    const date = new Date(value)
+    if (Number.isNaN(date.getTime()) || typeof id !== 'string') throw new Error()
+    return { date, id }
+  } catch {
+    throw new OrderError('Invalid cursor')
+  }
+}
+
+function parseDate(value, name) {
+  const date = new Date(value)
+  if (Number.isNaN(date.getTime())) {
+    throw new OrderError(`Invalid ${name} date`)
+  }
+  return date
+}
+
+// GET /admin/orders?status=pending,confirmed&userId=&from=&to=&dateField=statusChangedAt&order=asc&limit=&cursor=
+// Keyset pagination on (dateField, id); every filter combination has a compound index.
+export async function listOrders(database, searchParams) {
+  const dateField = searchParams.get('dateField') || 'createdAt'
+  if (!DATE_FIELDS.includes(dateField)) {
+    throw new OrderError(`dateField must be one of ${DATE_FIELDS.join(', ')}`)
+  }
+  const direction = searchParams.get('order') === 'asc' ? 1 : -1
+  const limit = Math.min(Math.max(parseInt(searchParams.get('limit')) || DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+
+  const filter = {}
+  if (searchParams.get('status')) {
+    const statuses = searchParams.get('status').split(',')
+    const unknown = statuses.filter(status => !(status in ORDER_TRANSITIONS))
+    if (unknown.length > 0) {
+      throw new OrderError(`Unknown status: ${unknown.join(', ')}`)
+    }
+    filter.status = statuses.length === 1 ? statuses[0] : { $in: statuses }
+  }
+  if (searchParams.get('userId')) {
+    filter.userId = searchParams.get('userId')
+  }
+
+  const range = {}
+  if (searchParams.get('from')) range.$gte = parseDate(searchParams.get('from'), 'from')
+  if (searchParams.get('to')) range.$lt = parseDate(searchParams.get('to'), 'to')
+  if (Object.keys(range).length > 0) {
+    filter[dateField] = range
+  }
+
+  if (searchParams.get('cursor')) {
+    const { date, id } = decodeCursor(searchParams.get('cursor'))
+    const past = direction === 1 ? '$gt' : '$lt'
+    filter.$or = [
+      { [dateField]: { [past]: date } },
+      { [dateField]: date, id: { [past]: id } }
+    ]
+  }
+
+  const orders = await database.collection('orders')
+    .find(filter, { projection: { _id: 0, statusHistory: 0 } })
+    .sort({ [dateField]: direction, id: direction })
+    .limit(limit + 1)
+    .toArray()
+
+  const hasMore = orders.length > limit
+  const page = hasMore ? orders.slice(0, limit) : orders
+  return {
+    orders: page,
+    nextCursor: hasMore ? encodeCursor(page[page.length - 1], dateField) : null
+  }
+}
+
+// Order counts and revenue per status for the dashboard
+export async function orderSummary(database) {
+  const groups = await database.collection('orders').aggregate([
+    { $group: { _id: '$status', count: { $sum: 1 }, revenue: { $sum: '$total' } } }
+  ]).toArray()
+
+  return {
+    totalOrders: groups.reduce((sum, group) => sum + group.count, 0),
+    totalRevenue: groups.reduce((sum, group) => sum + (group.revenue || 0), 0),
+    byStatus: Object.fromEntries(groups.map(group => [group._id, { count: group.count, revenue: group.revenue }]))
+  }
+}
+
+// PUT /admin/orders/:id with { status?, note?, ...EDITABLE_FIELDS }
+export async function updateOrder(database, orderId, changes) {
+  const { status, note, ...fields } = changes
+  const rejected = Object.keys(fields).filter(field => !EDITABLE_FIELDS.includes(field))
+  if (rejected.length > 0) {
+    throw new OrderError(`Fields cannot be updated: ${rejected.join(', ')}`)
+  }
+
+  const order = await database.collection('orders').findOne({ id: orderId })
+  if (!order) {
+    throw new OrderError('Order not found', 404)
+  }
+
+  const now = new Date()
+  const filter = { id: orderId }
+  const update = { $set: { ...fields, updatedAt: now } }
+
+  if (status !== undefined && status !== order.status) {
+    if (!(status in ORDER_TRANSITIONS)) {
+      throw new OrderError(`Unknown status: ${status}`)
+    }
+    if (!canTransition(order.status, status)) {
+      throw new OrderError(`Cannot change order from ${order.status} to ${status}`, 409)
+    }
+    filter.status = order.status
+    update.$set.status = status
+    update.$set.statusChangedAt = now
+    update.$set[`statusTimestamps.${status}`] = now
+    update.$push = { statusHistory: { from: order.status, to: status, at: now, note: note || null } }
+  }
+
+  const updated = await database.collection('orders').findOneAndUpdate(filter, update, {
+    returnDocument: 'after',
+    projection: { _id: 0 }
+  })
+  if (!updated) {
+    throw new OrderError('Order status changed concurrently; reload and retry', 409)
+  }
+  return updated
+}
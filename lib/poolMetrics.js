@@ -0,0 +1,51 @@
+// Connection pool counters collected from the driver's CMAP monitoring events
+//
+// Kept on globalThis like the client itself (lib/mongodb.js), so the API
+// reports the shared pool whichever bundle opened it.
+
+const pool = globalThis.__mongoPool || (globalThis.__mongoPool = {
+  counters: {
+    created: 0,
+    closed: 0,
+    checkOutStarted: 0,
+    checkedOut: 0,
+    checkedIn: 0,
+    checkOutFailed: 0,
+    cleared: 0
+  },
+  maxPoolSize: null
+})
+const { counters } = pool
+
+export function monitorPool(client) {
+  pool.maxPoolSize = client.options.maxPoolSize
+  client.on('connectionCreated', () => counters.created++)
+  client.on('connectionClosed', () => counters.closed++)
+  client.on('connectionCheckOutStarted', () => counters.checkOutStarted++)
+  client.on('connectionCheckedOut', () => counters.checkedOut++)
+  client.on('connectionCheckedIn', () => counters.checkedIn++)
+  client.on('connectionCheckOutFailed', () => counters.checkOutFailed++)
+  client.on('connectionPoolCleared', () => counters.cleared++)
+}
+
+export function poolStats() {
+  return {
+    ...counters,
+    maxPoolSize: pool.maxPoolSize,
+    open: counters.created - counters.closed,
+    inUse: counters.checkedOut - counters.checkedIn,
+    waiting: counters.checkOutStarted - counters.checkedOut - counters.checkOutFailed
+  }
+}
+
+export function processStats() {
+  const memory = process.memoryUsage()
+  return {
+    pid: process.pid,
+    uptimeSeconds: process.uptime(),
+    rss: memory.rss,
+    heapUsed: memory.heapUsed,
+    heapTotal: memory.heapTotal,
+    external: memory.external
+  }
+}
@@ -0,0 +1,173 @@
+import { randomUUID, timingSafeEqual } from 'crypto'
+import { promises as fs } from 'fs'
+import { Session } from 'inspector'
+import path from 'path'
+
+// On-demand sampling profiles of this server process
+//
+// A capture runs a CPU profile, plus a sampling heap profile unless heap=false,
+// on the process's own inspector session. It stops by itself after `seconds`
+// or when stopped early. The results are written to PROFILE_DIR as
+// .cpuprofile / .heapprofile files, which Chrome DevTools and speedscope open
+// directly. Only one capture runs at a time.
+//
+// Disabled unless PROFILER_TOKEN is set; callers send `Authorization: Bearer <token>`.
+
+const PROFILE_DIR = process.env.PROFILE_DIR || path.join(process.cwd(), '.data', 'profiles')
+const MAX_SECONDS = 300
+const DEFAULT_SAMPLING_INTERVAL_US = 1000
+const HEAP_SAMPLING_INTERVAL_BYTES = 32768
+const KEPT_CAPTURES = 20
+const ID_PATTERN = /^[0-9a-f-]{36}$/
+const FILE_EXTENSIONS = { cpu: 'cpuprofile', heap: 'heapprofile' }
+
+let current = null
+const captures = []
+
+export class ProfilerError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+export function authorizeProfiler(request) {
+  const token = process.env.PROFILER_TOKEN
+  if (!token) {
+    throw new ProfilerError('Profiler is disabled; set PROFILER_TOKEN to enable it', 404)
+  }
+  const given = Buffer.from((request.headers.get('authorization') || '').replace(/^Bearer\s+/i, ''))
+  const expected = Buffer.from(token)
+  if (given.length !== expected.length || !timingSafeEqual(given, expected)) {
+    throw new ProfilerError('Invalid profiler token', 401)
+  }
+}
+
+function post(session, method, params = {}) {
+  return new Promise((resolve, reject) => {
+    session.post(method, params, (error, result) => (error ? reject(error) : resolve(result)))
+  })
+}
+
+function profileFile(id, kind) {
+  return path.join(PROFILE_DIR, `${id}.${FILE_EXTENSIONS[kind]}`)
+}
+
+// Returns the capture's summary; it keeps running in the background
+export async function startProfile({ seconds = 30, heap = true, samplingIntervalUs = DEFAULT_SAMPLING_INTERVAL_US } = {}) {
+  if (current) {
+    throw new ProfilerError(`Capture ${current.id} is already running`, 409)
+  }
+  if (!(seconds > 0 && seconds <= MAX_SECONDS)) {
+    throw new ProfilerError(`seconds must be between 1 and ${MAX_SECONDS}`)
+  }
+
+  const session = new Session()
+  session.connect()
+  const capture = {
+    id: randomUUID(),
+    startedAt: new Date(),
+    seconds,
+    heap,
+    samplingIntervalUs,
+    session,
+    timer: null,
+    stopping: null
+  }
+  current = capture
+
+  try {
+    await post(session, 'Profiler.enable')
+    await post(session, 'Profiler.setSamplingInterval', { interval: samplingIntervalUs })
+    await post(session, 'Profiler.start')
+    if (heap) {
+      await post(session, 'HeapProfiler.enable')
+      await post(session, 'HeapProfiler.startSampling', { samplingInterval: HEAP_SAMPLING_INTERVAL_BYTES })
+    }
+  } catch (error) {
+    current = null
+    session.disconnect()
+    throw error
+  }
+
+  capture.timer = setTimeout(() => {
+    stopProfile().catch(error => console.error('Profile capture error:', error))
+  }, seconds * 1000)
+  return summary(capture)
+}
+
+// Stops the running capture (early, or when its time is up) and writes its files
+export async function stopProfile() {
+  if (!current) {
+    throw new ProfilerError('No capture is running', 409)
+  }
+  const capture = current
+  if (!capture.stopping) {
+    capture.stopping = finishCapture(capture)
+  }
+  return capture.stopping
+}
+
+async function finishCapture(capture) {
+  clearTimeout(capture.timer)
+  try {
+    const { profile } = await post(capture.session, 'Profiler.stop')
+    const heapProfile = capture.heap
+      ? (await post(capture.session, 'HeapProfiler.stopSampling')).profile
+      : null
+
+    await fs.mkdir(PROFILE_DIR, { recursive: true })
+    await fs.writeFile(profileFile(capture.id, 'cpu'), JSON.stringify(profile))
+    if (heapProfile) {
+      await fs.writeFile(profileFile(capture.id, 'heap'), JSON.stringify(heapProfile))
+    }
+
+    capture.stoppedAt = new Date()
+    capture.cpuSamples = profile.samples?.length || 0
+    captures.unshift(capture)
+    captures.splice(KEPT_CAPTURES)
+    return summary(capture)
+  } finally {
+    capture.session.disconnect()
+    current = null
+  }
+}
+
+function summary(capture) {
+  return {
+    id: capture.id,
+    startedAt: capture.startedAt,
+    stoppedAt: capture.stoppedAt || null,
+    seconds: capture.seconds,
+    samplingIntervalUs: capture.samplingIntervalUs,
+    cpuSamples: capture.cpuSamples ?? null,
+    files: capture.stoppedAt
+      ? Object.keys(FILE_EXTENSIONS).filter(kind => kind === 'cpu' || capture.heap)
+      : []
+  }
+}
+
+export function profilerStatus() {
+  return {
+    running: current ? summary(current) : null,
+    captures: captures.map(summary)
+  }
+}
+
+// File contents of a finished capture; kind is 'cpu' or 'heap'
+export async function readProfile(id, kind) {
+  if (!ID_PATTERN.test(id) || !FILE_EXTENSIONS[kind]) {
+    throw new ProfilerError('Profile not found', 404)
+  }
+  try {
+    return {
+      body: await fs.readFile(profileFile(id, kind)),
+      filename: `${id}.${FILE_EXTENSIONS[kind]}`
+    }
+  } catch (error) {
+    if (error.code === 'ENOENT') {
+      throw new ProfilerError('Profile not found', 404)
+    }
+    throw error
+  }
+}
@@ -0,0 +1,230 @@
+// Arabic-aware product search helpers
+//
+// Products carry two indexed arrays built at write time:
+//   searchKeywords - stemmed tokens from names, category, brand and description
+//   searchPrefixes - edge n-grams of name tokens, used for prefix/autocomplete matching
+// Queries go through the same normalization so both sides agree on the token form.
+
+const ARABIC_DIACRITICS = /[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]/g
+const ARABIC_INDIC_DIGITS = /[\u0660-\u0669]/g
+const TOKEN_SPLIT = /[^\p{L}\p{N}]+/u
+
+const ARABIC_ARTICLES = ['وال', 'فال', 'بال', 'كال', 'لل', 'ال']
+const ARABIC_SUFFIXES = ['ها', 'ان', 'ات', 'ون', 'ين', 'يه', 'ه', 'ي']
+const ENGLISH_STOPWORDS = new Set(['a', 'an', 'and', 'the', 'of', 'for', 'with', 'by', 'in', 'on', 'to'])
+const ARABIC_STOPWORDS = new Set(['من', 'في', 'على', 'الى', 'عن', 'مع', 'و'])
+
+const MIN_PREFIX_LENGTH = 2
+const MAX_PREFIX_LENGTH = 15
+
+export const SEARCH_FIELDS_PROJECTION = { searchKeywords: 0, searchPrefixes: 0 }
+
+// Fold the spelling variants that users type interchangeably into one form
+export function normalizeText(text) {
+  return String(text || '')
+    .normalize('NFKC')
+    .toLowerCase()
+    .replace(ARABIC_DIACRITICS, '')
+    .replace(/[أإآٱ]/g, 'ا')
+    .replace(/ى/g, 'ي')
+    .replace(/ة/g, 'ه')
+    .replace(/ؤ/g, 'و')
+    .replace(/ئ/g, 'ي')
+    .replace(ARABIC_INDIC_DIGITS, d => String(d.charCodeAt(0) - 0x0660))
+}
+
+function isArabic(token) {
+  return /[\u0600-\u06FF]/.test(token)
+}
+
+function stripArabicArticle(token) {
+  for (const article of ARABIC_ARTICLES) {
+    if (token.startsWith(article) && token.length - article.length >= 2) {
+      return token.slice(article.length)
+    }
+  }
+  return token
+}
+
+// Light stemming in the spirit of Larkey's light10: strip a leading waw,
+// the definite article and common plural/possessive suffixes
+function stemArabic(token) {
+  let stem = token
+  if (stem.startsWith('و') && stem.length > 3) {
+    stem = stem.slice(1)
+  }
+  stem = stripArabicArticle(stem)
+  for (const suffix of ARABIC_SUFFIXES) {
+    if (stem.endsWith(suffix) && stem.length - suffix.length >= 2) {
+      stem = stem.slice(0, -suffix.length)
+    }
+  }
+  return stem
+}
+
+function stemEnglish(token) {
+  if (token.length <= 3 || /\d/.test(token)) return token
+  if (token.endsWith('ies') && token.length > 4) return token.slice(0, -3) + 'y'
+  if (token.endsWith('sses')) return token.slice(0, -2)
+  if (token.endsWith('ing') && token.length > 5) return token.slice(0, -3)
+  if (token.endsWith('ed') && token.length > 4) return token.slice(0, -2)
+  if (token.endsWith('ly') && token.length > 4) return token.slice(0, -2)
+  if (token.endsWith('es') && /(sh|ch|x|z)es$/.test(token)) return token.slice(0, -2)
+  if (token.endsWith('s') && !token.endsWith('ss') && !token.endsWith('us')) return token.slice(0, -1)
+  return token
+}
+
+export function tokenize(text) {
+  return normalizeText(text)
+    .split(TOKEN_SPLIT)
+    .filter(token => token && !ENGLISH_STOPWORDS.has(token) && !ARABIC_STOPWORDS.has(token))
+}
+
+export function stem(token) {
+  return isArabic(token) ? stemArabic(token) : stemEnglish(token)
+}
+
+// Surface form used for prefix matching: normalized, article stripped, unstemmed
+function prefixForm(token) {
+  return isArabic(token) ? stripArabicArticle(token) : token
+}
+
+// Words such as "إلكترونيات" begin with a natural alef-lam that the stemmer
+// cannot tell apart from the article, so the index also stores the form with
+// one more leading "ال" removed; either spelling in a query then matches.
+function indexVariants(token, transform) {
+  const variants = new Set([transform(token)])
+  if (isArabic(token)) {
+    const stripped = stripArabicArticle(token)
+    if (stripped !== token) variants.add(transform(stripped))
+  }
+  return variants
+}
+
+function edgeNgrams(token) {
+  const grams = []
+  const max = Math.min(token.length, MAX_PREFIX_LENGTH)
+  for (let length = MIN_PREFIX_LENGTH; length <= max; length++) {
+    grams.push(token.slice(0, length))
+  }
+  return grams
+}
+
+function nameText(product) {
+  return [product.name, product.nameEn, product.specifications?.brand].filter(Boolean).join(' ')
+}
+
+// Build the indexed search fields for a product document
+export function buildSearchFields(product) {
+  const nameTokens = tokenize(nameText(product))
+  const otherTokens = tokenize([
+    product.category,
+    product.categoryAr,
+    product.description,
+    product.descriptionEn
+  ].filter(Boolean).join(' '))
+
+  const keywords = new Set()
+  for (const token of [...nameTokens, ...otherTokens]) {
+    for (const variant of indexVariants(token, stem)) {
+      keywords.add(variant)
+    }
+  }
+
+  const prefixes = new Set()
+  for (const token of nameTokens) {
+    for (const variant of indexVariants(token, prefixForm)) {
+      for (const gram of edgeNgrams(variant)) {
+        prefixes.add(gram)
+      }
+    }
+  }
+
+  return {
+    searchKeywords: [...keywords],
+    searchPrefixes: [...prefixes]
+  }
+}
+
+// Parse a raw query into the stemmed terms and the trailing prefix being typed
+export function parseQuery(query) {
+  const tokens = tokenize(query)
+  return {
+    terms: tokens.map(stem),
+    prefixes: tokens.map(token => prefixForm(token).slice(0, MAX_PREFIX_LENGTH))
+  }
+}
+
+// Every term must match; the last one may also match as a prefix so results
+// appear while the user is still typing
+export function buildSearchFilter({ terms, prefixes }, { prefixOnly = false } = {}) {
+  if (terms.length === 0) return null
+
+  const clauses = terms.map((term, index) => {
+    const isLast = index === terms.length - 1
+    if (prefixOnly && isLast) return { searchPrefixes: prefixes[index] }
+    if (isLast) return { $or: [{ searchKeywords: term }, { searchPrefixes: prefixes[index] }] }
+    return { searchKeywords: term }
+  })
+
+  return clauses.length === 1 ? clauses[0] : { $and: clauses }
+}
+
+// Database-side estimate of scoreProduct, sorted on before the candidate cap
+// so the cap keeps the best matches rather than whichever the index returned
+// first. Names are the only source of prefixes, so a term found in both arrays
+// is taken as a name hit; the exact score is computed on the candidates.
+export function searchRankStage({ terms, prefixes }) {
+  const termScores = terms.map((term, index) => {
+    const inKeywords = { $in: [term, { $ifNull: ['$searchKeywords', []] }] }
+    const inPrefixes = { $in: [prefixes[index], { $ifNull: ['$searchPrefixes', []] }] }
+    return {
+      $switch: {
+        branches: [
+          { case: { $and: [inKeywords, inPrefixes] }, then: 3 },
+          { case: inPrefixes, then: 2 },
+          { case: inKeywords, then: 1 }
+        ],
+        default: 0
+      }
+    }
+  })
+
+  return {
+    $addFields: {
+      searchRank: {
+        $add: [
+          ...termScores,
+          { $cond: ['$featured', 0.5, 0] },
+          { $divide: [{ $ifNull: ['$rating', 0] }, 10] },
+          { $divide: [{ $log10: { $add: [{ $ifNull: ['$reviews', 0] }, 1] } }, 10] }
+        ]
+      }
+    }
+  }
+}
+
+// Relevance: exact name hits outrank name prefixes, which outrank description
+// hits; popularity only breaks ties
+export function scoreProduct(product, { terms, prefixes }) {
+  const nameTokens = tokenize(nameText(product))
+  const nameStems = new Set(nameTokens.flatMap(token => [...indexVariants(token, stem)]))
+  const namePrefixForms = nameTokens.flatMap(token => [...indexVariants(token, prefixForm)])
+  const keywords = new Set(product.searchKeywords || [])
+
+  let score = 0
+  terms.forEach((term, index) => {
+    if (nameStems.has(term)) {
+      score += 3
+    } else if (namePrefixForms.some(token => token.startsWith(prefixes[index]))) {
+      score += 2
+    } else if (keywords.has(term)) {
+      score += 1
+    }
+  })
+
+  if (product.featured) score += 0.5
+  score += (product.rating || 0) / 10
+  score += Math.log10((product.reviews || 0) + 1) / 10
+  return score
+}
@@ -0,0 +1,45 @@
+// Single-flight request coalescing
+//
+// Concurrent calls with the same key share one execution: the first caller
+// (the leader) runs `work`, everyone arriving while it is in flight awaits the
+// same promise. Nothing is cached once the flight lands, so results are never
+// staler than an uncoalesced read that started at the same moment.
+
+const flights = new Map()
+const stats = new Map()
+
+function statsFor(group) {
+  let entry = stats.get(group)
+  if (!entry) {
+    entry = { executions: 0, coalesced: 0 }
+    stats.set(group, entry)
+  }
+  return entry
+}
+
+// Resolves to `{ value, leader }`; `group` buckets the counters (e.g. by route)
+export async function singleFlight(key, work, group = key) {
+  const counters = statsFor(group)
+  const inFlight = flights.get(key)
+
+  if (inFlight) {
+    counters.coalesced++
+    return { value: await inFlight, leader: false }
+  }
+
+  counters.executions++
+  // `work` starts on a microtask, so the flight is registered before it can settle
+  const flight = Promise.resolve()
+    .then(work)
+    .finally(() => flights.delete(key))
+  flights.set(key, flight)
+
+  return { value: await flight, leader: true }
+}
+
+export function singleFlightStats() {
+  return {
+    inFlight: flights.size,
+    groups: Object.fromEntries(stats)
+  }
+}
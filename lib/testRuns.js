@@ -0,0 +1,136 @@
+import { timingSafeEqual } from 'crypto'
+
+// Test data namespacing
+//
+// Requests that send `X-Test-Run: <namespace>` together with
+// `X-Test-Run-Token: <TEST_RUN_TOKEN>` have every document they create tagged
+// with { testRun, expiresAt }. Ledger entries, stock reservations and
+// notifications inherit the tag from the user or order they belong to. A TTL
+// index removes tagged documents once they expire, and a whole namespace can
+// be deleted at once through /admin/test-runs. Both indexes are partial on
+// `testRun`, so untagged documents are neither expired nor indexed.
+//
+// Disabled unless TEST_RUN_TOKEN is set. TEST_RUN_TTL_HOURS sets the default
+// lifetime (24h); a run can ask for another with `X-Test-Run-TTL: <seconds>`.
+
+export const TEST_RUN_HEADER = 'X-Test-Run'
+export const TEST_RUN_TOKEN_HEADER = 'X-Test-Run-Token'
+export const TEST_RUN_TTL_HEADER = 'X-Test-Run-TTL'
+
+// Collections that can hold tagged documents. Coupons are left out: their
+// `expiresAt` is the coupon's own expiry date.
+export const TEST_RUN_COLLECTIONS = [
+  'orders',
+  'stock_reservations',
+  'notifications',
+  'wallet_transactions',
+  'wallet_ledger',
+  'users',
+  'products'
+]
+
+const NAMESPACE_PATTERN = /^[A-Za-z0-9_.:-]{1,64}$/
+const MIN_TTL_SECONDS = 60
+const MAX_TTL_SECONDS = 30 * 24 * 60 * 60
+const DEFAULT_TTL_SECONDS = (parseFloat(process.env.TEST_RUN_TTL_HOURS) || 24) * 60 * 60
+
+export class TestRunError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+const TAGGED = { testRun: { $exists: true } }
+
+export async function ensureTestRunIndexes(database) {
+  await Promise.all(TEST_RUN_COLLECTIONS.flatMap(name => [
+    database.collection(name).createIndex({ testRun: 1 }, { partialFilterExpression: TAGGED }),
+    database.collection(name).createIndex(
+      { expiresAt: 1 },
+      { expireAfterSeconds: 0, partialFilterExpression: TAGGED }
+    )
+  ]))
+}
+
+function tokenMatches(given) {
+  const token = process.env.TEST_RUN_TOKEN
+  if (!token) {
+    throw new TestRunError('Test run tagging is disabled; set TEST_RUN_TOKEN to enable it', 403)
+  }
+  const givenBuffer = Buffer.from(given || '')
+  const expected = Buffer.from(token)
+  if (givenBuffer.length !== expected.length || !timingSafeEqual(givenBuffer, expected)) {
+    throw new TestRunError('Invalid test run token', 403)
+  }
+}
+
+// For test-only overrides, which are silently ignored without the token
+export function hasTestRunToken(request) {
+  try {
+    tokenMatches(request.headers.get(TEST_RUN_TOKEN_HEADER))
+    return true
+  } catch {
+    return false
+  }
+}
+
+// Fields to spread into documents created by this request: {} for normal traffic
+export function testRunTag(request) {
+  const namespace = request.headers.get(TEST_RUN_HEADER)
+  if (!namespace) {
+    return {}
+  }
+  tokenMatches(request.headers.get(TEST_RUN_TOKEN_HEADER))
+  if (!NAMESPACE_PATTERN.test(namespace)) {
+    throw new TestRunError('Test run namespace must be 1-64 letters, digits, or _ . : -')
+  }
+
+  const requested = Number(request.headers.get(TEST_RUN_TTL_HEADER))
+  const ttlSeconds = requested
+    ? Math.min(Math.max(requested, MIN_TTL_SECONDS), MAX_TTL_SECONDS)
+    : DEFAULT_TTL_SECONDS
+  return { testRun: namespace, expiresAt: new Date(Date.now() + ttlSeconds * 1000) }
+}
+
+// The tag of an already stored document, for documents derived from it
+export function inheritTestRun(document) {
+  return document?.testRun ? { testRun: document.testRun, expiresAt: document.expiresAt } : {}
+}
+
+// The /admin/test-runs endpoints use the same token, sent as X-Test-Run-Token
+export function authorizeTestRuns(request) {
+  tokenMatches(request.headers.get(TEST_RUN_TOKEN_HEADER))
+}
+
+// Document counts per namespace and collection, with the latest expiry of each namespace
+export async function listTestRuns(database) {
+  const runs = {}
+  for (const name of TEST_RUN_COLLECTIONS) {
+    const groups = await database.collection(name).aggregate([
+      { $match: TAGGED },
+      { $group: { _id: '$testRun', count: { $sum: 1 }, expiresAt: { $max: '$expiresAt' } } }
+    ]).toArray()
+    for (const group of groups) {
+      const run = runs[group._id] || (runs[group._id] = { namespace: group._id, expiresAt: null, documents: {} })
+      run.documents[name] = group.count
+      if (!run.expiresAt || group.expiresAt > run.expiresAt) {
+        run.expiresAt = group.expiresAt
+      }
+    }
+  }
+  return Object.values(runs).sort((a, b) => a.namespace.localeCompare(b.namespace))
+}
+
+// Delete every document of a namespace, children before the users and products they refer to
+export async function teardownTestRun(database, namespace) {
+  if (!NAMESPACE_PATTERN.test(namespace)) {
+    throw new TestRunError('Invalid test run namespace')
+  }
+  const deleted = {}
+  for (const name of TEST_RUN_COLLECTIONS) {
+    const result = await database.collection(name).deleteMany({ testRun: namespace })
+    deleted[name] = result.deletedCount
+  }
+  return { namespace, deleted, total: Object.values(deleted).reduce((sum, count) => sum + count, 0) }
+}
@@ -0,0 +1,152 @@
+import { z } from 'zod'
+
+// Request body validation for endpoints that create documents
+//
+// The body is read as a stream and abandoned once it passes the endpoint's
+// byte limit, before any JSON parsing, so an oversized payload costs at most
+// `limit` bytes of memory. The JSON is then checked against a zod schema built
+// once at module load. Unknown fields are dropped and strings, arrays and
+// numbers are bounded, so handlers only ever store the validated result.
+
+// Bytes; a cart of 100 full product copies stays under the orders limit
+export const BODY_LIMITS = {
+  users: 8 * 1024,
+  products: 32 * 1024,
+  orders: 256 * 1024
+}
+
+const MAX_ISSUES = 10
+
+export class ValidationError extends Error {
+  constructor(message, status = 400, issues = undefined) {
+    super(message)
+    this.status = status
+    this.issues = issues
+  }
+}
+
+const text = (max) => z.string().trim().max(max)
+const requiredText = (max) => text(max).min(1)
+const url = text(2048)
+const amount = z.number().finite().nonnegative().max(1e12)
+
+const address = z.object({
+  street: text(200).optional(),
+  city: text(100).optional(),
+  area: text(100).optional(),
+  country: text(100).optional(),
+  details: text(500).optional()
+})
+
+export const userSchema = z.object({
+  uid: requiredText(128),
+  email: z.string().trim().email().max(254),
+  name: text(100).optional(),
+  nameEn: text(100).optional(),
+  phone: text(32).optional(),
+  photoURL: url.optional(),
+  address: address.optional(),
+  // walletBalance is set by the server and stripped like any other unknown key;
+  // admins are promoted in the database, never through the public signup call
+  role: z.literal('user').default('user')
+})
+
+export const productSchema = z.object({
+  name: requiredText(200),
+  nameEn: text(200).optional(),
+  description: text(5000).optional(),
+  descriptionEn: text(5000).optional(),
+  price: amount,
+  originalPrice: amount.optional(),
+  discount: z.number().min(0).max(100).optional(),
+  category: requiredText(64),
+  categoryAr: text(64).optional(),
+  image: url.optional(),
+  images: z.array(url).max(20).optional(),
+  stock: z.number().int().nonnegative().max(1e7).default(0),
+  featured: z.boolean().optional(),
+  active: z.boolean().optional(),
+  rating: z.number().min(0).max(5).optional(),
+  reviews: z.number().int().nonnegative().optional(),
+  tags: z.array(text(50)).max(30).optional(),
+  specifications: z.record(text(200))
+    .refine(value => Object.keys(value).length <= 50, 'At most 50 specifications')
+    .optional()
+})
+
+// Cart lines arrive as full product copies; only what the order needs is kept
+const orderItem = z.object({
+  productId: text(128).optional(),
+  id: text(128).optional(),
+  name: requiredText(200),
+  nameEn: text(200).optional(),
+  price: amount,
+  originalPrice: amount.optional(),
+  quantity: z.number().int().min(1).max(1000),
+  image: url.optional(),
+  category: text(64).optional()
+}).refine(item => item.productId || item.id, 'Item needs productId or id')
+
+export const orderSchema = z.object({
+  userId: requiredText(128),
+  items: z.array(orderItem).min(1).max(100),
+  total: amount,
+  originalTotal: amount.optional(),
+  discount: amount.optional(),
+  couponCode: text(64).nullable().optional(),
+  paymentMethod: z.enum(['whatsapp', 'wallet']).default('whatsapp'),
+  customerInfo: z.object({
+    name: text(100).optional(),
+    phone: text(32).optional(),
+    email: text(254).optional(),
+    address: address.optional(),
+    notes: text(1000).optional()
+  }).optional()
+})
+
+// Read at most `limit` bytes of the body; longer bodies are rejected mid-stream
+export async function readBody(request, limit) {
+  const declared = Number(request.headers.get('content-length'))
+  if (declared > limit) {
+    throw new ValidationError(`Request body larger than ${limit} bytes`, 413)
+  }
+  if (!request.body) {
+    return ''
+  }
+
+  const reader = request.body.getReader()
+  const chunks = []
+  let received = 0
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    received += value.byteLength
+    if (received > limit) {
+      await reader.cancel()
+      throw new ValidationError(`Request body larger than ${limit} bytes`, 413)
+    }
+    chunks.push(value)
+  }
+  return Buffer.concat(chunks, received).toString('utf8')
+}
+
+// Returns { data, raw }: the validated value and the body text (for idempotency hashing)
+export async function parseBody(request, schema, limit) {
+  const raw = await readBody(request, limit)
+  let json
+  try {
+    json = JSON.parse(raw)
+  } catch {
+    throw new ValidationError('Request body is not valid JSON')
+  }
+
+  const result = schema.safeParse(json)
+  if (!result.success) {
+    const issues = result.error.issues.slice(0, MAX_ISSUES).map(issue => ({
+      path: issue.path.join('.'),
+      message: issue.message
+    }))
+    throw new ValidationError('Invalid request body', 400, issues)
+  }
+  return { data: result.data, raw }
+}
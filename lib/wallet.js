@@ -0,0 +1,185 @@
+import { v4 as uuidv4 } from 'uuid'
+import { inheritTestRun } from './testRuns'
+
+// Append-only wallet ledger
+//
+// Every balance change is a `wallet_ledger` entry. The user's `walletBalance`
+// and `walletSeq` are a snapshot of the ledger and are only ever changed in the
+// same transaction as the entry they reflect, so balance reads are a single
+// indexed lookup and the snapshot can always be re-derived from the entries.
+//
+// Transactions need MONGO_URL to point at a replica set (Atlas, or
+// local_replica_set.py for development); a standalone mongod gets a 503.
+
+export const LEDGER_COLLECTION = 'wallet_ledger'
+
+// Welcome balance every new user's wallet opens with (Syrian pounds)
+export const SIGNUP_WALLET_BALANCE = 2000
+
+export const LEDGER_TYPES = {
+  OPENING: 'opening',
+  RECHARGE: 'recharge',
+  ORDER_DEBIT: 'order_debit',
+  REFUND: 'refund'
+}
+
+export class WalletError extends Error {
+  constructor(message, status = 400) {
+    super(message)
+    this.status = status
+  }
+}
+
+// Transactions need a replica set member or mongos; a standalone mongod fails
+// with "Transaction numbers are only allowed on a replica set member or mongos"
+const TRANSACTIONS_UNSUPPORTED = 20
+
+export class TransactionError extends Error {
+  constructor(message, status = 503) {
+    super(message)
+    this.status = status
+  }
+}
+
+export async function ensureLedgerIndexes(database) {
+  await Promise.all([
+    database.collection(LEDGER_COLLECTION).createIndex({ userId: 1, seq: -1 }, { unique: true }),
+    // One debit/refund per order and one credit per recharge request
+    database.collection(LEDGER_COLLECTION).createIndex(
+      { type: 1, referenceId: 1 },
+      { unique: true, partialFilterExpression: { referenceId: { $type: 'string' } } }
+    )
+  ])
+}
+
+// Run `work(session)` in a transaction with the write concern money movements need
+export async function withTransaction(client, work) {
+  const session = client.startSession()
+  try {
+    let result
+    await session.withTransaction(async () => {
+      result = await work(session)
+    }, {
+      readConcern: { level: 'snapshot' },
+      writeConcern: { w: 'majority' }
+    })
+    return result
+  } catch (error) {
+    if (error.code === TRANSACTIONS_UNSUPPORTED) {
+      throw new TransactionError(
+        'MongoDB transactions need a replica set; for a local one run `python local_replica_set.py start`'
+      )
+    }
+    throw error
+  } finally {
+    await session.endSession()
+  }
+}
+
+function openingEntry(user, createdAt, note = '') {
+  return {
+    id: uuidv4(),
+    userId: user.uid,
+    seq: 1,
+    type: LEDGER_TYPES.OPENING,
+    amount: user.walletBalance || 0,
+    balanceAfter: user.walletBalance || 0,
+    referenceId: null,
+    note,
+    createdAt,
+    ...inheritTestRun(user)
+  }
+}
+
+// Users created before the ledger have a balance but no walletSeq. Their first
+// movement adopts them with an opening entry for that balance, as
+// wallet_reconciliation.py --adopt-legacy does, so the ledger still sums up.
+async function adoptLegacyWallet(database, userId, now, session) {
+  const user = await database.collection('users').findOneAndUpdate(
+    { uid: userId, walletSeq: { $exists: false } },
+    { $set: { walletSeq: 1 } },
+    { session, returnDocument: 'after', projection: { uid: 1, walletBalance: 1, testRun: 1, expiresAt: 1 } }
+  )
+  if (user) {
+    await database.collection(LEDGER_COLLECTION).insertOne(
+      openingEntry(user, now, 'adopted on first wallet movement'),
+      { session }
+    )
+  }
+}
+
+// Apply `amount` to the user's snapshot and append the matching ledger entry.
+// Must be called inside withTransaction.
+export async function postLedgerEntry(database, { userId, type, amount, referenceId = null, note = '' }, session) {
+  const now = new Date()
+  await adoptLegacyWallet(database, userId, now, session)
+  const user = await database.collection('users').findOneAndUpdate(
+    { uid: userId },
+    {
+      $inc: { walletBalance: amount, walletSeq: 1 },
+      $set: { updatedAt: now }
+    },
+    { session, returnDocument: 'after', projection: { walletBalance: 1, walletSeq: 1, testRun: 1, expiresAt: 1 } }
+  )
+
+  if (!user) {
+    throw new WalletError('User not found', 404)
+  }
+
+  const entry = {
+    id: uuidv4(),
+    userId,
+    seq: user.walletSeq,
+    type,
+    amount,
+    balanceAfter: user.walletBalance,
+    referenceId,
+    note,
+    createdAt: now,
+    // Entries of a test user expire and are torn down with it
+    ...inheritTestRun(user)
+  }
+
+  await database.collection(LEDGER_COLLECTION).insertOne(entry, { session })
+  const { _id, ...entryResponse } = entry
+  return entryResponse
+}
+
+// Opening entry for a freshly created user, so the snapshot starts out backed by the ledger
+export async function openWallet(database, user, session) {
+  await database.collection(LEDGER_COLLECTION).insertOne(openingEntry(user, user.createdAt), { session })
+}
+
+export async function getBalance(database, userId) {
+  const user = await database.collection('users').findOne(
+    { uid: userId },
+    { projection: { _id: 0, walletBalance: 1, walletSeq: 1, updatedAt: 1 } }
+  )
+  if (!user) return null
+  return {
+    userId,
+    balance: user.walletBalance || 0,
+    seq: user.walletSeq || 0,
+    updatedAt: user.updatedAt
+  }
+}
+
+// Newest-first history, paginated by ledger sequence number (`before` is exclusive)
+export async function getHistory(database, userId, { limit = 20, before = null } = {}) {
+  const filter = { userId }
+  if (before !== null) {
+    filter.seq = { $lt: before }
+  }
+
+  const entries = await database.collection(LEDGER_COLLECTION)
+    .find(filter, { projection: { _id: 0 } })
+    .sort({ seq: -1 })
+    .limit(limit)
+    .toArray()
+
+  const last = entries[entries.length - 1]
+  return {
+    entries,
+    nextBefore: entries.length === limit && last.seq > 1 ? last.seq : null
+  }
+}
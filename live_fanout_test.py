@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Live Updates Fan-out Test
+Holds thousands of concurrent SSE subscribers on /api/live, writes stock changes straight to
+MongoDB and measures how long each change takes to reach every subscriber
+
+Raise the open file limit first (`ulimit -n 65536`) for both this script and the server.
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from load_tools import BASE_URL, make_client, simulated_client_headers, summarize_latencies
+
+# Stock values written by the test; high enough not to collide with real stock
+SENTINEL_BASE = 900000
+
+
+async def read_body(reader, chunked):
+    """Next piece of the response body, undoing chunked transfer encoding"""
+    if not chunked:
+        return await reader.read(65536)
+    size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+    if size == 0:
+        return b''
+    data = await reader.readexactly(size)
+    await reader.readline()  # CRLF after the chunk
+    return data
+
+
+class Subscriber:
+    """One SSE connection; records when each sentinel stock value arrives"""
+
+    def __init__(self, index, url):
+        self.index = index
+        self.url = url
+        self.ready = asyncio.Event()
+        self.received = {}
+        self.error = None
+
+    def handle(self, frame, product_id):
+        fields = dict(line.split(b': ', 1) for line in frame.splitlines() if b': ' in line and not line.startswith(b':'))
+        event = fields.get(b'event')
+        if event == b'ready':
+            self.ready.set()
+        elif event == b'stock':
+            data = json.loads(fields[b'data'])
+            if data['productId'] == product_id and data['stock'] >= SENTINEL_BASE:
+                self.received.setdefault(data['stock'], time.monotonic())
+
+    async def run(self, product_id):
+        parts = urlsplit(self.url)
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        try:
+            reader, writer = await asyncio.open_connection(
+                parts.hostname, port, ssl=ssl.create_default_context() if secure else None, limit=1 << 20)
+            # Each subscriber poses as its own client so connects are not rate limited
+            headers = ''.join(f"{name}: {value}\r\n"
+                              for name, value in simulated_client_headers(f"fanout-{self.index}").items())
+            writer.write((
+                f"GET {parts.path} HTTP/1.1\r\n"
+                f"Host: {parts.netloc}\r\n"
+                f"Accept: text/event-stream\r\n"
+                f"{headers}"
+                f"Connection: keep-alive\r\n\r\n"
+            ).encode())
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if b' 200 ' not in status_line:
+                raise ConnectionError(status_line.decode(errors='replace').strip())
+            chunked = False
+            while (header := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                chunked |= header.lower().startswith(b'transfer-encoding:') and b'chunked' in header.lower()
+
+            buffer = b''
+            while True:
+                data = await read_body(reader, chunked)
+                if not data:
+                    raise ConnectionError('stream closed by server')
+                buffer += data
+                *frames, buffer = buffer.split(b'\n\n')
+                for frame in frames:
+                    self.handle(frame, product_id)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.IncompleteReadError:
+            self.error = 'stream closed by server'
+            self.ready.set()
+        except Exception as error:  # noqa: BLE001 - any failure just marks this subscriber
+            self.error = str(error) or type(error).__name__
+            self.ready.set()
+
+
+async def connect_all(subscribers, product_id, connect_rate):
+    tasks = []
+    for subscriber in subscribers:
+        tasks.append(asyncio.create_task(subscriber.run(product_id)))
+        await asyncio.sleep(1 / connect_rate)
+    await asyncio.gather(*(subscriber.ready.wait() for subscriber in subscribers))
+    return tasks
+
+
+def write_stock(collection, product_id, value):
+    collection.update_one({'id': product_id}, {'$set': {'stock': value, 'updatedAt': datetime.now(timezone.utc)}})
+
+
+async def main_async(args):
+    from pymongo import MongoClient
+    from generate_test_data import DB_NAME, MONGO_URL
+
+    api = make_client(timeout=30)
+    products = api.products()
+    if not products:
+        print("❌ No products in the catalog")
+        api.close()
+        return False
+    product = products[0]
+    product_id = product['id']
+
+    client = MongoClient(MONGO_URL)
+    collection = client[DB_NAME].products
+    original_stock = collection.find_one({'id': product_id}, {'stock': 1}).get('stock')
+
+    subscribers = [Subscriber(index, f"{BASE_URL}/live") for index in range(args.subscribers)]
+    print(f"🔌 Connecting {args.subscribers} subscribers at {args.connect_rate:.0f}/s...")
+    start = time.monotonic()
+    tasks = await connect_all(subscribers, product_id, args.connect_rate)
+    connected = [subscriber for subscriber in subscribers if subscriber.error is None]
+    print(f"   {len(connected)} connected in {time.monotonic() - start:.1f}s, "
+          f"{len(subscribers) - len(connected)} failed")
+    for subscriber in [s for s in subscribers if s.error][:5]:
+        print(f"   subscriber {subscriber.index}: {subscriber.error}")
+
+    written = {}
+    try:
+        print(f"✍️ Writing {args.events} stock changes to product {product_id} at {args.event_rate:.1f}/s...")
+        for n in range(args.events):
+            value = SENTINEL_BASE + n
+            written[value] = time.monotonic()
+            await asyncio.to_thread(write_stock, collection, product_id, value)
+            await asyncio.sleep(1 / args.event_rate)
+        await asyncio.sleep(args.drain)
+        # Read the server's counters while the subscribers are still connected
+        live = await asyncio.to_thread(
+            lambda: api.metrics().get('live', {}))
+    finally:
+        if original_stock is not None:
+            write_stock(collection, product_id, original_stock)
+        client.close()
+        api.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies = []
+    delivered = 0
+    for subscriber in connected:
+        for value, sent_at in written.items():
+            received_at = subscriber.received.get(value)
+            if received_at is not None:
+                delivered += 1
+                latencies.append((received_at - sent_at) * 1000)
+    expected = len(connected) * len(written)
+    summary = summarize_latencies(latencies)
+
+    print(f"\n📊 Delivery: {delivered}/{expected} events ({delivered / max(expected, 1):.1%})")
+    print(f"   latency p50 {summary['p50']:.1f}ms  p95 {summary['p95']:.1f}ms  "
+          f"p99 {summary['p99']:.1f}ms  max {summary['max']:.1f}ms")
+    print(f"   server feed mode: {live.get('mode')}, subscribers: {live.get('subscribers')}, "
+          f"dropped slow subscribers: {live.get('dropped')}")
+
+    if args.report:
+        with open(args.report, 'w') as report:
+            json.dump({
+                'subscribers': args.subscribers,
+                'connected': len(connected),
+                'events': len(written),
+                'delivered': delivered,
+                'expected': expected,
+                'latency_ms': summary,
+                'server': live,
+            }, report, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    checks = {
+        'all subscribers connected': len(connected) == len(subscribers),
+        'every event reached every subscriber': expected > 0 and delivered == expected,
+        f'p99 delivery latency under {args.max_p99_ms:.0f}ms': summary['p99'] <= args.max_p99_ms,
+    }
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure SSE fan-out of live stock updates')
+    parser.add_argument('--subscribers', type=int, default=2000)
+    parser.add_argument('--connect-rate', type=float, default=500.0, help='new subscribers per second')
+    parser.add_argument('--events', type=int, default=20)
+    parser.add_argument('--event-rate', type=float, default=2.0, help='stock writes per second')
+    parser.add_argument('--drain', type=float, default=5.0, help='seconds to wait for the last events')
+    parser.add_argument('--max-p99-ms', type=float, default=2000.0,
+                        help='polling mode adds up to LIVE_POLL_INTERVAL_MS')
+    parser.add_argument('--report', help='write a JSON summary to this file')
+    args = parser.parse_args()
+
+    print("📡 LIVE UPDATES FAN-OUT TEST")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    print("=" * 80)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
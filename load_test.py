@@ -0,0 +1,867 @@
+#!/usr/bin/env python3
+"""
+Store API Load Testing
+Load scenarios against the store API; each scenario asserts correctness as well as timing
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import random
+import re
+import statistics
+import threading
+import time
+import uuid
+
+from load_tools import (
+    BASE_URL,
+    TEST_RUN,
+    ProfileCapture,
+    make_client,
+    new_idempotency_key,
+    open_loop,
+    post_idempotent,
+    simulated_client_headers,
+    summarize_latencies,
+    teardown_test_run,
+    timed_request,
+)
+
+
+def print_latency_summary(name, latencies):
+    stats = summarize_latencies(latencies)
+    print(f"   {name:<16} n={stats['count']:<6} p50={stats['p50']:7.1f}ms  "
+          f"p95={stats['p95']:7.1f}ms  p99={stats['p99']:7.1f}ms  max={stats['max']:7.1f}ms")
+
+
+def create_load_user(client, balance):
+    """Create a throwaway wallet user for a scenario, topped up by `balance` on top of the welcome balance"""
+    uid = f"load_user_{uuid.uuid4().hex[:8]}"
+    client.create_user({
+        'uid': uid,
+        'email': f"{uid}@example.com",
+        'name': 'مستخدم اختبار الحمل',
+    })
+    if balance:
+        client.recharge_wallet({'userId': uid, 'amount': balance, 'method': 'qr_code', 'reference': f"SEED_{uid}"})
+    return uid
+
+
+def run_checkout(args):
+    """Concurrent wallet orders and recharges with retries, then verify no duplicate side effects
+
+    Every logical operation gets one Idempotency-Key. Requests use a short
+    timeout so some retries race the original attempt, and every successful
+    operation is deliberately sent once more to exercise the replay path.
+    """
+    client = make_client(args.concurrency)
+
+    uid = create_load_user(client, 1_000_000)
+    initial = client.wallet(uid)
+    print(f"👤 Load user: {uid}")
+
+    operations = []
+    for i in range(args.operations):
+        if i % 4 == 3:
+            operations.append(('/wallet/recharge', {
+                'userId': uid, 'amount': 100, 'method': 'qr_code', 'reference': f"LOAD{i}",
+            }))
+        else:
+            operations.append(('/orders', {
+                'userId': uid,
+                'items': [{'productId': 'load_product', 'name': 'منتج اختبار', 'price': 10, 'quantity': 1}],
+                'total': 10,
+                'paymentMethod': 'wallet',
+            }))
+
+    def perform(operation):
+        path, payload = operation
+        key = new_idempotency_key()
+        start = time.perf_counter()
+        response, attempts = post_idempotent(client, path, payload, key=key,
+                                             retries=args.retries, timeout=args.timeout)
+        latency = (time.perf_counter() - start) * 1000
+        replay, _ = post_idempotent(client, path, payload, key=key, retries=args.retries, timeout=10)
+        return path, payload, response, replay, attempts, latency
+
+    latencies = {'/orders': [], '/wallet/recharge': []}
+    failures = []
+    retried = 0
+    replay_mismatches = 0
+    expected_delta = 0
+    succeeded = 0
+
+    print(f"🚀 Sending {len(operations)} operations with concurrency {args.concurrency}...")
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for path, payload, response, replay, attempts, latency in executor.map(perform, operations):
+            latencies[path].append(latency)
+            retried += attempts > 1
+            if response.status_code != 200:
+                failures.append((path, response.status_code, response.text[:200]))
+                continue
+            succeeded += 1
+            expected_delta += payload['amount'] if path == '/wallet/recharge' else -payload['total']
+            if replay.status_code != 200 or replay.json().get('id') != response.json().get('id'):
+                replay_mismatches += 1
+    elapsed = time.perf_counter() - start
+
+    balance = client.wallet(uid)
+    expected_balance = initial['balance'] + expected_delta
+    # Exactly one ledger entry per successful operation
+    expected_seq = initial['seq'] + succeeded
+
+    print(f"\n📊 Checkout scenario finished in {elapsed:.1f}s ({len(operations) / elapsed:.1f} ops/s)")
+    for path, values in latencies.items():
+        print_latency_summary(path, values)
+    print(f"   🔁 Operations needing a retry: {retried}")
+
+    checks = {
+        'all operations succeeded': not failures,
+        'replays returned the original response': replay_mismatches == 0,
+        f"balance is {expected_balance}": balance.get('balance') == expected_balance,
+        f"ledger has {expected_seq} entries": balance.get('seq') == expected_seq,
+    }
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    for failure in failures[:10]:
+        print(f"      {failure}")
+    if not checks[f"balance is {expected_balance}"]:
+        print(f"      actual balance: {balance}")
+
+    return all(checks.values())
+
+
+def spread_clients(client, paths, timeout):
+    """Return a fire() that cycles through `paths`, each request from a different simulated client
+
+    Each request poses as its own client (simulated_client_headers) so the
+    per-client rate limit does not reject everything coming from this single host.
+    """
+    counter = itertools.count()
+
+    def fire():
+        n = next(counter)
+        headers = simulated_client_headers(f"load-0-{n}")
+        return timed_request(client, 'GET', paths[n % len(paths)], headers=headers, timeout=timeout)
+
+    return fire
+
+
+def run_overload(args):
+    """Double the offered load step by step and check that goodput stays flat
+
+    Goodput counts only 200 responses that met the latency SLO. With admission
+    control working, load beyond capacity is shed quickly as 429/503 and the
+    requests that are admitted keep their latency, so goodput plateaus instead
+    of collapsing.
+    """
+    client = make_client(args.max_workers)
+    fire = spread_clients(client, args.paths.split(','), args.timeout)
+
+    steps = []
+    rate = args.start_rate
+    for _ in range(args.steps):
+        print(f"\n🚦 Offering {rate:.0f} req/s for {args.duration}s...")
+        results, dropped = open_loop(rate, args.duration, fire, max_workers=args.max_workers)
+
+        good = [latency for status, latency, _ in results if status == 200 and latency <= args.slo_ms]
+        shed = [latency for status, latency, _ in results if status in (429, 503)]
+        errors = sum(1 for status, _, _ in results if status is None or status >= 500 and status != 503)
+        missing_retry_after = sum(1 for status, _, retry in results if status in (429, 503) and not retry)
+
+        step = {
+            'offered': rate,
+            'goodput': len(good) / args.duration,
+            'shed': len(shed),
+            'errors': errors,
+            'dropped': dropped,
+            'shed_p99': summarize_latencies(shed)['p99'],
+            'missing_retry_after': missing_retry_after,
+        }
+        steps.append(step)
+        print(f"   goodput={step['goodput']:.1f}/s  shed={step['shed']}  errors={errors}  "
+              f"client-dropped={dropped}  shed p99={step['shed_p99']:.1f}ms")
+        rate *= 2
+
+    peak = max(step['goodput'] for step in steps)
+    final = steps[-1]['goodput']
+    checks = {
+        f"goodput at highest load is >= {args.min_goodput_ratio:.0%} of peak ({final:.1f} vs {peak:.1f}/s)":
+            peak > 0 and final >= peak * args.min_goodput_ratio,
+        'rejections are fast (shed p99 under SLO)': all(step['shed_p99'] <= args.slo_ms for step in steps),
+        'every rejection carries Retry-After': all(step['missing_retry_after'] == 0 for step in steps),
+    }
+
+    print("\n📊 Overload scenario")
+    print(f"   {'offered/s':>10} {'goodput/s':>10} {'shed':>8} {'errors':>8}")
+    for step in steps:
+        print(f"   {step['offered']:>10.0f} {step['goodput']:>10.1f} {step['shed']:>8} {step['errors']:>8}")
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+
+    return all(checks.values())
+
+
+def run_burst(args):
+    """Fire bursts of simultaneous identical catalog reads and count the DB executions behind them
+
+    All requests of a burst are released together by a barrier, the way a
+    traffic spike hits the home page's fetchInitialData. The server's
+    single-flight counters tell how many of them actually ran the handler.
+    """
+    paths = args.paths.split(',')
+    client = make_client(args.size * len(paths))
+    per_burst = {path: [] for path in paths}
+    failures = 0
+
+    for burst in range(args.bursts):
+        before = client.metrics()['singleFlight']['groups']
+        barrier = threading.Barrier(args.size * len(paths))
+
+        def fire(path):
+            barrier.wait()
+            return timed_request(client, 'GET', path)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.size * len(paths)) as executor:
+            results = list(executor.map(fire, [path for path in paths for _ in range(args.size)]))
+        failures += sum(1 for status, _, _ in results if status != 200)
+
+        after = client.metrics()['singleFlight']['groups']
+        for path in paths:
+            executed = after.get(path, {}).get('executions', 0) - before.get(path, {}).get('executions', 0)
+            per_burst[path].append(executed)
+        print(f"   Burst {burst + 1}: " + ', '.join(
+            f"{path} -> {per_burst[path][-1]} DB executions for {args.size} requests" for path in paths))
+        time.sleep(args.pause)
+
+    print("\n📊 Burst scenario")
+    checks = {'all requests succeeded': failures == 0}
+    for path, executions in per_burst.items():
+        average = sum(executions) / len(executions)
+        print(f"   {path}: {average:.2f} DB executions per burst of {args.size} (max {max(executions)})")
+        checks[f"{path} stays within {args.max_executions} executions per burst"] = max(executions) <= args.max_executions
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+
+    return all(checks.values())
+
+
+def run_pipeline(args):
+    """Measure checkout latency with post-processing moved off the request path,
+    then how fast the workers drain the queued side effects"""
+    client = make_client(args.concurrency)
+    uid = create_load_user(client, 0)
+    before = client.jobs()
+
+    def place_order(i):
+        payload = {
+            'userId': uid,
+            'items': [{'productId': f"pipeline_product_{i % 10}", 'name': 'منتج اختبار', 'price': 5, 'quantity': 1}],
+            'total': 5,
+            'paymentMethod': 'whatsapp',
+        }
+        start = time.perf_counter()
+        response, _ = post_idempotent(client, '/orders', payload, retries=args.retries)
+        return response.status_code, (time.perf_counter() - start) * 1000
+
+    print(f"🚀 Placing {args.orders} orders with concurrency {args.concurrency}...")
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(place_order, range(args.orders)))
+    checkout_elapsed = time.perf_counter() - start
+    failures = sum(1 for status, _ in results if status != 200)
+
+    print("⏳ Waiting for workers to drain the queue...")
+    drain_start = time.perf_counter()
+    stats = before
+    while time.perf_counter() - drain_start < args.drain_timeout:
+        stats = client.jobs()
+        if stats['pending'] == 0 and stats['processing'] == 0:
+            break
+        time.sleep(0.2)
+    drain_elapsed = time.perf_counter() - drain_start
+    processed = stats['done'] - before['done']
+    dead = stats['dead'] - before['dead']
+
+    print("\n📊 Pipeline scenario")
+    print_latency_summary('POST /orders', [latency for _, latency in results])
+    print(f"   Checkout throughput: {args.orders / checkout_elapsed:.1f} orders/s")
+    print(f"   Jobs completed: {processed} ({processed / (checkout_elapsed + drain_elapsed):.1f} jobs/s end to end)")
+    print(f"   Queue drained {drain_elapsed:.1f}s after the last checkout returned")
+
+    checks = {
+        'all orders accepted': failures == 0,
+        'every order was post-processed': processed >= args.orders - failures,
+        'no jobs dead-lettered': dead == 0,
+        'queue fully drained': stats['pending'] == 0 and stats['processing'] == 0,
+    }
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+SOAK_SERIES = {
+    'rss_mb': lambda metrics: metrics['process']['rss'] / 2 ** 20,
+    'heap_mb': lambda metrics: metrics['process']['heapUsed'] / 2 ** 20,
+    'pool_open': lambda metrics: metrics['pool']['open'],
+    'pool_in_use': lambda metrics: metrics['pool']['inUse'],
+    'pool_waiting': lambda metrics: metrics['pool']['waiting'],
+    'in_flight': lambda metrics: metrics['singleFlight']['inFlight'],
+}
+
+
+def growth_trend(values):
+    """Least-squares slope per sample and the fraction of steps that did not go down"""
+    n = len(values)
+    if n < 3:
+        return 0.0, 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    variance = sum((x - mean_x) ** 2 for x in range(n))
+    rising = sum(1 for a, b in zip(values, values[1:]) if b >= a)
+    return covariance / variance, rising / (n - 1)
+
+
+def run_soak(args):
+    """Hold a steady open-loop rate for hours and watch for leaks and latency drift
+
+    The run is cut into windows. After each window the error rate and p99 are
+    computed over the last `--rolling` windows, and the server's RSS, heap and
+    connection pool counters are sampled from /admin/metrics. One compact JSON
+    line per window goes to the report so long runs can be plotted afterwards.
+    At the end, every sampled series that grew steadily after warm-up (most
+    steps non-decreasing and the last quarter's median above the first's by
+    `--min-growth`) is flagged.
+
+    With --profile-p99-ms, the first window after warm-up whose rolling p99
+    exceeds it starts a server CPU/heap profile of --profile-seconds while
+    the load keeps running; the files are saved next to the report.
+    """
+    client = make_client(args.max_workers)
+    fire = spread_clients(client, args.paths.split(','), args.timeout)
+    windows = max(1, int(args.hours * 3600 // args.window))
+    rolling = collections.deque(maxlen=args.rolling)
+    series = {name: [] for name in SOAK_SERIES}
+    series['p99_ms'] = []
+    baseline_p99 = None
+    error_breaches = 0
+    server_pid = None
+    restarts = 0
+    capture = None
+
+    print(f"🕰️ Soaking at {args.rate:.0f} req/s for {windows} windows of {args.window:.0f}s "
+          f"→ {args.report}")
+    with open(args.report, 'w', encoding='utf-8') as report:
+        for index in range(windows):
+            results, dropped = open_loop(args.rate, args.window, fire, max_workers=args.max_workers)
+            latencies = [latency for status, latency, _ in results if status == 200]
+            errors = sum(1 for status, _, _ in results if status != 200) + dropped
+            rolling.append((latencies, errors, len(results) + dropped))
+
+            window_latencies = [latency for latencies, _, _ in rolling for latency in latencies]
+            window_total = sum(total for _, _, total in rolling)
+            error_rate = sum(errors for _, errors, _ in rolling) / window_total if window_total else 0.0
+            p99 = summarize_latencies(window_latencies)['p99']
+
+            try:
+                metrics = client.metrics()
+            except Exception as error:
+                metrics = None
+                print(f"   ⚠️ metrics sample failed: {error}")
+
+            sample = {
+                't': round((index + 1) * args.window),
+                'requests': len(results) + dropped,
+                'errors': errors,
+                'error_rate': round(error_rate, 5),
+                'p50_ms': round(summarize_latencies(window_latencies)['p50'], 1),
+                'p99_ms': round(p99, 1),
+            }
+            if metrics:
+                if server_pid is not None and metrics['process']['pid'] != server_pid:
+                    restarts += 1
+                server_pid = metrics['process']['pid']
+                sample.update({name: round(extract(metrics), 2) for name, extract in SOAK_SERIES.items()})
+            report.write(json.dumps(sample, separators=(',', ':')) + '\n')
+            report.flush()
+
+            warmed_up = index + 1 > args.warmup
+            if warmed_up and len(rolling) == args.rolling:
+                if baseline_p99 is None:
+                    baseline_p99 = p99
+                series['p99_ms'].append(p99)
+                if metrics:
+                    for name in SOAK_SERIES:
+                        series[name].append(sample[name])
+                if error_rate > args.max_error_rate:
+                    error_breaches += 1
+                if args.profile_p99_ms and capture is None and p99 > args.profile_p99_ms:
+                    capture = ProfileCapture(args.profile_seconds, args.report).start()
+                    report.write(json.dumps({'t': sample['t'], 'profile': capture.capture['id']}) + '\n')
+
+            print(f"   [{sample['t']:>6}s] rolling err={error_rate:.3%}  p99={p99:7.1f}ms"
+                  + (f"  rss={sample['rss_mb']:.0f}MB  heap={sample['heap_mb']:.0f}MB  "
+                     f"pool={sample['pool_in_use']}/{sample['pool_open']}" if metrics else ''))
+
+    if capture:
+        capture.save()
+
+    print("\n📊 Soak scenario")
+    growing = []
+    for name, values in series.items():
+        slope, rising = growth_trend(values)
+        # Compare quarter medians so a single spike at either end is not read as growth;
+        # the floor of 1 keeps gauges that idle at zero from reporting infinite growth
+        quarter = max(1, len(values) // 4)
+        first = statistics.median(values[:quarter]) if values else 0.0
+        last = statistics.median(values[-quarter:]) if values else 0.0
+        growth = (last - first) / max(first, 1.0)
+        flagged = rising >= args.monotonic_ratio and growth >= args.min_growth
+        if flagged:
+            growing.append(name)
+        print(f"   {name:<14} slope={slope:+9.3f}/window  non-decreasing={rising:5.0%}  "
+              f"growth={growth:+7.1%}{'  📈 monotonic growth' if flagged else ''}")
+
+    final_p99 = series['p99_ms'][-1] if series['p99_ms'] else 0.0
+    checks = {
+        f"rolling error rate stayed under {args.max_error_rate:.2%}": error_breaches == 0,
+        f"p99 drift within {args.max_drift:.1f}x of baseline ({final_p99:.1f} vs {baseline_p99 or 0:.1f}ms)":
+            baseline_p99 is None or final_p99 <= max(baseline_p99, 1.0) * args.max_drift,
+        'no series grew monotonically': not growing,
+        'server did not restart during the run': restarts == 0,
+    }
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+def parse_mix(text):
+    """Parse 'PATH:WEIGHT,...' (weight optional) into a list of (path, weight)"""
+    mix = []
+    for entry in filter(None, (part.strip() for part in text.split(','))):
+        path, _, weight = entry.rpartition(':')
+        if not path or not weight.replace('.', '', 1).isdigit():
+            path, weight = entry, '1'
+        mix.append((path, float(weight)))
+    return mix
+
+
+def measure_rate(client, mix, rate, args):
+    """Offer `rate` req/s of the weighted endpoint mix and return per-endpoint and overall stats
+
+    429/503 responses and client-side drops count as errors: load the server
+    had to shed is not load it sustained.
+    """
+    paths = [path for path, _ in mix]
+    weights = [weight for _, weight in mix]
+    schedule = random.Random(args.seed)
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def fire():
+        n = next(counter)
+        with lock:
+            path = schedule.choices(paths, weights)[0]
+        headers = simulated_client_headers(f"load-1-{n}")
+        return (path, *timed_request(client, 'GET', path, headers=headers, timeout=args.timeout))
+
+    results, dropped = open_loop(rate, args.duration, fire, max_workers=args.max_workers)
+
+    def stats(rows, extra_errors=0):
+        latencies = [latency for _, status, latency, _ in rows if status == 200]
+        total = len(rows) + extra_errors
+        errors = total - len(latencies)
+        summary = summarize_latencies(latencies)
+        return {
+            'throughput': len(latencies) / args.duration,
+            'error_rate': errors / total if total else 0.0,
+            'p50': summary['p50'],
+            'p99': summary['p99'],
+        }
+
+    per_endpoint = {path: stats([row for row in results if row[0] == path]) for path in paths}
+    overall = stats(results, dropped)
+    overall['offered'] = rate
+    overall['endpoints'] = per_endpoint
+    overall['meets_slo'] = overall['error_rate'] <= args.max_error_rate and all(
+        endpoint['p99'] <= args.slo_ms and endpoint['error_rate'] <= args.max_error_rate
+        for endpoint in per_endpoint.values()
+    )
+    return overall
+
+
+def search_capacity(client, mix, args):
+    """Step the offered rate up by `--factor` until the SLO breaks, then bisect between
+    the last passing and first failing rate `--refine` times"""
+    curve = []
+
+    def step(rate):
+        point = measure_rate(client, mix, rate, args)
+        curve.append(point)
+        worst = max(point['endpoints'].values(), key=lambda endpoint: endpoint['p99'])
+        print(f"   {rate:8.1f} req/s -> {point['throughput']:7.1f} ok/s  err={point['error_rate']:6.2%}  "
+              f"worst p99={worst['p99']:7.1f}ms  {'✅' if point['meets_slo'] else '❌'}")
+        time.sleep(args.cooldown)
+        return point['meets_slo']
+
+    passing, failing = None, None
+    rate = args.start_rate
+    while rate <= args.max_rate:
+        if step(rate):
+            passing = rate
+            rate *= args.factor
+        else:
+            failing = rate
+            break
+
+    if passing is not None and failing is not None:
+        for _ in range(args.refine):
+            middle = (passing + failing) / 2
+            if step(middle):
+                passing = middle
+            else:
+                failing = middle
+
+    sustained = max((point for point in curve if point['meets_slo']), key=lambda point: point['offered'], default=None)
+    return {
+        'mix': dict(mix),
+        'max_sustainable_rate': passing,
+        'first_failing_rate': failing,
+        'sustained': sustained,
+        'curve': sorted(curve, key=lambda point: point['offered']),
+    }
+
+
+def run_capacity(args):
+    """Find the highest offered load that still meets the latency and error SLO
+
+    The endpoint mix is searched as a whole; with --per-endpoint every endpoint
+    is also searched on its own. The latency curve (every measured rate) and the
+    sustained per-endpoint throughput are printed and optionally written as JSON
+    for sizing replicas and MONGO_MAX_POOL_SIZE.
+    """
+    client = make_client(args.max_workers)
+    mix = parse_mix(args.mix)
+    try:
+        pool = client.metrics().get('pool', {})
+        print(f"🧮 Server maxPoolSize: {pool.get('maxPoolSize')}")
+    except Exception as error:
+        pool = {}
+        print(f"   ⚠️ could not read server metrics: {error}")
+
+    searches = [('mix', mix)]
+    if args.per_endpoint and len(mix) > 1:
+        searches += [(path, [(path, 1.0)]) for path, _ in mix]
+
+    results = {}
+    for name, search_mix in searches:
+        print(f"\n📈 Capacity search for {name}: SLO p99 <= {args.slo_ms:.0f}ms, errors <= {args.max_error_rate:.2%}")
+        results[name] = search_capacity(client, search_mix, args)
+
+    # Offer the peak rate once more (the first that broke the SLO, or the highest reached)
+    # while the server profiles itself
+    profile = None
+    peak = results['mix']['first_failing_rate'] or results['mix']['max_sustainable_rate']
+    if args.profile_seconds and peak:
+        print(f"\n🔬 Profiling at peak load: {peak:.1f} req/s")
+        capture = ProfileCapture(min(args.profile_seconds, args.duration), args.report).start()
+        point = measure_rate(client, mix, peak, args)
+        profile = {'rate': peak, 'capture': capture.capture['id'], 'files': capture.save(),
+                    'p99_ms': max(endpoint['p99'] for endpoint in point['endpoints'].values())}
+
+    print("\n📊 Capacity scenario")
+    for name, result in results.items():
+        sustained = result['sustained']
+        if not sustained:
+            print(f"   {name}: SLO already broken at {args.start_rate:.0f} req/s")
+            continue
+        limit = '' if result['first_failing_rate'] else f" (not reached; stopped at --max-rate {args.max_rate:.0f})"
+        print(f"   {name}: max sustainable {result['max_sustainable_rate']:.1f} req/s{limit}")
+        for path, endpoint in sustained['endpoints'].items():
+            print(f"      {path:<32} {endpoint['throughput']:7.1f} ok/s  p50={endpoint['p50']:6.1f}ms  "
+                  f"p99={endpoint['p99']:6.1f}ms")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report:
+            json.dump({'slo': {'p99_ms': args.slo_ms, 'max_error_rate': args.max_error_rate},
+                       'pool': pool, 'results': results, 'profile': profile}, report, indent=2)
+        print(f"   📝 Report written to {args.report}")
+
+    return all(result['sustained'] is not None for result in results.values())
+
+
+# Server-side command counters that count reads; getMore is left out because
+# secondaries tail the primary's oplog with it
+READ_COMMANDS = ('find', 'aggregate', 'count', 'distinct')
+
+
+def member_read_counts():
+    """Return (primary host, {host: read commands served so far}) from each member's serverStatus"""
+    from pymongo import MongoClient
+    from generate_test_data import MONGO_URL
+
+    with MongoClient(MONGO_URL, serverSelectionTimeoutMS=5000) as client:
+        hello = client.admin.command('hello')
+        hosts = hello.get('hosts') or [f"{client.address[0]}:{client.address[1]}"]
+        primary = hello.get('primary', hosts[0])
+
+    counts = {}
+    for host in hosts:
+        name, port = host.rsplit(':', 1)
+        with MongoClient(name, int(port), directConnection=True, serverSelectionTimeoutMS=5000) as member:
+            commands = member.admin.command('serverStatus')['metrics']['commands']
+        counts[host] = sum(int(commands.get(command, {}).get('total', 0)) for command in READ_COMMANDS)
+    return primary, counts
+
+
+def run_read_routing(args):
+    """Browse-heavy load at a fixed rate; report which replica set members served the reads
+
+    Reads are counted on the servers (serverStatus command counters), so the
+    numbers include everything else hitting the database meanwhile. Compare a
+    run with the default routing against a --baseline report recorded with
+    MONGO_ROUTE_CATALOG=readPreference:primary to see the primary's relief.
+    """
+    client = make_client(args.max_workers)
+    mix = parse_mix(args.mix)
+    routing = client.metrics().get('routing', {})
+    print(f"🧭 Catalog routing: {routing.get('catalog')}")
+
+    primary, before = member_read_counts()
+    print(f"🗄️ Members: {', '.join(before)} (primary {primary})")
+    print(f"\n📈 {args.rate:.0f} req/s for {args.duration:.0f}s: {args.mix}")
+    point = measure_rate(client, mix, args.rate, args)
+    _, after = member_read_counts()
+
+    reads = {host: (after[host] - before.get(host, 0)) / args.duration for host in after}
+    total = sum(reads.values())
+    primary_share = reads.get(primary, 0) / total if total else 0.0
+
+    print("\n📊 Read routing scenario")
+    print(f"   API: {point['throughput']:.1f} ok/s, errors {point['error_rate']:.2%}")
+    for host, rate in reads.items():
+        role = 'primary' if host == primary else 'secondary'
+        print(f"   {host:<22} {role:<10} {rate:8.1f} reads/s  ({rate / total if total else 0:.1%})")
+
+    checks = {'API met the SLO': point['meets_slo']}
+    if len(reads) > 1 and routing.get('catalog', {}).get('readPreference') != 'primary':
+        checks['secondaries served catalog reads'] = primary_share < 1.0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        reduction = 1 - reads.get(primary, 0) / baseline['primary_reads_per_second'] \
+            if baseline['primary_reads_per_second'] else 0.0
+        print(f"   primary reads/s: {baseline['primary_reads_per_second']:.1f} (baseline) -> "
+              f"{reads.get(primary, 0):.1f}, {reduction:.1%} less")
+        checks[f'primary load reduced by at least {args.min_reduction:.0%}'] = reduction >= args.min_reduction
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report:
+            json.dump({'mix': dict(mix), 'rate': args.rate, 'routing': routing, 'primary': primary,
+                       'reads_per_second': reads, 'primary_reads_per_second': reads.get(primary, 0),
+                       'primary_share': primary_share, 'api': point}, report, indent=2)
+        print(f"   📝 Report written to {args.report}")
+
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+ORDER_NUMBER_PATTERN = re.compile(r'^ORD-\d{6}-\d{6,}$')
+
+
+def run_order_numbers(args):
+    """Create tens of thousands of orders concurrently and assert every order number is unique
+
+    Orders are spread over simulated clients so the per-client checkout rate
+    limit does not throttle the run; queue rejections are retried with the
+    same Idempotency-Key, so a retried order keeps its original number.
+    """
+    client = make_client(args.concurrency)
+    uid = create_load_user(client, 0)
+    counter = itertools.count()
+
+    def place_order(_):
+        n = next(counter)
+        payload = {
+            'userId': uid,
+            'items': [{'productId': 'order_number_product', 'name': 'منتج اختبار', 'price': 1, 'quantity': 1}],
+            'total': 1,
+            'paymentMethod': 'whatsapp',
+        }
+        headers = simulated_client_headers(f"load-2-{n}")
+        start = time.perf_counter()
+        try:
+            response, _ = post_idempotent(client, '/orders', payload, retries=args.retries, headers=headers)
+        except Exception as error:
+            return None, None, str(error), (time.perf_counter() - start) * 1000
+        latency = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            return None, None, f"HTTP {response.status_code}: {response.text[:120]}", latency
+        order = response.json()
+        return order['id'], order['orderNumber'], None, latency
+
+    print(f"🚀 Creating {args.orders} orders with concurrency {args.concurrency}...")
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(place_order, range(args.orders)))
+    elapsed = time.perf_counter() - start
+
+    created = [(order_id, number) for order_id, number, error, _ in results if not error]
+    failures = [error for _, _, error, _ in results if error]
+    numbers = collections.Counter(number for _, number in created)
+    duplicates = {number: count for number, count in numbers.items() if count > 1}
+    malformed = [number for number in numbers if not ORDER_NUMBER_PATTERN.match(number)]
+
+    print(f"\n📊 Order number scenario finished in {elapsed:.1f}s ({len(created) / elapsed:.1f} orders/s)")
+    print_latency_summary('POST /orders', [latency for *_, latency in results])
+    checks = {
+        f"all {args.orders} orders created": not failures,
+        f"{len(numbers)} order numbers, no duplicates": not duplicates,
+        'every order number matches ORD-YYMMDD-NNNNNN': not malformed,
+        'distinct order ids map to distinct numbers': len({order_id for order_id, _ in created}) == len(numbers),
+    }
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    for number, count in list(duplicates.items())[:10]:
+        print(f"      duplicate {number} x{count}")
+    for error in failures[:10]:
+        print(f"      {error}")
+    return all(checks.values())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load test the store API')
+    parser.add_argument('--keep-data', action='store_true',
+                        help='leave the run\'s tagged data in place (it still expires through its TTL)')
+    subparsers = parser.add_subparsers(dest='scenario', required=True)
+
+    checkout = subparsers.add_parser('checkout', help='idempotent wallet orders and recharges')
+    checkout.add_argument('--operations', type=int, default=500)
+    checkout.add_argument('--concurrency', type=int, default=20)
+    checkout.add_argument('--timeout', type=float, default=2.0,
+                          help='per-attempt timeout; keep it short to force retries')
+    checkout.add_argument('--retries', type=int, default=5)
+    checkout.set_defaults(run=run_checkout)
+
+    overload = subparsers.add_parser('overload', help='step offered load and verify goodput stays flat')
+    overload.add_argument('--paths', default='/products,/categories',
+                          help='comma-separated GET paths to hit')
+    overload.add_argument('--start-rate', type=float, default=50)
+    overload.add_argument('--steps', type=int, default=5, help='each step doubles the offered rate')
+    overload.add_argument('--duration', type=float, default=20, help='seconds per step')
+    overload.add_argument('--slo-ms', type=float, default=300)
+    overload.add_argument('--timeout', type=float, default=10)
+    overload.add_argument('--max-workers', type=int, default=512)
+    overload.add_argument('--min-goodput-ratio', type=float, default=0.8)
+    overload.set_defaults(run=run_overload)
+
+    burst = subparsers.add_parser('burst', help='simultaneous identical catalog reads; count DB executions')
+    burst.add_argument('--paths', default='/products,/categories')
+    burst.add_argument('--size', type=int, default=200, help='requests per path per burst')
+    burst.add_argument('--bursts', type=int, default=10)
+    burst.add_argument('--pause', type=float, default=1.0, help='seconds between bursts')
+    burst.add_argument('--max-executions', type=int, default=2,
+                       help='allowed DB executions per path per burst (stragglers may start a second flight)')
+    burst.set_defaults(run=run_burst)
+
+    pipeline = subparsers.add_parser('pipeline', help='checkout latency and order post-processing throughput')
+    pipeline.add_argument('--orders', type=int, default=1000)
+    pipeline.add_argument('--concurrency', type=int, default=20)
+    pipeline.add_argument('--retries', type=int, default=5)
+    pipeline.add_argument('--drain-timeout', type=float, default=300)
+    pipeline.set_defaults(run=run_pipeline)
+
+    soak = subparsers.add_parser('soak', help='hours at a steady rate; flag leaks and latency drift')
+    soak.add_argument('--paths', default='/products,/categories,/products/search?q=phone')
+    soak.add_argument('--rate', type=float, default=20)
+    soak.add_argument('--hours', type=float, default=4)
+    soak.add_argument('--window', type=float, default=60, help='seconds per sample')
+    soak.add_argument('--rolling', type=int, default=5, help='windows in the rolling error/p99 window')
+    soak.add_argument('--warmup', type=int, default=5, help='windows ignored before trends are tracked')
+    soak.add_argument('--max-error-rate', type=float, default=0.001)
+    soak.add_argument('--max-drift', type=float, default=1.5, help='allowed final p99 / baseline p99')
+    soak.add_argument('--monotonic-ratio', type=float, default=0.8,
+                      help='share of non-decreasing samples that counts as steady growth')
+    soak.add_argument('--min-growth', type=float, default=0.2,
+                      help='relative rise between first and last quarter medians that counts as growth')
+    soak.add_argument('--timeout', type=float, default=10)
+    soak.add_argument('--max-workers', type=int, default=256)
+    soak.add_argument('--report', default='soak_report.jsonl')
+    soak.add_argument('--profile-p99-ms', type=float, default=0,
+                      help='profile the server once when the rolling p99 exceeds this (needs PROFILER_TOKEN)')
+    soak.add_argument('--profile-seconds', type=float, default=30)
+    soak.set_defaults(run=run_soak)
+
+    capacity = subparsers.add_parser('capacity', help='ramp offered load until the SLO breaks')
+    capacity.add_argument('--mix', default='/products:5,/categories:2,/products/search?q=phone:3',
+                          help='comma-separated PATH:WEIGHT endpoint mix')
+    capacity.add_argument('--per-endpoint', action='store_true', help='also search each endpoint alone')
+    capacity.add_argument('--start-rate', type=float, default=10)
+    capacity.add_argument('--factor', type=float, default=1.5, help='rate multiplier per step')
+    capacity.add_argument('--max-rate', type=float, default=5000)
+    capacity.add_argument('--refine', type=int, default=3, help='bisection steps after the SLO breaks')
+    capacity.add_argument('--duration', type=float, default=30, help='seconds per measured rate')
+    capacity.add_argument('--cooldown', type=float, default=5, help='seconds of idle between rates')
+    capacity.add_argument('--slo-ms', type=float, default=300)
+    capacity.add_argument('--max-error-rate', type=float, default=0.001)
+    capacity.add_argument('--timeout', type=float, default=10)
+    capacity.add_argument('--max-workers', type=int, default=512)
+    capacity.add_argument('--seed', type=int, default=42, help='seed for the endpoint choice sequence')
+    capacity.add_argument('--report', help='write the latency curve and results to this JSON file')
+    capacity.add_argument('--profile-seconds', type=float, default=0,
+                          help='re-offer the peak rate and profile the server this long (needs PROFILER_TOKEN)')
+    capacity.set_defaults(run=run_capacity)
+
+    read_routing = subparsers.add_parser('readrouting', help='browse-heavy mix; reads per replica set member')
+    read_routing.add_argument('--mix', default='/products:6,/categories:2,/coupons:1,/products/search?q=phone:3,'
+                                              '/products/suggest?q=ph:2',
+                              help='comma-separated PATH:WEIGHT endpoint mix')
+    read_routing.add_argument('--rate', type=float, default=200)
+    read_routing.add_argument('--duration', type=float, default=60)
+    read_routing.add_argument('--slo-ms', type=float, default=300)
+    read_routing.add_argument('--max-error-rate', type=float, default=0.001)
+    read_routing.add_argument('--timeout', type=float, default=10)
+    read_routing.add_argument('--max-workers', type=int, default=512)
+    read_routing.add_argument('--seed', type=int, default=42, help='seed for the endpoint choice sequence')
+    read_routing.add_argument('--baseline', help='report of a primary-only run to compare against')
+    read_routing.add_argument('--min-reduction', type=float, default=0.5,
+                              help='required drop in primary reads/s versus --baseline')
+    read_routing.add_argument('--report', help='write per-member read rates to this JSON file')
+    read_routing.set_defaults(run=run_read_routing)
+
+    order_numbers = subparsers.add_parser('ordernumbers', help='concurrent orders; assert unique order numbers')
+    order_numbers.add_argument('--orders', type=int, default=20000)
+    order_numbers.add_argument('--concurrency', type=int, default=64)
+    order_numbers.add_argument('--retries', type=int, default=10)
+    order_numbers.set_defaults(run=run_order_numbers)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🏋️ STORE API LOAD TEST")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    print(f"🎬 Scenario: {args.scenario}")
+    if TEST_RUN:
+        print(f"🏷️ Test run: {TEST_RUN}")
+    print("=" * 80)
+
+    try:
+        return args.run(args)
+    finally:
+        if TEST_RUN and not args.keep_data:
+            print(f"\n🧹 Removed {teardown_test_run():,} documents of test run {TEST_RUN}")
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Shared Load Testing Helpers
+Clients, retrying idempotent POSTs, open-loop scheduling and profiling used by the load scripts
+(configuration and latency statistics live in store_client and are re-exported here)
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+
+from store_client import (
+    BASE_URL,
+    BASE_URL_ENV,
+    HEADERS,
+    NO_RETRY,
+    PROFILER_TOKEN,
+    TEST_RUN_TOKEN,
+    RetryPolicy,
+    StoreClient,
+    backoff_delay,
+    new_idempotency_key,
+    percentile,
+    summarize_latencies,
+    new_run_namespace,
+)
+from store_client.transport import IDEMPOTENCY_HEADER, TEST_CLIENT_HEADER, TEST_RUN_TOKEN_HEADER
+
+__all__ = [
+    # Re-exported from store_client for the load scripts
+    'BASE_URL',
+    'BASE_URL_ENV',
+    'HEADERS',
+    'backoff_delay',
+    'new_idempotency_key',
+    'percentile',
+    'summarize_latencies',
+    # Defined here
+    'RETRYABLE_STATUSES',
+    'TEST_RUN',
+    'ProfileCapture',
+    'make_client',
+    'open_loop',
+    'post_idempotent',
+    'profile_paths',
+    'simulated_client_headers',
+    'teardown_test_run',
+    'timed_request',
+]
+
+# Idempotent POSTs are also retried on 409 (the same key is still being processed)
+RETRYABLE_STATUSES = frozenset({409, 429, 500, 502, 503, 504})
+
+
+# Namespace tagging everything this process creates, when the server accepts tagged runs
+TEST_RUN = os.getenv('TEST_RUN') or (new_run_namespace('load') if TEST_RUN_TOKEN else None)
+
+
+def make_client(pool_size=10, **options):
+    """StoreClient whose connection pool matches the caller's concurrency
+
+    Load scenarios count every response themselves, so the client does not
+    retry unless the caller passes a retry policy. Data the client creates is
+    tagged with this process's TEST_RUN.
+    """
+    options.setdefault('retry', NO_RETRY)
+    options.setdefault('test_run', TEST_RUN)
+    return StoreClient(pool_size=pool_size, **options)
+
+
+def teardown_test_run():
+    """Delete everything this process's run created; returns the number of documents"""
+    if not TEST_RUN:
+        return 0
+    with StoreClient(timeout=600) as client:
+        return client.teardown_test_run(TEST_RUN)['total']
+
+
+def simulated_client_headers(name):
+    """Headers that make the server's per-client rate limits treat this request as client `name`
+
+    The server honours them only with its TEST_RUN_TOKEN; without one every
+    request counts against this host's own limits.
+    """
+    if not TEST_RUN_TOKEN:
+        return {}
+    return {TEST_CLIENT_HEADER: name, TEST_RUN_TOKEN_HEADER: TEST_RUN_TOKEN}
+
+
+def post_idempotent(client, path, payload, key=None, retries=5, timeout=10, headers=None):
+    """POST with an Idempotency-Key, retrying timeouts and retryable statuses with the same key
+
+    Returns (response, attempts). The final response is returned even when it is
+    an error; connection errors on the last attempt are re-raised.
+    """
+    headers = {**(headers or {}), IDEMPOTENCY_HEADER: key or new_idempotency_key()}
+    policy = RetryPolicy(retries=retries, statuses=RETRYABLE_STATUSES)
+
+    for attempt in range(retries + 1):
+        try:
+            response = client.request('POST', path, json=payload, headers=headers, timeout=timeout,
+                                      retry=NO_RETRY, expect='response')
+        except client.transport_errors:
+            if attempt == retries:
+                raise
+            time.sleep(policy.delay(attempt))
+            continue
+
+        if policy.retryable('POST', headers, attempt, response.status_code):
+            time.sleep(policy.delay(attempt, response.headers.get('Retry-After')))
+            continue
+        return response, attempt + 1
+
+    raise RuntimeError('unreachable')
+
+
+def open_loop(rate, duration, fire, max_workers=256):
+    """Offer `rate` requests/s for `duration` seconds regardless of how fast responses come back
+
+    `fire()` is called on a worker thread at each scheduled instant and its
+    return value collected. Closed-loop clients slow down when the server
+    does, which hides overload; an open loop keeps the offered load honest.
+    Requests that cannot start because every worker is busy are counted as
+    `dropped` rather than silently delayed.
+    """
+    interval = 1.0 / rate
+    results = []
+    dropped = 0
+    in_flight = threading.Semaphore(max_workers)
+
+    def run():
+        try:
+            return fire()
+        finally:
+            in_flight.release()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        start = time.perf_counter()
+        scheduled = 0
+        while True:
+            due = start + scheduled * interval
+            if due - start >= duration:
+                break
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if in_flight.acquire(blocking=False):
+                futures.append(executor.submit(run))
+            else:
+                dropped += 1
+            scheduled += 1
+
+        for future in futures:
+            results.append(future.result())
+
+    return results, dropped
+
+
+def timed_request(client, method, path, **kwargs):
+    """Issue a request and return (status_code or None, latency_ms, retry_after)"""
+    start = time.perf_counter()
+    try:
+        response = client.request(method, path, retry=NO_RETRY, expect='response', **kwargs)
+        return response.status_code, (time.perf_counter() - start) * 1000, response.headers.get('Retry-After')
+    except client.transport_errors:
+        return None, (time.perf_counter() - start) * 1000, None
+
+
+def profile_paths(report_path, kind):
+    """Where a capture taken during a run is saved: next to the run's report"""
+    stem = os.path.splitext(report_path)[0] if report_path else f"profile-{time.strftime('%Y%m%d-%H%M%S')}"
+    return f"{stem}.{kind}profile"
+
+
+class ProfileCapture:
+    """Server-side CPU and heap sampling profile taken while load is running
+
+    start() returns as soon as the server begins sampling; save() waits for
+    the capture to end and downloads the .cpuprofile/.heapprofile files.
+    """
+
+    def __init__(self, seconds, report_path=None, heap=True, timeout=10):
+        if not PROFILER_TOKEN:
+            raise RuntimeError('set PROFILER_TOKEN to the server\'s profiler token')
+        self.seconds = seconds
+        self.report_path = report_path
+        self.heap = heap
+        self.capture = None
+        self.client = StoreClient(timeout=timeout)
+
+    def start(self):
+        self.capture = self.client.start_profile(seconds=self.seconds, heap=self.heap)
+        print(f"   🔬 profiling the server for {self.seconds}s (capture {self.capture['id']})")
+        return self
+
+    def save(self):
+        """Wait for the capture to finish and return {kind: saved path}"""
+        deadline = time.time() + self.seconds + 60
+        while time.time() < deadline:
+            status = self.client.profile_status()
+            finished = next((capture for capture in status['captures'] if capture['id'] == self.capture['id']), None)
+            if finished:
+                break
+            time.sleep(1)
+        else:
+            raise TimeoutError(f"capture {self.capture['id']} did not finish")
+
+        saved = {}
+        for kind in finished['files']:
+            path = profile_paths(self.report_path, kind)
+            with open(path, 'wb') as output:
+                output.write(self.client.download_profile(finished['id'], kind))
+            saved[kind] = path
+        print(f"   🔬 saved {', '.join(saved.values())}")
+        self.client.close()
+        return saved
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Local Replica Set
+Runs a replica set of mongod processes on this machine, for transactions (orders and
+the wallet), secondary reads (MONGO_ROUTE_CATALOG) and change streams without a cluster.
+The pytest suite and the fault-injection tests expect it on the default ports.
+
+    python local_replica_set.py start      # then use the printed MONGO_URL
+    python local_replica_set.py status
+    python local_replica_set.py stop
+"""
+
+import argparse
+import os
+import subprocess
+import time
+
+from pymongo import MongoClient
+from pymongo.errors import AutoReconnect, ConnectionFailure, OperationFailure
+
+REPLICA_SET = 'rs0'
+ALREADY_INITIALIZED = 23
+
+
+def member_ports(args):
+    return [args.base_port + index for index in range(args.members)]
+
+
+def direct_client(port, timeout_ms=2000):
+    return MongoClient('localhost', port, directConnection=True, serverSelectionTimeoutMS=timeout_ms)
+
+
+def replica_set_url(args):
+    hosts = ','.join(f"localhost:{port}" for port in member_ports(args))
+    return f"mongodb://{hosts}/?replicaSet={REPLICA_SET}"
+
+
+def wait_for(condition, timeout, what):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if condition():
+                return
+        except (ConnectionFailure, OperationFailure):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"timed out waiting for {what}")
+
+
+def start(args):
+    for port in member_ports(args):
+        dbpath = os.path.join(args.dbpath, str(port))
+        os.makedirs(dbpath, exist_ok=True)
+        result = subprocess.run([
+            args.mongod, '--replSet', REPLICA_SET, '--port', str(port), '--bind_ip', 'localhost',
+            '--dbpath', dbpath, '--logpath', os.path.join(dbpath, 'mongod.log'), '--fork',
+        ], capture_output=True, text=True)
+        if result.returncode != 0:
+            # Already running from an earlier start is fine
+            with direct_client(port) as client:
+                try:
+                    client.admin.command('ping')
+                except ConnectionFailure:
+                    print(result.stdout + result.stderr)
+                    return False
+        print(f"   mongod on port {port} ({dbpath})")
+
+    ports = member_ports(args)
+    with direct_client(ports[0], timeout_ms=10000) as client:
+        try:
+            client.admin.command('replSetInitiate', {
+                '_id': REPLICA_SET,
+                'members': [{'_id': index, 'host': f"localhost:{port}", 'priority': 2 if index == 0 else 1}
+                            for index, port in enumerate(ports)],
+            })
+            print(f"   initiated replica set {REPLICA_SET}")
+        except OperationFailure as error:
+            if error.code != ALREADY_INITIALIZED:
+                raise
+
+        wait_for(lambda: client.admin.command('hello').get('isWritablePrimary'), 60, 'a primary')
+
+    print(f"\n✅ Replica set running. Use:\nMONGO_URL={replica_set_url(args)}")
+    return True
+
+
+def status(args):
+    with MongoClient(replica_set_url(args), serverSelectionTimeoutMS=5000) as client:
+        members = client.admin.command('replSetGetStatus')['members']
+    primary = next((member for member in members if member['stateStr'] == 'PRIMARY'), None)
+    for member in members:
+        lag = ''
+        if primary and member is not primary and member.get('optimeDate'):
+            lag = f"  lag {(primary['optimeDate'] - member['optimeDate']).total_seconds():.1f}s"
+        print(f"   {member['name']:<18} {member['stateStr']:<10}{lag}")
+    return primary is not None
+
+
+def stop(args):
+    # Secondaries first, so the primary does not wait for them to catch up
+    ports = member_ports(args)
+    with MongoClient(replica_set_url(args), serverSelectionTimeoutMS=5000) as client:
+        try:
+            primary = client.admin.command('hello').get('primary')
+            primary_port = int(primary.rsplit(':', 1)[1]) if primary else None
+        except ConnectionFailure:
+            primary_port = None
+    ports.sort(key=lambda port: port == primary_port)
+
+    for port in ports:
+        with direct_client(port) as client:
+            try:
+                client.admin.command('shutdown', force=True)
+            except (AutoReconnect, ConnectionFailure):
+                pass  # the server closes the connection as it exits
+        print(f"   stopped port {port}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage a local MongoDB replica set')
+    parser.add_argument('command', choices=['start', 'status', 'stop'])
+    parser.add_argument('--members', type=int, default=3)
+    parser.add_argument('--base-port', type=int, default=27017)
+    parser.add_argument('--dbpath', default=os.path.join('.data', 'replica-set'))
+    parser.add_argument('--mongod', default='mongod', help='path to the mongod binary')
+    args = parser.parse_args()
+
+    print(f"🗄️ LOCAL REPLICA SET {REPLICA_SET}: {args.command}")
+    return {'start': start, 'status': status, 'stop': stop}[args.command](args)
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
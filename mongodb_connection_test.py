@@ -5,11 +5,14 @@ Tests the MongoDB connection issues mentioned in the review request
 """
 
 import requests
+import argparse
 import json
 import time
 import concurrent.futures
 import os
 
+from run_history import TestRun
+
 # Configuration
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://souqonline.preview.emergentagent.com')
 API_BASE = f"{BASE_URL}/api"
@@ -113,7 +116,7 @@ def test_mongodb_connection_stability():
     successful = [r for r in results if r['success']]
     failed = [r for r in results if not r['success']]
     
-    print(f"\n📊 Stability Test Results:")
+    print("\n📊 Stability Test Results:")
     print(f"   Duration: {test_duration} seconds")
     print(f"   Total requests: {len(results)}")
     print(f"   ✅ Successful: {len(successful)}")
@@ -163,8 +166,149 @@ def test_specific_mongodb_error():
     
     return error_found
 
+# Fault scenarios run through fault_proxy.py: (name, fault, seconds the fault is held)
+FAULT_SCENARIOS = [
+    ('latency_300ms', {'latency': 300}, 20),
+    ('bandwidth_64kb', {'bandwidth': 64 * 1024}, 20),
+    ('stall', {'stall': True}, 10),
+    ('reset_once', {'reset': True}, 1),
+    ('mongod_down', {'reset': True, 'refuse': True}, 15),
+]
+
+UNDEFINED_DB_ERROR = "Cannot read properties of undefined"
+
+def probe(duration, rate, stop_when=None):
+    """Send GET /products at a fixed rate for up to `duration` seconds
+
+    Returns a list of (seconds since start, result). Requests run on a pool so a
+    hung request does not delay the ones scheduled after it. `stop_when(results)`
+    is checked after each result to end the probe early.
+    """
+    start = time.time()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+        pending = []
+        sent = 0
+        while time.time() - start < duration:
+            sent_at = time.time() - start
+            pending.append((sent_at, executor.submit(test_single_request, 'products', sent)))
+            sent += 1
+            done = [item for item in pending if item[1].done()]
+            for item in done:
+                pending.remove(item)
+                results.append((item[0], item[1].result()))
+            if stop_when and stop_when(sorted(results, key=lambda item: item[0])):
+                break
+            time.sleep(max(0.0, start + sent / rate - time.time()))
+        for sent_at, future in pending:
+            results.append((sent_at, future.result()))
+    return sorted(results, key=lambda item: item[0])
+
+def recovered(results, consecutive=5):
+    """True once the last `consecutive` probes (in send order) all succeeded"""
+    tail = results[-consecutive:]
+    return len(tail) == consecutive and all(result['success'] for _, result in tail)
+
+def run_fault_scenario(proxy, name, fault, fault_seconds, rate=5, recovery_timeout=60):
+    """Baseline, hold the fault, clear it, then time how long until requests succeed again"""
+    print(f"\n🔍 Fault scenario: {name} ({fault}) for {fault_seconds}s")
+    print("=" * 60)
+
+    baseline = probe(5, rate)
+    proxy.apply_threadsafe(fault)
+    during = probe(fault_seconds, rate)
+    proxy.apply_threadsafe({})
+    after = probe(recovery_timeout, rate, stop_when=recovered)
+    recovery_time = None
+    if recovered(after):
+        # First success of the final all-success streak
+        streak_start = len(after)
+        while streak_start > 0 and after[streak_start - 1][1]['success']:
+            streak_start -= 1
+        recovery_time = after[streak_start][0]
+
+    def error_rate(results):
+        return sum(1 for _, result in results if not result['success']) / len(results) if results else 0.0
+
+    undefined_errors = sum(
+        1 for _, result in baseline + during + after
+        if result['error'] and UNDEFINED_DB_ERROR in str(result['error'])
+    )
+
+    outcome = {
+        'baseline_error_rate': error_rate(baseline),
+        'fault_error_rate': error_rate(during),
+        'recovery_seconds': recovery_time,
+        'undefined_db_errors': undefined_errors,
+    }
+    print(f"   Baseline error rate: {outcome['baseline_error_rate']:.1%}")
+    print(f"   Error rate during fault: {outcome['fault_error_rate']:.1%}")
+    if recovery_time is None:
+        print(f"   ❌ Did not recover within {recovery_timeout}s of clearing the fault")
+    else:
+        print(f"   ✅ Recovered {recovery_time:.1f}s after clearing the fault")
+    if undefined_errors:
+        print(f"   🎯 '{UNDEFINED_DB_ERROR}' seen {undefined_errors} times")
+
+    outcome['passed'] = recovery_time is not None and undefined_errors == 0 and outcome['baseline_error_rate'] == 0
+    return outcome
+
+def run_fault_scenarios(args, run):
+    """Run every fault scenario through an in-process fault_proxy
+
+    The API must already be running with MONGO_URL pointing at the proxy, e.g.
+    mongodb://localhost:27020/?directConnection=true, and the upstream must be a
+    replica set member (local_replica_set.py) so orders can use transactions
+    """
+    from fault_proxy import start_in_thread
+
+    upstream_host, _, upstream_port = args.upstream.rpartition(':')
+    proxy = start_in_thread(args.proxy_port, upstream_host or 'localhost', int(upstream_port))
+    print(f"🔌 Fault proxy listening on 127.0.0.1:{args.proxy_port} -> {args.upstream}")
+
+    selected = [scenario for scenario in FAULT_SCENARIOS if not args.scenarios or scenario[0] in args.scenarios]
+    outcomes = {
+        name: run.test(name, run_fault_scenario, proxy, name, fault, seconds, args.rate,
+                       passed=lambda outcome: outcome['passed'])
+        for name, fault, seconds in selected
+    }
+
+    print("\n" + "=" * 80)
+    print("📊 FAULT SCENARIO SUMMARY")
+    print("=" * 80)
+    print(f"   {'scenario':<16} {'fault err':>10} {'recovery':>10} {'undefined db':>13}")
+    for name, outcome in outcomes.items():
+        recovery = f"{outcome['recovery_seconds']:.1f}s" if outcome['recovery_seconds'] is not None else 'never'
+        print(f"   {name:<16} {outcome['fault_error_rate']:>10.1%} {recovery:>10} "
+              f"{outcome['undefined_db_errors']:>13}  {'✅' if outcome['passed'] else '❌'}")
+    print(f"   Proxy stats: {proxy.stats}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report:
+            json.dump(outcomes, report, indent=2)
+
+    return all(outcome['passed'] for outcome in outcomes.values())
+
 def main():
     """Run all MongoDB connection tests"""
+    parser = argparse.ArgumentParser(description='MongoDB connection diagnostics')
+    parser.add_argument('--faults', action='store_true',
+                        help='run the fault-injection scenarios through fault_proxy.py')
+    parser.add_argument('--proxy-port', type=int, default=27020)
+    parser.add_argument('--upstream', default='localhost:27017', help='the replica set primary')
+    parser.add_argument('--scenarios', nargs='*', help='subset of fault scenarios to run')
+    parser.add_argument('--rate', type=float, default=5, help='probe requests per second')
+    parser.add_argument('--report', help='write scenario outcomes to this JSON file')
+    args = parser.parse_args()
+
+    if args.faults:
+        print("🧪 MONGODB FAULT-INJECTION SCENARIOS")
+        print("=" * 80)
+        print(f"🔗 API Base URL: {API_BASE}")
+        print("=" * 80)
+        with TestRun('mongodb_fault_scenarios', API_BASE) as run:
+            return run_fault_scenarios(args, run)
+
     print("🧪 MONGODB CONNECTION DIAGNOSTIC TESTS")
     print("=" * 80)
     print(f"🔗 API Base URL: {API_BASE}")
@@ -172,17 +316,18 @@ def main():
     
     test_results = {}
     
-    # Test 1: Concurrent requests (race conditions)
-    test_results['concurrent'] = test_concurrent_requests()
-    
-    # Test 2: Rapid sequential requests
-    test_results['sequential'] = test_rapid_sequential_requests()
-    
-    # Test 3: Connection stability over time
-    test_results['stability'] = test_mongodb_connection_stability()
-    
-    # Test 4: Try to reproduce specific error
-    test_results['specific_error'] = test_specific_mongodb_error()
+    with TestRun('mongodb_connection_test', API_BASE) as run:
+        # Test 1: Concurrent requests (race conditions)
+        test_results['concurrent'] = run.test('concurrent', test_concurrent_requests)
+        
+        # Test 2: Rapid sequential requests
+        test_results['sequential'] = run.test('sequential', test_rapid_sequential_requests)
+        
+        # Test 3: Connection stability over time
+        test_results['stability'] = run.test('stability', test_mongodb_connection_stability)
+        
+        # Test 4: Try to reproduce specific error
+        test_results['specific_error'] = run.test('specific_error', test_specific_mongodb_error)
     
     # Summary
     print("\n" + "=" * 80)
@@ -196,7 +341,7 @@ def main():
     failed_tests = [name for name, result in test_results.items() if not result]
     
     if failed_tests:
-        print(f"\n🚨 ISSUES DETECTED:")
+        print("\n🚨 ISSUES DETECTED:")
         print("- MongoDB connection instability found")
         print("- Potential race conditions in connection handling")
         print("- Database object may be undefined under certain conditions")
@@ -1,11 +1,12 @@
 const nextConfig = {
   output: 'standalone',
+  // Product images are resized by our own pipeline (lib/images.js, /api/images/...)
   images: {
     unoptimized: true,
   },
   experimental: {
     // Remove if not using Server Components
-    serverComponentsExternalPackages: ['mongodb'],
+    serverComponentsExternalPackages: ['mongodb', 'sharp'],
   },
   webpack(config, { dev }) {
     if (dev) {
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Product Grid Render Benchmark
+Scrolls the storefront grid through a 10k-product catalog in headless Chromium and
+measures frame times, JS heap and DOM size while pages load and once all are in.
+
+    python product_grid_benchmark.py --products 10000 --report grid.json
+    python product_grid_benchmark.py --skip-seed --cpu-throttle 4     # a slow phone
+
+Products missing from the catalog are created through the API and tagged with
+this run's namespace, then torn down at the end (--keep-data keeps them; needs
+TEST_RUN_TOKEN). Run against a production build (`yarn build && yarn start`).
+Needs Playwright: pip install playwright && playwright install chromium
+"""
+
+import argparse
+import json
+import random
+import time
+
+from load_tools import BASE_URL, BASE_URL_ENV, TEST_RUN, make_client, percentile, teardown_test_run
+
+FRAME_BUDGET_MS = 1000 / 60
+LONG_FRAME_MS = 50
+CATEGORIES = [('electronics', 'إلكترونيات'), ('clothing', 'ملابس'), ('food', 'مواد غذائية'),
+              ('accessories', 'إكسسوارات')]
+
+# Records the gap between animation frames until window.__stopFrames() is called
+FRAME_RECORDER = """() => {
+  window.__frames = [];
+  let last = performance.now();
+  let recording = true;
+  const tick = (now) => {
+    window.__frames.push(now - last);
+    last = now;
+    if (recording) requestAnimationFrame(tick);
+  };
+  window.__stopFrames = () => { recording = false; return window.__frames; };
+  requestAnimationFrame(tick);
+}"""
+
+# Scroll by `step` pixels a frame for `frames` frames, like a steady fling
+SCROLL = """async ({ step, frames }) => {
+  for (let i = 0; i < frames; i++) {
+    window.scrollBy(0, step);
+    await new Promise(resolve => requestAnimationFrame(resolve));
+  }
+}"""
+
+LOADED_COUNT = "() => Number(document.querySelector('[data-product-count]')?.dataset.productCount || 0)"
+
+
+def require_playwright():
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError as error:
+        raise ImportError('this benchmark needs Playwright: '
+                          'pip install playwright && playwright install chromium') from error
+    return sync_playwright
+
+
+def count_products(client):
+    total, cursor = 0, ''
+    while cursor is not None:
+        page = client.products_page(cursor, limit=200)
+        total += len(page['products'])
+        cursor = page['nextCursor']
+    return total
+
+
+def seed_products(client, count, concurrency):
+    rng = random.Random(42)
+
+    def create(index):
+        slug, name_ar = rng.choice(CATEGORIES)
+        price = round(rng.uniform(1, 900), 2)
+        return client.create_product({
+            'name': f"منتج تجريبي {index}",
+            'nameEn': f"Benchmark product {index}",
+            'price': price,
+            'originalPrice': round(price * 1.2, 2) if index % 3 == 0 else price,
+            'category': slug,
+            'categoryAr': name_ar,
+            'stock': rng.randint(0, 500),
+            'rating': round(rng.uniform(3, 5), 1),
+        })
+
+    start = time.perf_counter()
+    client.map(create, range(count), concurrency)
+    print(f"📦 Created {count:,} products in {time.perf_counter() - start:.1f}s")
+
+
+def performance_metrics(cdp):
+    return {metric['name']: metric['value'] for metric in cdp.send('Performance.getMetrics')['metrics']}
+
+
+def frame_stats(frames):
+    # The first gap includes the time before recording started
+    frames = frames[1:] or [0.0]
+    return {
+        'frames': len(frames),
+        'p50_ms': percentile(frames, 50),
+        'p95_ms': percentile(frames, 95),
+        'p99_ms': percentile(frames, 99),
+        'max_ms': max(frames),
+        'over_budget': sum(1 for frame in frames if frame > FRAME_BUDGET_MS * 1.5) / len(frames),
+        'long_frames': sum(1 for frame in frames if frame > LONG_FRAME_MS),
+    }
+
+
+def scroll_phase(page, cdp, name, step, frames, until=None, timeout=300):
+    """Scroll in bursts of `frames` frames until `until()` holds (or once), recording every frame"""
+    page.evaluate(FRAME_RECORDER)
+    start = time.perf_counter()
+    while True:
+        page.evaluate(SCROLL, {'step': step, 'frames': frames})
+        if until is None or until() or time.perf_counter() - start > timeout:
+            break
+    elapsed = time.perf_counter() - start
+    stats = frame_stats(page.evaluate('() => window.__stopFrames()'))
+    metrics = performance_metrics(cdp)
+    stats.update({
+        'seconds': elapsed,
+        'heap_mb': metrics['JSHeapUsedSize'] / 1e6,
+        'dom_nodes': int(metrics['Nodes']),
+        'loaded_products': page.evaluate(LOADED_COUNT),
+    })
+    print(f"   {name:<10} {stats['loaded_products']:>8,} {stats['frames']:>7,} {stats['p50_ms']:>7.1f} "
+          f"{stats['p95_ms']:>7.1f} {stats['max_ms']:>7.1f} {stats['over_budget']:>7.1%} "
+          f"{stats['heap_mb']:>8.1f} {stats['dom_nodes']:>9,}")
+    return stats
+
+
+def run_browser(args):
+    sync_playwright = require_playwright()
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        page = browser.new_page(viewport={'width': args.width, 'height': args.height})
+        cdp = page.context.new_cdp_session(page)
+        cdp.send('Performance.enable')
+        if args.cpu_throttle > 1:
+            cdp.send('Emulation.setCPUThrottlingRate', {'rate': args.cpu_throttle})
+
+        page.goto(f"{BASE_URL_ENV}/", wait_until='networkidle')
+        page.wait_for_selector('[data-product-count]')
+        initial = performance_metrics(cdp)
+        print(f"🌐 First page: {page.evaluate(LOADED_COUNT)} products, "
+              f"{initial['JSHeapUsedSize'] / 1e6:.1f}MB heap, {int(initial['Nodes']):,} DOM nodes")
+
+        print(f"\n   {'phase':<10} {'products':>8} {'frames':>7} {'p50':>7} {'p95':>7} {'max':>7} "
+              f"{'janky':>7} {'heap MB':>8} {'DOM nodes':>9}")
+        phases = {
+            # Infinite scroll: keep flinging down until every page is loaded
+            'load': scroll_phase(page, cdp, 'load', args.step, 60,
+                                 until=lambda: page.evaluate(LOADED_COUNT) >= args.products),
+        }
+        # The whole catalog is in memory now; scroll back up through it
+        height = page.evaluate('() => document.documentElement.scrollHeight')
+        phases['scroll_up'] = scroll_phase(page, cdp, 'scroll_up', -args.step, max(60, height // args.step))
+        browser.close()
+
+    return {'initial': {'heap_mb': initial['JSHeapUsedSize'] / 1e6, 'dom_nodes': int(initial['Nodes'])},
+            **phases}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scrolling the product grid through a large catalog')
+    parser.add_argument('--products', type=int, default=10000, help='catalog size to scroll through')
+    parser.add_argument('--skip-seed', action='store_true', help='use the catalog as it is')
+    parser.add_argument('--concurrency', type=int, default=16, help='parallel product creates while seeding')
+    parser.add_argument('--step', type=int, default=120, help='pixels scrolled per frame')
+    parser.add_argument('--width', type=int, default=1366)
+    parser.add_argument('--height', type=int, default=900)
+    parser.add_argument('--cpu-throttle', type=float, default=1, help='Chromium CPU slowdown factor')
+    parser.add_argument('--keep-data', action='store_true', help='keep the seeded products')
+    parser.add_argument('--report', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    print("🧱 PRODUCT GRID RENDER BENCHMARK")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    if TEST_RUN:
+        print(f"🏷️ Test run: {TEST_RUN}")
+    print("=" * 80)
+
+    try:
+        with make_client(pool_size=args.concurrency, timeout=30) as client:
+            existing = count_products(client)
+            print(f"📦 Catalog has {existing:,} products")
+            if not args.skip_seed and existing < args.products:
+                seed_products(client, args.products - existing, args.concurrency)
+
+        results = run_browser(args)
+    finally:
+        if not args.keep_data:
+            deleted = teardown_test_run()
+            if deleted:
+                print(f"🧹 Deleted {deleted:,} documents of {TEST_RUN}")
+
+    load, scroll_up = results['load'], results['scroll_up']
+    checks = {
+        f"all {args.products:,} products loaded by scrolling": load['loaded_products'] >= args.products,
+        'DOM stays small with the full catalog loaded': scroll_up['dom_nodes'] < results['initial']['dom_nodes'] * 2,
+        f"p95 frame under {FRAME_BUDGET_MS * 2:.0f}ms while scrolling the loaded catalog":
+            scroll_up['p95_ms'] < FRAME_BUDGET_MS * 2,
+    }
+    print()
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report:
+            json.dump({'args': vars(args), 'results': results, 'checks': checks}, report, indent=2)
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Test Run History
+Records every test run (per-test and per-request timings, status, environment) in a local SQLite database
+
+Scripts wrap their tests in a TestRun:
+
+    with TestRun('backend_test', BASE_URL) as run:
+        results['api_root'] = run.test('api_root', test_api_root)
+
+Every HTTP request made through `requests` while the run is open is timed and
+attributed to the test that made it. Reports and exports:
+
+    python run_history.py report [--script backend_test] [--runs 20]
+    python run_history.py export --format junit --output results.xml
+    python run_history.py export --format json --run 42
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+
+import requests
+
+HISTORY_DB = os.getenv('TEST_HISTORY_DB', 'test_history.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration_ms REAL,
+    status TEXT,
+    base_url TEXT,
+    git_commit TEXT,
+    python TEXT,
+    platform TEXT,
+    hostname TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    started_at TEXT NOT NULL,
+    message TEXT
+);
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_name TEXT,
+    method TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    status INTEGER,
+    duration_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_name_run ON tests(name, run_id);
+CREATE INDEX IF NOT EXISTS requests_run ON requests(run_id);
+"""
+
+# Path segments that identify a record rather than a route, so timings group by endpoint
+ID_SEGMENT = re.compile(r'^(?:[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{24}|\d+|[A-Za-z]+_[\w-]*\d[\w-]*)$')
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def endpoint_of(url):
+    """'https://host/api/users/abc_123?x=1' -> '/api/users/:id'"""
+    path = urlsplit(url).path or '/'
+    return '/'.join(':id' if ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def connect(path=HISTORY_DB):
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class TestRun:
+    """Context manager recording one run of a test script"""
+
+    __test__ = False
+
+    def __init__(self, script, base_url=None, path=HISTORY_DB):
+        self.script = script
+        self.base_url = base_url
+        self.path = path
+        self.current_test = None
+        self.statuses = []
+        self._requests = []
+        self._lock = threading.Lock()
+        self._original_request = None
+
+    def __enter__(self):
+        self.connection = connect(self.path)
+        self.started = time.perf_counter()
+        cursor = self.connection.execute(
+            'INSERT INTO runs (script, started_at, base_url, git_commit, python, platform, hostname) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (self.script, now_iso(), self.base_url, git_commit(), platform.python_version(),
+             platform.platform(), socket.gethostname()),
+        )
+        self.run_id = cursor.lastrowid
+        self.connection.commit()
+        self._instrument()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        requests.Session.request = self._original_request
+        self._flush_requests()
+        status = 'error' if exc_type else ('passed' if all(s in ('passed', 'skipped') for s in self.statuses) else 'failed')
+        self.connection.execute('UPDATE runs SET duration_ms = ?, status = ? WHERE id = ?',
+                                ((time.perf_counter() - self.started) * 1000, status, self.run_id))
+        self.connection.commit()
+        self.connection.close()
+        print(f"🗂️ Run #{self.run_id} recorded in {self.path}")
+        return False
+
+    def _instrument(self):
+        """Time every requests.Session.request call (module-level requests.get/post go through it too)"""
+        self._original_request = original = requests.Session.request
+        run = self
+
+        def timed(session, method, url, *args, **kwargs):
+            start = time.perf_counter()
+            status = None
+            try:
+                response = original(session, method, url, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                with run._lock:
+                    run._requests.append((run.run_id, run.current_test, method.upper(), endpoint_of(url),
+                                          status, (time.perf_counter() - start) * 1000))
+
+        requests.Session.request = timed
+
+    def _flush_requests(self):
+        with self._lock:
+            rows, self._requests = self._requests, []
+        self.connection.executemany(
+            'INSERT INTO requests (run_id, test_name, method, endpoint, status, duration_ms) VALUES (?, ?, ?, ?, ?, ?)',
+            rows,
+        )
+
+    def test(self, name, function, *args, passed=bool):
+        """Run and time one test; `passed(result)` decides its status. Returns the test's own result."""
+        self.current_test = name
+        started_at = now_iso()
+        start = time.perf_counter()
+        message = None
+        try:
+            result = function(*args)
+            status = 'passed' if passed(result) else 'failed'
+        except Exception as error:
+            result = None
+            status = 'error'
+            message = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            self.record(name, status, (time.perf_counter() - start) * 1000, started_at, message)
+            self.current_test = None
+        return result
+
+    def record(self, name, status, duration_ms=0.0, started_at=None, message=None):
+        """Record a test outcome directly, e.g. 'skipped' for tests whose prerequisite failed"""
+        self.statuses.append(status)
+        self.connection.execute(
+            'INSERT INTO tests (run_id, name, status, duration_ms, started_at, message) VALUES (?, ?, ?, ?, ?, ?)',
+            (self.run_id, name, status, duration_ms, started_at or now_iso(), message),
+        )
+        self._flush_requests()
+        self.connection.commit()
+
+
+def recent_run_ids(connection, script=None, runs=20):
+    query = 'SELECT id FROM runs' + (' WHERE script = ?' if script else '') + ' ORDER BY id DESC LIMIT ?'
+    return [row['id'] for row in connection.execute(query, (script, runs) if script else (runs,))]
+
+
+def report(connection, script=None, runs=20, top=10):
+    run_ids = recent_run_ids(connection, script, runs)
+    if not run_ids:
+        print("No runs recorded yet")
+        return
+    marks = ','.join('?' * len(run_ids))
+
+    print(f"🕘 Last {len(run_ids)} runs")
+    print(f"   {'run':>5} {'script':<26} {'started':<26} {'status':<8} {'duration':>10} {'passed':>8} {'commit':<8}")
+    for row in connection.execute(
+            f"SELECT r.*, SUM(t.status = 'passed') AS passed, COUNT(t.id) AS total FROM runs r "
+            f"LEFT JOIN tests t ON t.run_id = r.id WHERE r.id IN ({marks}) GROUP BY r.id ORDER BY r.id", run_ids):
+        print(f"   {row['id']:>5} {row['script']:<26} {row['started_at']:<26} {row['status'] or '-':<8} "
+              f"{(row['duration_ms'] or 0) / 1000:>9.1f}s {row['passed'] or 0:>3}/{row['total']:<4} {row['git_commit'] or '-':<8}")
+
+    print("\n🐢 Slowest tests (mean over these runs)")
+    print(f"   {'test':<32} {'runs':>5} {'mean':>9} {'max':>9} {'fail %':>7} {'trend':>8}")
+    rows = connection.execute(
+        f"SELECT name, COUNT(*) AS n, AVG(duration_ms) AS mean, MAX(duration_ms) AS max, "
+        f"AVG(status != 'passed' AND status != 'skipped') AS failure_rate FROM tests "
+        f"WHERE run_id IN ({marks}) GROUP BY name ORDER BY mean DESC LIMIT ?", (*run_ids, top)).fetchall()
+    for row in rows:
+        durations = [r['duration_ms'] for r in connection.execute(
+            f"SELECT duration_ms FROM tests WHERE name = ? AND run_id IN ({marks}) ORDER BY run_id",
+            (row['name'], *run_ids))]
+        print(f"   {row['name']:<32} {row['n']:>5} {row['mean']:>7.0f}ms {row['max']:>7.0f}ms "
+              f"{row['failure_rate'] * 100:>6.0f}% {trend(durations):>8}")
+
+    print("\n🌐 Slowest endpoints")
+    print(f"   {'endpoint':<40} {'calls':>6} {'mean':>9} {'max':>9} {'errors':>7}")
+    for row in connection.execute(
+            f"SELECT method || ' ' || endpoint AS endpoint, COUNT(*) AS n, AVG(duration_ms) AS mean, "
+            f"MAX(duration_ms) AS max, SUM(status IS NULL OR status >= 500) AS errors FROM requests "
+            f"WHERE run_id IN ({marks}) GROUP BY method, endpoint ORDER BY mean DESC LIMIT ?", (*run_ids, top)):
+        print(f"   {row['endpoint']:<40} {row['n']:>6} {row['mean']:>7.0f}ms {row['max']:>7.0f}ms {row['errors']:>7}")
+
+
+def trend(durations):
+    """Relative change of the mean duration between the older and newer half of the runs"""
+    if len(durations) < 4:
+        return '-'
+    half = len(durations) // 2
+    older = sum(durations[:half]) / half
+    newer = sum(durations[half:]) / (len(durations) - half)
+    return f"{(newer - older) / older:+.0%}" if older else '-'
+
+
+def load_run(connection, run_id):
+    if run_id == 'latest':
+        row = connection.execute('SELECT * FROM runs ORDER BY id DESC LIMIT 1').fetchone()
+    else:
+        row = connection.execute('SELECT * FROM runs WHERE id = ?', (int(run_id),)).fetchone()
+    if row is None:
+        raise SystemExit(f"No run {run_id}")
+    tests = [dict(test) for test in connection.execute('SELECT * FROM tests WHERE run_id = ? ORDER BY id', (row['id'],))]
+    endpoints = [dict(endpoint) for endpoint in connection.execute(
+        'SELECT method, endpoint, COUNT(*) AS calls, AVG(duration_ms) AS mean_ms, MAX(duration_ms) AS max_ms '
+        'FROM requests WHERE run_id = ? GROUP BY method, endpoint ORDER BY mean_ms DESC', (row['id'],))]
+    return {**dict(row), 'tests': tests, 'endpoints': endpoints}
+
+
+def to_junit(run):
+    suite = ElementTree.Element('testsuite', {
+        'name': run['script'],
+        'tests': str(len(run['tests'])),
+        'failures': str(sum(test['status'] == 'failed' for test in run['tests'])),
+        'errors': str(sum(test['status'] == 'error' for test in run['tests'])),
+        'skipped': str(sum(test['status'] == 'skipped' for test in run['tests'])),
+        'time': f"{(run['duration_ms'] or 0) / 1000:.3f}",
+        'timestamp': run['started_at'],
+        'hostname': run['hostname'] or '',
+    })
+    properties = ElementTree.SubElement(suite, 'properties')
+    for key in ('base_url', 'git_commit', 'python', 'platform'):
+        ElementTree.SubElement(properties, 'property', {'name': key, 'value': str(run[key] or '')})
+    for test in run['tests']:
+        case = ElementTree.SubElement(suite, 'testcase', {
+            'classname': run['script'], 'name': test['name'], 'time': f"{test['duration_ms'] / 1000:.3f}",
+        })
+        if test['status'] in ('failed', 'error', 'skipped'):
+            tag = {'failed': 'failure', 'error': 'error', 'skipped': 'skipped'}[test['status']]
+            ElementTree.SubElement(case, tag, {'message': test['message'] or test['status']})
+    return ElementTree.tostring(suite, encoding='unicode')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query and export the local test run history')
+    parser.add_argument('--db', default=HISTORY_DB)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    report_parser = subparsers.add_parser('report', help='recent runs, slowest tests and endpoints, trends')
+    report_parser.add_argument('--script')
+    report_parser.add_argument('--runs', type=int, default=20)
+    report_parser.add_argument('--top', type=int, default=10)
+
+    export_parser = subparsers.add_parser('export', help='export one run as JUnit XML or JSON')
+    export_parser.add_argument('--run', default='latest')
+    export_parser.add_argument('--format', choices=('junit', 'json'), default='junit')
+    export_parser.add_argument('--output', help='defaults to stdout')
+
+    args = parser.parse_args()
+    connection = connect(args.db)
+
+    if args.command == 'report':
+        report(connection, args.script, args.runs, args.top)
+        return
+
+    run = load_run(connection, args.run)
+    output = to_junit(run) if args.format == 'junit' else json.dumps(run, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output)
+    else:
+        sys.stdout.write(output + '\n')
+
+
+if __name__ == "__main__":
+    main()
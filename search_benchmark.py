@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Product Search Benchmark
+Measures /api/products/search and /api/products/suggest latency on a large synthetic catalog
+"""
+
+import argparse
+import statistics
+import time
+
+from load_tools import BASE_URL, make_client, percentile
+
+# Each query appears in several spellings users actually type; all should match the same products
+QUERIES = {
+    'arabic_exact': ['هاتف ذكي', 'حقيبة جلدية', 'زيت زيتون'],
+    'arabic_variants': ['هاتِف ذَكي', 'حقيبه جلديه', 'الإلكترونيات', 'الالكترونيات'],
+    'english_stemmed': ['smartphones', 'leather bags', 'headphones', 'chargers'],
+    'mixed': ['هاتف Samsung', 'Apple ساعة'],
+}
+PREFIXES = ['ها', 'هات', 'حقي', 'sma', 'lea', 'قه', 'زيت ز']
+
+
+def timed_query(search, query):
+    """Run one search call and return (latency_ms, result_count)"""
+    start = time.perf_counter()
+    results = search(query, limit=20)
+    return (time.perf_counter() - start) * 1000, len(results)
+
+
+def load_catalog(count, seed):
+    """Bulk-load a synthetic catalog and build its search fields"""
+    from pymongo import MongoClient
+    from generate_test_data import DB_NAME, MONGO_URL, bulk_load, generate_products
+
+    client = MongoClient(MONGO_URL)
+    database = client[DB_NAME]
+    database.products.drop()
+    bulk_load(database, 'products', generate_products(count, seed), 5000, count)
+    client.close()
+
+
+def reindex(client):
+    """Ask the API to build search fields for products that lack them"""
+    start = time.perf_counter()
+    reindexed = client.request('POST', '/admin/search/reindex', timeout=3600)['reindexed']
+    print(f"🔧 Reindexed {reindexed} products in {time.perf_counter() - start:.1f}s")
+
+
+def run_group(name, search, queries, iterations):
+    """Run each query `iterations` times and print latency stats for the group"""
+    latencies = []
+    hits = {}
+    for query in queries:
+        for _ in range(iterations):
+            latency, count = timed_query(search, query)
+            latencies.append(latency)
+            hits[query] = count
+
+    print(f"   {name:<18} p50={percentile(latencies, 50):7.1f}ms  "
+          f"p95={percentile(latencies, 95):7.1f}ms  p99={percentile(latencies, 99):7.1f}ms  "
+          f"mean={statistics.mean(latencies):7.1f}ms")
+    for query, count in hits.items():
+        print(f"      {query!r}: {count} results")
+    return latencies
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark Arabic-aware product search')
+    parser.add_argument('--load', type=int, default=0, help='load N synthetic products first')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=20)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🔎 PRODUCT SEARCH BENCHMARK")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    print("=" * 80)
+
+    if args.load:
+        print(f"📦 Loading {args.load:,} synthetic products...")
+        load_catalog(args.load, args.seed)
+
+    with make_client(timeout=30) as client:
+        reindex(client)
+
+        print("\n📊 Search latency")
+        all_latencies = []
+        for name, queries in QUERIES.items():
+            all_latencies += run_group(name, client.search_products, queries, args.iterations)
+
+        print("\n📊 Autocomplete latency")
+        run_group('suggest', client.suggest_products, PREFIXES, args.iterations)
+
+    print(f"\n✅ Overall search p99: {percentile(all_latencies, 99):.1f}ms over {len(all_latencies)} queries")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,56 @@
+"""
+Store API Client
+Typed, pooled client for every /api endpoint, shared by the test and load scripts
+
+    from store_client import StoreClient, TimingRecorder
+
+    recorder = TimingRecorder()
+    with StoreClient(pool_size=16, hooks=[recorder]) as client:
+        client.products()
+    print(recorder.summary())
+
+AsyncStoreClient has the same methods for asyncio and needs httpx;
+http2=True on either client needs httpx[http2].
+"""
+
+from .aio import AsyncStoreClient
+from .endpoints import MAX_BATCH_IDS, new_idempotency_key
+from .sync import StoreClient
+from .timing import RequestTiming, TimingRecorder, percentile, summarize_latencies
+from .transport import (
+    BASE_URL,
+    BASE_URL_ENV,
+    HEADERS,
+    NO_RETRY,
+    PROFILER_TOKEN,
+    TEST_RUN_TOKEN,
+    ApiError,
+    LeakedIdError,
+    RetryPolicy,
+    backoff_delay,
+    find_mongo_ids,
+    new_run_namespace,
+)
+
+__all__ = [
+    'AsyncStoreClient',
+    'StoreClient',
+    'ApiError',
+    'LeakedIdError',
+    'RetryPolicy',
+    'NO_RETRY',
+    'RequestTiming',
+    'TimingRecorder',
+    'BASE_URL',
+    'BASE_URL_ENV',
+    'HEADERS',
+    'PROFILER_TOKEN',
+    'TEST_RUN_TOKEN',
+    'MAX_BATCH_IDS',
+    'backoff_delay',
+    'find_mongo_ids',
+    'new_idempotency_key',
+    'new_run_namespace',
+    'percentile',
+    'summarize_latencies',
+]
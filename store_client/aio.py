@@ -0,0 +1,95 @@
+"""
+Asynchronous Store API Client
+httpx.AsyncClient with a shared keep-alive pool and optional HTTP/2
+"""
+
+import asyncio
+import time
+
+from .endpoints import MAX_BATCH_IDS, Endpoints
+from .timing import RequestTiming
+from .transport import ClientCore, require_httpx
+
+
+class AsyncStoreClient(ClientCore, Endpoints):
+    """asyncio counterpart of StoreClient; every endpoint method returns an awaitable
+
+        async with AsyncStoreClient(pool_size=100, http2=True) as client:
+            products, categories = await asyncio.gather(client.products(), client.categories())
+    """
+
+    def __init__(self, base_url=None, *, pool_size=10, http2=False, **options):
+        super().__init__(base_url, **options)
+        httpx = require_httpx(http2=http2)
+        self.pool_size = pool_size
+        self.session = httpx.AsyncClient(http2=http2, headers=self.headers, limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size))
+        self.transport_errors = (httpx.TransportError,)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.session.aclose()
+
+    async def request(self, method, path, *, params=None, json=None, data=None, headers=None, timeout=None,
+                      retry=None, expect='json', route=None):
+        """Send one logical request, retrying per the policy, and report it to the hooks once"""
+        retry = self.retry if retry is None else retry
+        headers = headers or {}
+        send = {'params': params, 'json': json, 'headers': headers, 'timeout': timeout or self.timeout}
+        if data is not None:
+            send['content'] = data
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = await self.session.request(method, self.url(path), **send)
+            except self.transport_errors as error:
+                if retry.retryable(method, headers, attempt):
+                    await asyncio.sleep(retry.delay(attempt))
+                    attempt += 1
+                    continue
+                self._emit(RequestTiming(method, route or path, None, (time.perf_counter() - start) * 1000,
+                                         attempt + 1, type(error).__name__))
+                raise
+            if retry.retryable(method, headers, attempt, response.status_code):
+                await asyncio.sleep(retry.delay(attempt, response.headers.get('Retry-After')))
+                attempt += 1
+                continue
+            break
+
+        self._emit(RequestTiming(method, route or path, response.status_code,
+                                 (time.perf_counter() - start) * 1000, attempt + 1))
+        return self._result(method, path, response, expect)
+
+    async def get(self, path, **kwargs):
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request('POST', path, **kwargs)
+
+    # Batching
+    async def map(self, call, items, concurrency=None):
+        """await call(item) for every item, at most `concurrency` (default: the pool size) at a time, in order"""
+        limit = asyncio.Semaphore(concurrency or self.pool_size)
+
+        async def bounded(item):
+            async with limit:
+                return await call(item)
+
+        return await asyncio.gather(*(bounded(item) for item in items))
+
+    async def lookup_products(self, ids, concurrency=None):
+        """Batch lookup of any number of ids, split into MAX_BATCH_IDS-sized requests sent concurrently"""
+        ids = list(dict.fromkeys(ids))
+        chunks = [ids[index:index + MAX_BATCH_IDS] for index in range(0, len(ids), MAX_BATCH_IDS)]
+        merged = {'products': [], 'missing': []}
+        for batch in await self.map(self.products_by_ids, chunks, concurrency):
+            merged['products'].extend(batch['products'])
+            merged['missing'].extend(batch['missing'])
+        return merged
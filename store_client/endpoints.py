@@ -0,0 +1,202 @@
+"""
+Store API Endpoints
+One method per /api endpoint, shared by the sync and async clients
+
+Each method returns whatever the client's `request` returns: the decoded
+body on StoreClient, an awaitable of it on AsyncStoreClient. `route` names
+the endpoint with its path parameters left as placeholders, so timing hooks
+group /wallet/abc and /wallet/xyz together.
+"""
+
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from .transport import IDEMPOTENCY_HEADER
+from .types import (
+    Category,
+    Changes,
+    Order,
+    OrderPage,
+    Product,
+    ProductBatch,
+    ProductPage,
+    User,
+    WalletBalance,
+    WalletHistory,
+)
+
+# Server limit on /products?ids= (MAX_BATCH_IDS in the API route)
+MAX_BATCH_IDS = 200
+
+
+def new_idempotency_key():
+    return uuid.uuid4().hex
+
+
+def _segment(value):
+    return quote(str(value), safe='')
+
+
+class Endpoints:
+    def request(self, method, path, **kwargs) -> Any:
+        raise NotImplementedError
+
+    # Health
+    def root(self) -> Dict[str, Any]:
+        return self.request('GET', '/')
+
+    # Users
+    def create_user(self, user: User) -> User:
+        return self.request('POST', '/users', json=user)
+
+    def user(self, uid) -> User:
+        return self.request('GET', f"/users/{_segment(uid)}", route='/users/:uid')
+
+    def admin_users(self) -> List[User]:
+        return self.request('GET', '/admin/users')
+
+    # Catalog
+    def products(self) -> List[Product]:
+        return self.request('GET', '/products')
+
+    def products_page(self, cursor='', limit=None, category=None, min_price=None, max_price=None,
+                      sort=None) -> ProductPage:
+        """One page of the catalog; pass the previous page's nextCursor (with the same filters) until it is None
+
+        sort is featured, newest, price-low, price-high or rating (default: insertion order).
+        """
+        params = _params(cursor=cursor, limit=limit, category=category, minPrice=min_price, maxPrice=max_price,
+                         sort=sort)
+        return self.request('GET', '/products', params=params, route='/products?cursor')
+
+    def products_by_ids(self, ids: Iterable[str]) -> ProductBatch:
+        """One batch lookup; see lookup_products for lists longer than MAX_BATCH_IDS"""
+        ids = list(ids)
+        if len(ids) > MAX_BATCH_IDS:
+            raise ValueError(f"at most {MAX_BATCH_IDS} ids per request, got {len(ids)}")
+        return self.request('GET', '/products', params={'ids': ','.join(ids)}, route='/products?ids')
+
+    def search_products(self, query, limit=None) -> List[Product]:
+        return self.request('GET', '/products/search', params=_params(q=query, limit=limit))
+
+    def suggest_products(self, query, limit=None) -> List[Dict[str, Any]]:
+        return self.request('GET', '/products/suggest', params=_params(q=query, limit=limit))
+
+    def categories(self) -> List[Category]:
+        return self.request('GET', '/categories')
+
+    def admin_products(self) -> List[Product]:
+        return self.request('GET', '/admin/products')
+
+    def changes(self, since=None, limit=None) -> Changes:
+        """Products, users and orders changed since a cursor; without one, just the cursor to start from"""
+        return self.request('GET', '/admin/changes', params=_params(since=since, limit=limit))
+
+    def create_product(self, product: Product) -> Product:
+        return self.request('POST', '/admin/products', json=product)
+
+    def delete_product(self, product_id) -> Dict[str, Any]:
+        return self.request('DELETE', f"/admin/products/{_segment(product_id)}", route='/admin/products/:id')
+
+    def ingest_images(self, product_id=None, force=False) -> Dict[str, Any]:
+        """Queue an image ingest job; StoreClient.wait_for_ingest follows it to the end"""
+        params = _params(productId=product_id, force='true' if force else None)
+        return self.request('POST', '/admin/images/ingest', params=params)
+
+    def revalidate_catalog(self) -> Dict[str, Any]:
+        return self.request('POST', '/admin/catalog/revalidate')
+
+    def reindex_search(self, all=False) -> Dict[str, Any]:
+        return self.request('POST', '/admin/search/reindex', params=_params(all='true' if all else None))
+
+    # Orders
+    def create_order(self, order: Order, idempotency_key=None) -> Order:
+        """Keyed, so retries can never place the order twice"""
+        headers = {IDEMPOTENCY_HEADER: idempotency_key or new_idempotency_key()}
+        return self.request('POST', '/orders', json=order, headers=headers)
+
+    def admin_orders(self, status=None, user_id=None, date_from=None, date_to=None, date_field=None,
+                     order=None, limit=None, cursor=None) -> OrderPage:
+        if isinstance(status, (list, tuple)):
+            status = ','.join(status)
+        return self.request('GET', '/admin/orders', params=_params(
+            status=status, userId=user_id, **{'from': date_from, 'to': date_to}, dateField=date_field,
+            order=order, limit=limit, cursor=cursor))
+
+    def order_summary(self) -> Dict[str, Any]:
+        return self.request('GET', '/admin/orders/summary')
+
+    def update_order(self, order_id, update: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request('PUT', f"/admin/orders/{_segment(order_id)}", json=update, route='/admin/orders/:id')
+
+    def refund_order(self, order_id) -> Dict[str, Any]:
+        return self.request('POST', f"/admin/orders/{_segment(order_id)}/refund", route='/admin/orders/:id/refund')
+
+    # Coupons
+    def coupons(self) -> List[Dict[str, Any]]:
+        return self.request('GET', '/coupons')
+
+    def validate_coupon(self, code, user_id, total) -> Dict[str, Any]:
+        return self.request('POST', '/coupons/validate', json={'code': code, 'userId': user_id, 'total': total})
+
+    # Wallet
+    def wallet(self, uid) -> WalletBalance:
+        return self.request('GET', f"/wallet/{_segment(uid)}", route='/wallet/:uid')
+
+    def wallet_history(self, uid, limit=None, before=None) -> WalletHistory:
+        return self.request('GET', f"/wallet/{_segment(uid)}/history", params=_params(limit=limit, before=before),
+                            route='/wallet/:uid/history')
+
+    def recharge_wallet(self, recharge: Dict[str, Any], idempotency_key=None) -> Dict[str, Any]:
+        headers = {IDEMPOTENCY_HEADER: idempotency_key or new_idempotency_key()}
+        return self.request('POST', '/wallet/recharge', json=recharge, headers=headers)
+
+    # Operations
+    def metrics(self) -> Dict[str, Any]:
+        return self.request('GET', '/admin/metrics')
+
+    def jobs(self) -> Dict[str, Any]:
+        return self.request('GET', '/admin/jobs')
+
+    def job(self, job_id) -> Dict[str, Any]:
+        return self.request('GET', f"/admin/jobs/{_segment(job_id)}", route='/admin/jobs/:id')
+
+    def drain_jobs(self, limit=None) -> Dict[str, Any]:
+        return self.request('POST', '/admin/jobs/drain', params=_params(limit=limit))
+
+    def retry_dead_jobs(self) -> Dict[str, Any]:
+        return self.request('POST', '/admin/jobs/retry-dead')
+
+    # Test data namespaces (need the server's TEST_RUN_TOKEN)
+    def test_runs(self) -> List[Dict[str, Any]]:
+        return self.request('GET', '/admin/test-runs', headers=self._test_run_headers())
+
+    def teardown_test_run(self, namespace=None, timeout=600) -> Dict[str, Any]:
+        """Delete everything tagged with `namespace` (default: this client's own run)"""
+        namespace = namespace or self.test_run
+        if not namespace:
+            raise ValueError('no test run namespace given')
+        return self.request('DELETE', f"/admin/test-runs/{_segment(namespace)}", timeout=timeout,
+                            headers=self._test_run_headers(), route='/admin/test-runs/:namespace')
+
+    # Profiler (needs the server's PROFILER_TOKEN)
+    def profile_status(self) -> Dict[str, Any]:
+        return self.request('GET', '/admin/profile', headers=self._profiler_headers())
+
+    def start_profile(self, seconds=30, heap=True, interval_us=None) -> Dict[str, Any]:
+        params = _params(seconds=seconds, heap=str(heap).lower(), intervalUs=interval_us)
+        return self.request('POST', '/admin/profile', params=params, headers=self._profiler_headers())
+
+    def stop_profile(self) -> Dict[str, Any]:
+        return self.request('POST', '/admin/profile/stop', headers=self._profiler_headers())
+
+    def download_profile(self, capture_id, kind, timeout=60) -> bytes:
+        return self.request('GET', f"/admin/profile/{_segment(capture_id)}/{kind}", expect='bytes', timeout=timeout,
+                            headers=self._profiler_headers(), route=f"/admin/profile/:id/{kind}")
+
+
+def _params(**values) -> Optional[Dict[str, Any]]:
+    """Query parameters without the ones left unset"""
+    present = {key: value for key, value in values.items() if value is not None}
+    return present or None
@@ -0,0 +1,125 @@
+"""
+Synchronous Store API Client
+Pooled keep-alive connections over requests, or over httpx when HTTP/2 is wanted
+"""
+
+import concurrent.futures
+import time
+
+import requests
+
+from .endpoints import MAX_BATCH_IDS, Endpoints
+from .timing import RequestTiming
+from .transport import ClientCore, require_httpx
+
+
+class StoreClient(ClientCore, Endpoints):
+    """Thread-safe client for the store API
+
+    `pool_size` is the number of keep-alive connections kept per host; match
+    it to the number of threads sharing the client. Non-2xx responses raise
+    ApiError unless the call passes expect='response'.
+
+        with StoreClient(pool_size=32, hooks=[recorder]) as client:
+            products = client.products()
+    """
+
+    def __init__(self, base_url=None, *, pool_size=10, http2=False, **options):
+        super().__init__(base_url, **options)
+        self.pool_size = pool_size
+        if http2:
+            httpx = require_httpx(http2=True)
+            self.session = httpx.Client(http2=True, headers=self.headers, limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size))
+            self.transport_errors = (httpx.TransportError,)
+            self._body_argument = 'content'
+        else:
+            self.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            self.session.headers.update(self.headers)
+            self.transport_errors = (requests.ConnectionError, requests.Timeout)
+            self._body_argument = 'data'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def request(self, method, path, *, params=None, json=None, data=None, headers=None, timeout=None,
+                retry=None, expect='json', route=None):
+        """Send one logical request, retrying per the policy, and report it to the hooks once"""
+        retry = self.retry if retry is None else retry
+        headers = headers or {}
+        send = {'params': params, 'json': json, 'headers': headers, 'timeout': timeout or self.timeout}
+        if data is not None:
+            send[self._body_argument] = data
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, self.url(path), **send)
+            except self.transport_errors as error:
+                if retry.retryable(method, headers, attempt):
+                    time.sleep(retry.delay(attempt))
+                    attempt += 1
+                    continue
+                self._emit(RequestTiming(method, route or path, None, (time.perf_counter() - start) * 1000,
+                                         attempt + 1, type(error).__name__))
+                raise
+            if retry.retryable(method, headers, attempt, response.status_code):
+                time.sleep(retry.delay(attempt, response.headers.get('Retry-After')))
+                attempt += 1
+                continue
+            break
+
+        self._emit(RequestTiming(method, route or path, response.status_code,
+                                 (time.perf_counter() - start) * 1000, attempt + 1))
+        return self._result(method, path, response, expect)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    # Jobs
+    def wait_for_ingest(self, job_id, timeout=3600, interval=1.0):
+        """Follow an image ingest job and its follow-ups; returns the combined {ingested, failed}"""
+        deadline = time.monotonic() + timeout
+        totals = {'ingested': 0, 'failed': []}
+        while job_id:
+            job = self.job(job_id)
+            if job['status'] == 'dead':
+                raise RuntimeError(f"image ingest job {job_id} failed: {job.get('lastError')}")
+            if job['status'] != 'done':
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"image ingest job {job_id} still {job['status']} after {timeout}s")
+                time.sleep(interval)
+                continue
+            totals['ingested'] += job['result']['ingested']
+            totals['failed'] += job['result']['failed']
+            job_id = job['result'].get('nextJobId')
+        return totals
+
+    # Batching
+    def map(self, call, items, concurrency=None):
+        """call(item) for every item on up to `concurrency` threads (default: the pool size), in order"""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency or self.pool_size) as executor:
+            return list(executor.map(call, items))
+
+    def lookup_products(self, ids, concurrency=None):
+        """Batch lookup of any number of ids, split into MAX_BATCH_IDS-sized requests sent in parallel"""
+        ids = list(dict.fromkeys(ids))
+        chunks = [ids[index:index + MAX_BATCH_IDS] for index in range(0, len(ids), MAX_BATCH_IDS)]
+        merged = {'products': [], 'missing': []}
+        for batch in self.map(self.products_by_ids, chunks, concurrency):
+            merged['products'].extend(batch['products'])
+            merged['missing'].extend(batch['missing'])
+        return merged
@@ -0,0 +1,74 @@
+"""
+Request Timing
+Per-request timing records passed to client hooks, and latency statistics
+"""
+
+import collections
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class RequestTiming:
+    """One logical request as seen by a hook; elapsed_ms covers every retry attempt"""
+    method: str
+    route: str
+    status: Optional[int]
+    elapsed_ms: float
+    attempts: int
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(latencies):
+    """Return a dict of count/p50/p95/p99/max for latencies in milliseconds"""
+    return {
+        'count': len(latencies),
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'max': max(latencies) if latencies else 0.0,
+    }
+
+
+class TimingRecorder:
+    """Timing hook that keeps latencies, statuses and retries per route
+
+    Pass an instance in a client's `hooks`; it is safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = collections.defaultdict(list)
+        self.statuses: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+        self.retries: collections.Counter = collections.Counter()
+
+    def __call__(self, timing: RequestTiming):
+        with self._lock:
+            self.latencies[timing.key].append(timing.elapsed_ms)
+            self.statuses[timing.key][timing.status or timing.error] += 1
+            self.retries[timing.key] += timing.attempts - 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                key: {
+                    **summarize_latencies(latencies),
+                    'statuses': dict(self.statuses[key]),
+                    'retries': self.retries[key],
+                }
+                for key, latencies in sorted(self.latencies.items())
+            }
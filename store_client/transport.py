@@ -0,0 +1,188 @@
+"""
+Store API Transport
+Configuration, errors, the retry policy and the request bookkeeping shared by the sync and async clients
+"""
+
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional
+
+from .timing import RequestTiming
+
+# Configuration - Get from environment
+BASE_URL_ENV = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+BASE_URL = f"{BASE_URL_ENV}/api"
+HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json'
+}
+
+# Token for the server's /admin/profile endpoints (same value as the server's PROFILER_TOKEN)
+PROFILER_TOKEN = os.getenv('PROFILER_TOKEN')
+
+# Token that lets a run tag the data it creates (same value as the server's TEST_RUN_TOKEN)
+TEST_RUN_TOKEN = os.getenv('TEST_RUN_TOKEN')
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+TEST_RUN_HEADER = 'X-Test-Run'
+TEST_RUN_TOKEN_HEADER = 'X-Test-Run-Token'
+TEST_RUN_TTL_HEADER = 'X-Test-Run-TTL'
+# Rate limit a request as this simulated client (honoured only with the test run token)
+TEST_CLIENT_HEADER = 'X-Test-Client'
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+class ApiError(Exception):
+    """Non-2xx response; `body` is the decoded JSON when the server sent any"""
+
+    def __init__(self, method, path, status, body):
+        detail = body.get('error') if isinstance(body, dict) else body
+        super().__init__(f"{method} {path} -> HTTP {status}: {detail}")
+        self.method = method
+        self.path = path
+        self.status = status
+        self.body = body
+
+
+class LeakedIdError(AssertionError):
+    """A response contained MongoDB `_id` fields (raised when the client has check_ids=True)"""
+
+
+def find_mongo_ids(value, path='') -> List[str]:
+    """Paths of every `_id` key in a decoded JSON value"""
+    found = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            child = f"{path}.{key}" if path else key
+            if key == '_id':
+                found.append(child)
+            found.extend(find_mongo_ids(item, child))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            found.extend(find_mongo_ids(item, f"{path}[{index}]"))
+    return found
+
+
+def new_run_namespace(prefix):
+    """A fresh namespace for one run's data, e.g. backend-20250101-120000-1a2b3c"""
+    return f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def backoff_delay(attempt, base=0.1, cap=5.0, retry_after=None):
+    """Full-jitter exponential backoff, honouring a server Retry-After when given"""
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before repeating a request
+
+    GET/PUT/DELETE, and POSTs carrying an Idempotency-Key, are retried on
+    connection errors and on `statuses`. Other POSTs could run twice, so they
+    are only retried on 429, which the admission layer returns before the
+    handler runs. A 409 on a keyed request means the first attempt is still in
+    progress, so it is retried too.
+    """
+    retries: int = 3
+    base: float = 0.1
+    cap: float = 5.0
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def retryable(self, method, headers, attempt, status=None) -> bool:
+        if attempt >= self.retries:
+            return False
+        keyed = IDEMPOTENCY_HEADER in headers
+        repeatable = method in SAFE_METHODS or keyed
+        if status is None:
+            return repeatable
+        if status == 409:
+            return keyed
+        return status in self.statuses and (repeatable or status == 429)
+
+    def delay(self, attempt, retry_after=None) -> float:
+        return backoff_delay(attempt, self.base, self.cap, retry_after)
+
+
+NO_RETRY = RetryPolicy(retries=0)
+
+
+def require_httpx(http2=False):
+    """httpx is only needed for the async client and HTTP/2; import it on first use"""
+    try:
+        import httpx
+    except ImportError as error:
+        raise ImportError('the async and HTTP/2 clients need httpx: pip install "httpx[http2]"') from error
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError as error:
+            raise ImportError('HTTP/2 needs the h2 package: pip install "httpx[http2]"') from error
+    return httpx
+
+
+class ClientCore:
+    """Configuration and response handling common to StoreClient and AsyncStoreClient"""
+
+    def __init__(self, base_url=None, *, timeout=10, retry: Optional[RetryPolicy] = None,
+                 headers=None, hooks: Iterable[Callable[[RequestTiming], Any]] = (),
+                 check_ids=False, profiler_token=PROFILER_TOKEN, test_run=None, test_run_ttl=None,
+                 test_run_token=TEST_RUN_TOKEN):
+        self.base_url = (base_url or BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.retry = RetryPolicy() if retry is None else retry
+        self.headers = {**HEADERS, **(headers or {})}
+        self.hooks = list(hooks)
+        self.check_ids = check_ids
+        self.profiler_token = profiler_token
+        self.test_run = test_run
+        self.test_run_token = test_run_token
+        if test_run:
+            # Everything this client creates is tagged, expires, and can be torn down together
+            self.headers.update(self._test_run_headers())
+            self.headers[TEST_RUN_HEADER] = test_run
+            if test_run_ttl:
+                self.headers[TEST_RUN_TTL_HEADER] = str(int(test_run_ttl))
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def _emit(self, timing: RequestTiming):
+        for hook in self.hooks:
+            hook(timing)
+
+    def _result(self, method, path, response, expect):
+        """Decode a final response: 'json' (default), 'bytes', or 'response' (returned as-is, never raises)"""
+        if expect == 'response':
+            return response
+        if response.status_code >= 400:
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text[:500]
+            raise ApiError(method, path, response.status_code, body)
+        if expect == 'bytes':
+            return response.content
+        body = response.json()
+        if self.check_ids:
+            leaked = find_mongo_ids(body)
+            if leaked:
+                raise LeakedIdError(f"{method} {path} returned _id at {', '.join(leaked[:5])}")
+        return body
+
+    def _test_run_headers(self):
+        if not self.test_run_token:
+            raise RuntimeError('set TEST_RUN_TOKEN to the server\'s test run token')
+        return {TEST_RUN_TOKEN_HEADER: self.test_run_token}
+
+    def _profiler_headers(self):
+        if not self.profiler_token:
+            raise RuntimeError('set PROFILER_TOKEN to the server\'s profiler token')
+        return {'Authorization': f"Bearer {self.profiler_token}"}
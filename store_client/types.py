@@ -0,0 +1,115 @@
+"""
+Store API Types
+Shapes of the main request and response bodies; fields the server may omit are optional
+"""
+
+from typing import Any, Dict, List, Optional, TypedDict
+
+
+class Product(TypedDict, total=False):
+    id: str
+    name: str
+    nameEn: str
+    description: str
+    price: float
+    originalPrice: float
+    discount: float
+    category: str
+    categoryAr: str
+    image: str
+    images: List[str]
+    stock: int
+    rating: float
+    reviews: int
+    featured: bool
+    active: bool
+    specifications: Dict[str, str]
+
+
+class ProductPage(TypedDict):
+    products: List[Product]
+    nextCursor: Optional[str]
+
+
+class BatchProduct(Product, total=False):
+    available: bool
+
+
+class ProductBatch(TypedDict):
+    products: List[BatchProduct]
+    missing: List[str]
+
+
+class Category(TypedDict, total=False):
+    id: str
+    name: str
+    nameEn: str
+    slug: str
+    active: bool
+
+
+class User(TypedDict, total=False):
+    id: str
+    uid: str
+    email: str
+    name: str
+    phone: str
+    role: str
+    walletBalance: float
+    address: Dict[str, str]
+
+
+class OrderItem(TypedDict, total=False):
+    productId: str
+    id: str
+    name: str
+    price: float
+    quantity: int
+
+
+class Order(TypedDict, total=False):
+    id: str
+    orderNumber: str
+    userId: str
+    items: List[OrderItem]
+    total: float
+    paymentMethod: str
+    status: str
+    paymentStatus: str
+    customerInfo: Dict[str, Any]
+
+
+class OrderPage(TypedDict):
+    orders: List[Order]
+    nextCursor: Optional[str]
+
+
+class Changes(TypedDict, total=False):
+    cursor: str
+    resync: bool
+    products: List[Product]
+    users: List[User]
+    orders: List[Order]
+    deleted: Dict[str, List[str]]
+
+
+class WalletBalance(TypedDict):
+    userId: str
+    balance: float
+    seq: int
+    updatedAt: str
+
+
+class LedgerEntry(TypedDict, total=False):
+    userId: str
+    seq: int
+    type: str
+    amount: float
+    balanceAfter: float
+    referenceId: str
+    createdAt: str
+
+
+class WalletHistory(TypedDict):
+    entries: List[LedgerEntry]
+    nextBefore: Optional[int]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Data Namespaces
+Lists and tears down the data test runs tagged with a namespace (see lib/testRuns.js)
+
+    python test_data.py list
+    python test_data.py teardown backend-20250101-120000-1a2b3c
+    python test_data.py teardown --prefix load-        # every load test run
+    python test_data.py teardown --prefix '' --mongo   # everything tagged, straight in MongoDB
+
+Tagged documents also expire on their own through TTL indexes; teardown
+removes a run at once instead of waiting for the TTL monitor.
+"""
+
+import argparse
+import functools
+import time
+
+from store_client import BASE_URL, StoreClient
+
+# Mirrors TEST_RUN_COLLECTIONS in lib/testRuns.js, children before the users and products they refer to
+TEST_RUN_COLLECTIONS = [
+    'orders',
+    'stock_reservations',
+    'notifications',
+    'wallet_transactions',
+    'wallet_ledger',
+    'users',
+    'products',
+]
+
+
+def ensure_test_run_indexes(database):
+    """Same partial indexes the API creates, for data loaded before the server has started"""
+    tagged = {'testRun': {'$exists': True}}
+    for name in TEST_RUN_COLLECTIONS:
+        database[name].create_index('testRun', partialFilterExpression=tagged)
+        database[name].create_index('expiresAt', expireAfterSeconds=0, partialFilterExpression=tagged)
+
+
+def mongo_database():
+    from pymongo import MongoClient
+    from generate_test_data import DB_NAME, MONGO_URL
+
+    return MongoClient(MONGO_URL)[DB_NAME]
+
+
+def list_runs_mongo(database):
+    runs = {}
+    for name in TEST_RUN_COLLECTIONS:
+        for group in database[name].aggregate([
+            {'$match': {'testRun': {'$exists': True}}},
+            {'$group': {'_id': '$testRun', 'count': {'$sum': 1}, 'expiresAt': {'$max': '$expiresAt'}}},
+        ]):
+            run = runs.setdefault(group['_id'], {'namespace': group['_id'], 'expiresAt': None, 'documents': {}})
+            run['documents'][name] = group['count']
+            if run['expiresAt'] is None or group['expiresAt'] > run['expiresAt']:
+                run['expiresAt'] = group['expiresAt']
+    return [runs[namespace] for namespace in sorted(runs)]
+
+
+def teardown_mongo(database, namespace):
+    deleted = {name: database[name].delete_many({'testRun': namespace}).deleted_count
+               for name in TEST_RUN_COLLECTIONS}
+    return {'namespace': namespace, 'deleted': deleted, 'total': sum(deleted.values())}
+
+
+def print_runs(runs):
+    if not runs:
+        print("   no tagged test data")
+    for run in runs:
+        total = sum(run['documents'].values())
+        print(f"   {run['namespace']:<48} {total:>10,} docs  expires {run['expiresAt']}")
+        print(f"      {', '.join(f'{name}={count:,}' for name, count in run['documents'].items())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List and tear down namespaced test data')
+    parser.add_argument('--mongo', action='store_true',
+                        help='work on MongoDB directly (MONGO_URL/DB_NAME) instead of through the API')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help='namespaces with their document counts')
+    teardown = subparsers.add_parser('teardown', help='delete every document of the given namespaces')
+    teardown.add_argument('namespaces', nargs='*')
+    teardown.add_argument('--prefix', help='tear down every namespace starting with this prefix')
+    args = parser.parse_args()
+
+    print("🧹 TEST DATA NAMESPACES")
+    print(f"🔗 {'MongoDB' if args.mongo else f'API Base URL: {BASE_URL}'}")
+
+    if args.mongo:
+        database = mongo_database()
+        list_runs = functools.partial(list_runs_mongo, database)
+        teardown_run = functools.partial(teardown_mongo, database)
+    else:
+        client = StoreClient(timeout=60)
+        list_runs = client.test_runs
+        teardown_run = client.teardown_test_run
+
+    if args.command == 'list':
+        print_runs(list_runs())
+        return True
+
+    namespaces = list(args.namespaces)
+    if args.prefix is not None:
+        namespaces += [run['namespace'] for run in list_runs() if run['namespace'].startswith(args.prefix)]
+    if not namespaces:
+        print("   nothing to tear down")
+        return True
+
+    for namespace in dict.fromkeys(namespaces):
+        start = time.perf_counter()
+        result = teardown_run(namespace)
+        print(f"   ✅ {namespace}: {result['total']:,} documents deleted in {time.perf_counter() - start:.1f}s")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,121 @@
+"""
+Fixtures for the API test suite
+
+The server is resolved once per session, in the process that runs the
+session: with pytest-xdist (`pytest -n auto`) that is the controller, which
+hands the URL and test run token to every worker. Either the app named by
+--api-url / NEXT_PUBLIC_BASE_URL is used, or one is started locally and
+stopped when the session ends.
+
+Every worker tags its data with its own namespace (pytest-gw0-..., or
+pytest-main-... without xdist), so parallel workers never see each other's
+users and orders, and each worker tears its namespace down at the end
+(KEEP_TEST_DATA=1 keeps it).
+"""
+
+import os
+import uuid
+
+import pytest
+
+from store_client import NO_RETRY, TEST_RUN_TOKEN, StoreClient, new_run_namespace
+from tests.local_server import LocalServer, RemoteDatabaseError, ServerStartError, ServerUnavailable
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('store', 'store API')
+    group.addoption('--api-url', default=os.getenv('NEXT_PUBLIC_BASE_URL'),
+                    help='test a running app at this URL instead of starting one (default: $NEXT_PUBLIC_BASE_URL)')
+    group.addoption('--server-command',
+                    help='command that starts the app, with {port} for the port (default: next start/dev)')
+    group.addoption('--server-timeout', type=float, default=180,
+                    help='seconds to wait for the local server to answer')
+    group.addoption('--mongo-url',
+                    help='MongoDB for the local server (default: $TEST_MONGO_URL or the replica set from local_replica_set.py)')
+    group.addoption('--allow-remote-db', action='store_true',
+                    help='let the local server use a MongoDB that is not on this machine')
+
+
+def resolve_api(config):
+    """Where the suite sends its requests: {'base_url', 'test_run_token'}, or why it cannot run"""
+    if config.option.api_url:
+        return {'base_url': config.option.api_url.rstrip('/'), 'test_run_token': TEST_RUN_TOKEN}, None
+    if config.option.collectonly:
+        return {'skip': 'collection only'}, None
+    try:
+        server = LocalServer(config.option.server_command, mongo_url=config.option.mongo_url,
+                             allow_remote_db=config.option.allow_remote_db).start(config.option.server_timeout)
+    except ServerUnavailable as error:
+        return {'skip': f"no API to test: {error}"}, None
+    except RemoteDatabaseError as error:
+        return {'error': str(error)}, None
+    except ServerStartError as error:
+        return {'error': f"local API server did not start: {error}"}, None
+    return {'base_url': server.base_url, 'test_run_token': server.test_run_token}, server
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    if hasattr(config, 'workerinput'):
+        config.store_api = config.workerinput['store_api']
+        return
+    config.store_api, config.store_server = resolve_api(config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """xdist: pass the controller's server to each worker"""
+    node.workerinput['store_api'] = node.config.store_api
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    server = getattr(session.config, 'store_server', None)
+    if server:
+        server.stop()
+
+
+@pytest.fixture(scope='session')
+def store_api(pytestconfig):
+    api = pytestconfig.store_api
+    if 'skip' in api:
+        pytest.skip(api['skip'])
+    if 'error' in api:
+        pytest.fail(api['error'], pytrace=False)
+    return api
+
+
+@pytest.fixture(scope='session')
+def worker_namespace(pytestconfig):
+    worker = getattr(pytestconfig, 'workerinput', {}).get('workerid', 'main')
+    return new_run_namespace(f"pytest-{worker}")
+
+
+@pytest.fixture(scope='session')
+def client(store_api, worker_namespace):
+    """This worker's client; no retries, so flaky responses fail the test instead of being hidden"""
+    token = store_api['test_run_token']
+    with StoreClient(f"{store_api['base_url']}/api", retry=NO_RETRY, check_ids=True,
+                     test_run=worker_namespace if token else None, test_run_token=token) as client:
+        yield client
+        if token and not os.getenv('KEEP_TEST_DATA'):
+            client.teardown_test_run()
+
+
+@pytest.fixture
+def new_user(client, worker_namespace):
+    """Create a user whose uid carries the worker namespace, so uids never collide across workers"""
+    def create(**fields):
+        uid = f"{worker_namespace}-{uuid.uuid4().hex[:8]}"
+        user = {
+            'uid': uid,
+            'email': f"{uid}@example.com",
+            'name': 'أحمد محمد',
+            'nameEn': 'Ahmed Mohammed',
+            'phone': '+966501234567',
+            'address': {'street': 'شارع الملك فهد', 'city': 'الرياض', 'country': 'السعودية'},
+            **fields,
+        }
+        return client.create_user(user)
+
+    return create
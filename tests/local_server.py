@@ -0,0 +1,133 @@
+"""
+Local API Server
+Starts the Next.js app on a free port for the pytest suite and stops it afterwards
+
+The server gets its own TEST_RUN_TOKEN, so every worker can tag the data it
+creates and tear its namespace down at the end of the session. It never uses
+the MONGO_URL from .env: it talks to a local replica set (TEST_MONGO_URL, by
+default the one local_replica_set.py starts, since orders and the wallet use
+transactions) and
+refuses any other host unless allow_remote_db is set. Admission limits are
+raised so parallel workers are not rate limited as one client.
+"""
+
+import os
+import secrets
+import shlex
+import signal
+import socket
+import subprocess
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEXT_BIN = os.path.join(ROOT, 'node_modules', '.bin', 'next')
+
+DEFAULT_MONGO_URL = 'mongodb://localhost:27017/?replicaSet=rs0'
+DEFAULT_DB_NAME = 'mystoreapp_test'
+LOCAL_HOSTS = frozenset({'localhost', '127.0.0.1', '::1'})
+
+# Environment variables can still override these
+TEST_ADMISSION_LIMITS = {
+    'ADMISSION_CATALOG': 'rate:10000,burst:10000,queue:1024,queueTimeoutMs:30000',
+    'ADMISSION_CHECKOUT': 'rate:10000,burst:10000,queue:1024,queueTimeoutMs:30000',
+    'ADMISSION_ADMIN': 'rate:10000,burst:10000,queue:1024,queueTimeoutMs:60000',
+}
+
+
+class ServerUnavailable(Exception):
+    """This machine cannot run the app (no node_modules), so the suite has nothing to test against"""
+
+
+class ServerStartError(Exception):
+    """The server was started but did not come up"""
+
+
+class RemoteDatabaseError(Exception):
+    """The server would write test data to a database that is not on this machine"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def default_command():
+    """`next start` when there is a production build, `next dev` otherwise ({port} is filled in)"""
+    if not os.path.exists(NEXT_BIN):
+        raise ServerUnavailable('node_modules is missing; run `yarn install` or pass --api-url')
+    mode = 'start' if os.path.exists(os.path.join(ROOT, '.next', 'BUILD_ID')) else 'dev'
+    return f"{NEXT_BIN} {mode} --hostname 127.0.0.1 --port {{port}}"
+
+
+def is_local_mongo_url(url):
+    """True when every host in a mongodb:// URL is this machine (mongodb+srv never is)"""
+    parts = urlsplit(url)
+    if parts.scheme != 'mongodb':
+        return False
+    for host in parts.netloc.rpartition('@')[2].split(','):
+        name = host[1:host.find(']')] if host.startswith('[') else host.split(':')[0]
+        if name not in LOCAL_HOSTS:
+            return False
+    return True
+
+
+class LocalServer:
+    def __init__(self, command=None, port=None, test_run_token=None, mongo_url=None, db_name=None,
+                 allow_remote_db=False):
+        self.port = port or free_port()
+        self.command = (command or default_command()).format(port=self.port)
+        self.mongo_url = mongo_url or os.getenv('TEST_MONGO_URL') or DEFAULT_MONGO_URL
+        if not allow_remote_db and not is_local_mongo_url(self.mongo_url):
+            raise RemoteDatabaseError(f"refusing to write test data to {urlsplit(self.mongo_url).hostname}; "
+                                      'point TEST_MONGO_URL at a local replica set or pass --allow-remote-db')
+        self.db_name = db_name or os.getenv('TEST_DB_NAME') or DEFAULT_DB_NAME
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.test_run_token = test_run_token or os.getenv('TEST_RUN_TOKEN') or secrets.token_hex(16)
+        self.process = None
+        self.log = None
+
+    def start(self, timeout=180):
+        """Launch the server and wait until GET /api/ answers 200"""
+        self.log = tempfile.NamedTemporaryFile(prefix='store-server-', suffix='.log', delete=False)
+        # Set here, these win over .env, which holds the production MONGO_URL
+        env = {**TEST_ADMISSION_LIMITS, **os.environ, 'PORT': str(self.port), 'TEST_RUN_TOKEN': self.test_run_token,
+               'MONGO_URL': self.mongo_url, 'DB_NAME': self.db_name}
+        self.process = subprocess.Popen(shlex.split(self.command), cwd=ROOT, env=env, stdout=self.log,
+                                        stderr=subprocess.STDOUT, start_new_session=True)
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise ServerStartError(f"`{self.command}` exited with {self.process.returncode}\n{self.log_tail()}")
+            try:
+                # `next dev` compiles the route on the first request, which can take a while
+                if requests.get(f"{self.base_url}/api/", timeout=60).status_code == 200:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise ServerStartError(f"`{self.command}` was not ready after {timeout:.0f}s\n{self.log_tail()}")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            # The whole process group, so `next` takes its workers down with it
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        if self.log:
+            self.log.close()
+
+    def log_tail(self, lines=30):
+        self.log.flush()
+        with open(self.log.name, encoding='utf-8', errors='replace') as log:
+            tail = log.read().splitlines()[-lines:]
+        return f"--- last lines of {self.log.name} ---\n" + '\n'.join(tail)
@@ -0,0 +1,120 @@
+"""API checks ported from backend_test.py; the client fails any response carrying a MongoDB _id"""
+
+import uuid
+
+import pytest
+
+ORDER_TOTAL = 900000
+SIGNUP_BALANCE = 2000
+RECHARGE_AMOUNT = 500000
+
+
+def missing(document, fields):
+    return [field for field in fields if field not in document]
+
+
+def wallet_order(uid):
+    return {
+        'userId': uid,
+        'items': [
+            {'productId': 'test_product_1', 'name': 'آيفون 15 برو', 'price': 850000, 'quantity': 1},
+            {'productId': 'test_product_2', 'name': 'قميص قطني أنيق', 'price': 25000, 'quantity': 2},
+        ],
+        'total': ORDER_TOTAL,
+        'paymentMethod': 'wallet',
+        'customerInfo': {'name': 'أحمد محمد', 'phone': '+966501234567', 'notes': 'يرجى التوصيل في المساء'},
+    }
+
+
+def qr_recharge(uid):
+    return {'userId': uid, 'amount': RECHARGE_AMOUNT, 'method': 'qr_code', 'reference': f"QR_{uuid.uuid4().hex[:8]}"}
+
+
+@pytest.fixture
+def user(new_user):
+    return new_user()
+
+
+def test_api_root(client):
+    assert 'E-commerce API is running' in client.root().get('message', '')
+
+
+def test_products(client):
+    products = client.products()
+    assert isinstance(products, list) and products
+    product = products[0]
+    assert not missing(product, ['id', 'name', 'nameEn', 'price', 'category', 'categoryAr', 'rating', 'stock'])
+
+
+def test_product_pages_are_filtered_and_sorted(client):
+    products, cursor = [], ''
+    while cursor is not None:
+        page = client.products_page(cursor, limit=3, category='electronics', min_price=1, sort='price-low')
+        products += page['products']
+        cursor = page['nextCursor']
+    assert products
+    assert all(product['category'] == 'electronics' and product['price'] >= 1 for product in products)
+    prices = [product['price'] for product in products]
+    assert prices == sorted(prices)
+    assert len({product['id'] for product in products}) == len(products)
+
+
+def test_categories(client):
+    categories = client.categories()
+    assert isinstance(categories, list) and categories
+    assert not missing(categories[0], ['id', 'name', 'nameEn', 'slug', 'active'])
+
+
+def test_create_user(user):
+    assert not missing(user, ['id', 'uid', 'email', 'name', 'walletBalance', 'createdAt'])
+    assert user['walletBalance'] == SIGNUP_BALANCE
+
+
+def test_get_user(client, user):
+    fetched = client.user(user['uid'])
+    assert not missing(fetched, ['id', 'uid', 'email', 'name', 'walletBalance'])
+    assert fetched['uid'] == user['uid']
+
+
+def test_create_wallet_order(client, user):
+    order = client.create_order(wallet_order(user['uid']))
+    assert not missing(order, ['id', 'orderNumber', 'status', 'paymentStatus', 'total', 'items', 'userId'])
+    assert order['total'] == ORDER_TOTAL
+    assert order['paymentMethod'] == 'wallet'
+    assert order['userId'] == user['uid']
+
+
+def test_qr_recharge_completes(client, user):
+    transaction = client.recharge_wallet(qr_recharge(user['uid']))
+    assert not missing(transaction, ['id', 'type', 'method', 'amount', 'status', 'userId'])
+    assert transaction['amount'] == RECHARGE_AMOUNT
+    assert transaction['method'] == 'qr_code'
+    assert transaction['status'] == 'completed'
+
+
+def test_wallet_balance_after_order_and_recharge(client, user):
+    client.create_order(wallet_order(user['uid']))
+    client.recharge_wallet(qr_recharge(user['uid']))
+    assert client.user(user['uid'])['walletBalance'] == SIGNUP_BALANCE - ORDER_TOTAL + RECHARGE_AMOUNT
+
+
+def test_signup_cannot_choose_a_wallet_balance(client, new_user):
+    user = new_user(walletBalance=10 ** 12)
+    assert user['walletBalance'] == SIGNUP_BALANCE
+    assert client.wallet(user['uid'])['balance'] == SIGNUP_BALANCE
+
+
+def test_changes_report_writes_and_deletes(client, worker_namespace):
+    cursor = client.changes()['cursor']
+    product = client.create_product({'name': f"منتج {worker_namespace}", 'price': 1000, 'category': 'electronics'})
+    changes = client.changes(since=cursor)
+    if changes['resync']:
+        pytest.skip("another worker's teardown forced a full resync")
+    assert product['id'] in [changed['id'] for changed in changes['products']]
+
+    client.delete_product(product['id'])
+    changes = client.changes(since=changes['cursor'])
+    if changes['resync']:
+        pytest.skip("another worker's teardown forced a full resync")
+    assert product['id'] in changes['deleted']['products']
+    assert product['id'] not in [changed['id'] for changed in changes['products']]
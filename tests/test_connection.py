@@ -0,0 +1,53 @@
+"""Connection checks ported from mongodb_connection_test.py
+
+The fault-injection scenarios stay in that script: they need the server's
+MONGO_URL pointed at fault_proxy.py, which would break every other test
+sharing the server.
+"""
+
+import time
+
+import pytest
+
+UNDEFINED_DB_ERROR = 'Cannot read properties of undefined'
+
+
+def get(client, endpoint):
+    return client.request('GET', f"/{endpoint}", expect='response')
+
+
+def failures(responses):
+    return [(response.url, response.status_code, response.text[:200])
+            for response in responses if response.status_code != 200]
+
+
+def test_concurrent_requests(client):
+    """Race conditions in connection setup show up as failures when requests overlap"""
+    endpoints = ['products', 'categories'] * 10
+    responses = client.map(lambda endpoint: get(client, endpoint), endpoints, concurrency=10)
+    assert not failures(responses)
+
+
+def test_rapid_sequential_requests(client):
+    responses = []
+    for endpoint in ['products', 'categories'] * 10:
+        responses.append(get(client, endpoint))
+        time.sleep(0.1)
+    assert not failures(responses)
+
+
+def test_no_undefined_database_errors(client):
+    responses = [get(client, 'products') for _ in range(20)]
+    assert not [response.text for response in responses if UNDEFINED_DB_ERROR in response.text]
+    assert not failures(responses)
+
+
+@pytest.mark.slow
+def test_connection_stability(client):
+    """Alternating reads every 2s for 30s"""
+    responses = []
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        responses.append(get(client, 'products' if len(responses) % 2 == 0 else 'categories'))
+        time.sleep(2)
+    assert not failures(responses)
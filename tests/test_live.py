@@ -0,0 +1,84 @@
+"""Live update stream checks; run with LIVE_UPDATES_MODE=poll to cover the polling feed instead of change streams"""
+
+import json
+import queue
+import threading
+import time
+
+import pytest
+import requests
+
+
+class LiveStream:
+    """Reads an SSE stream on a background thread and queues its order events"""
+
+    def __init__(self, client, path):
+        self.response = requests.get(client.url(path), headers={**client.headers, 'Accept': 'text/event-stream'},
+                                     stream=True, timeout=(10, 60))
+        self.response.raise_for_status()
+        self.ready = threading.Event()
+        self.orders = queue.Queue()
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def read(self):
+        event = None
+        try:
+            for line in self.response.iter_lines(decode_unicode=True):
+                if line.startswith('event: '):
+                    event = line[len('event: '):]
+                elif line.startswith('data: ') and event == 'ready':
+                    self.ready.set()
+                elif line.startswith('data: ') and event == 'order':
+                    self.orders.put(json.loads(line[len('data: '):]))
+                elif not line:
+                    event = None
+        except Exception:
+            pass  # closed by the fixture
+
+    def next_order(self, order_id, timeout=15, **fields):
+        """The next event for `order_id` whose fields match"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                event = self.orders.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                pytest.fail(f"no order event for {order_id} with {fields} within {timeout}s")
+            if event['id'] == order_id and all(event.get(key) == value for key, value in fields.items()):
+                return event
+
+    def close(self):
+        self.response.close()
+
+
+@pytest.fixture
+def admin_live(client):
+    stream = LiveStream(client, '/admin/live')
+    assert stream.ready.wait(30), 'no ready event from /admin/live'
+    yield stream
+    stream.close()
+
+
+def whatsapp_order(uid):
+    return {
+        'userId': uid,
+        'items': [{'productId': 'live_test_product', 'name': 'منتج اختبار', 'price': 1, 'quantity': 1}],
+        'total': 1,
+        'paymentMethod': 'whatsapp',
+    }
+
+
+def test_new_orders_are_published_as_inserts(client, new_user, admin_live):
+    order = client.create_order(whatsapp_order(new_user()['uid']))
+
+    event = admin_live.next_order(order['id'])
+    assert event['operation'] == 'insert'
+    assert event['orderNumber'] == order['orderNumber']
+
+
+def test_status_changes_are_published_as_updates(client, new_user, admin_live):
+    order = client.create_order(whatsapp_order(new_user()['uid']))
+    admin_live.next_order(order['id'], operation='insert')
+
+    client.update_order(order['id'], {'status': 'confirmed'})
+    event = admin_live.next_order(order['id'], status='confirmed')
+    assert event['operation'] == 'update'
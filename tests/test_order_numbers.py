@@ -0,0 +1,67 @@
+"""Order number allocation in lib/orderNumbers.js, run under Node against an in-memory counter"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hands out numbers from a counter starting at argv[2] until the module refuses
+ALLOCATE = """
+import { OrderNumberError, nextOrderNumber } from './orderNumbers.mjs'
+
+let value = Number(process.argv[2])
+const database = {
+  collection: () => ({
+    findOneAndUpdate: async (filter, update) => ({ value: value += update.$inc.value })
+  })
+}
+const numbers = []
+let error = null
+try {
+  while (numbers.length < 1000) {
+    numbers.push((await nextOrderNumber(database, new Date('2026-10-19T12:00:00Z'))).orderNumber)
+  }
+} catch (caught) {
+  error = { orderNumberError: caught instanceof OrderNumberError, status: caught.status, message: caught.message }
+}
+console.log(JSON.stringify({ numbers, error }))
+"""
+
+
+@pytest.fixture
+def allocate(tmp_path):
+    node = shutil.which('node')
+    if not node:
+        pytest.skip('node is not installed')
+    # .mjs so Node loads the module as ESM without a package.json "type"
+    shutil.copy(os.path.join(ROOT, 'lib', 'orderNumbers.js'), tmp_path / 'orderNumbers.mjs')
+    (tmp_path / 'allocate.mjs').write_text(ALLOCATE, encoding='utf-8')
+
+    def run(counter):
+        result = subprocess.run([node, 'allocate.mjs', str(counter)], cwd=tmp_path,
+                                env={**os.environ, 'ORDER_NUMBER_BLOCK': '20'},
+                                capture_output=True, text=True, timeout=30, check=True)
+        return json.loads(result.stdout)
+    return run
+
+
+def test_numbers_follow_the_counter(allocate):
+    result = allocate(0)
+    assert result['error'] is None
+    assert result['numbers'][:2] == ['ORD-261019-000001', 'ORD-261019-000002']
+    assert len(set(result['numbers'])) == len(result['numbers'])
+
+
+def test_sequence_overflow_fails_instead_of_widening(allocate):
+    result = allocate(999960)
+    assert result['numbers'][0] == 'ORD-261019-999961'
+    assert result['numbers'][-1] == 'ORD-261019-999999'
+    assert result['error'] == {
+        'orderNumberError': True,
+        'status': 503,
+        'message': 'Order numbers for 261019 are used up (more than 999999 orders)',
+    }
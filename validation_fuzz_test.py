@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Request Validation Fuzz Test
+Fuzzes the validated POST endpoints (/users, /admin/products, /orders) with malformed bodies, measures
+validation overhead, and checks that oversized bodies are rejected without the server buffering them
+
+Every fuzz case is invalid by construction (at least one breaking mutation plus random noise), so
+any 2xx is a hole in a schema and any 5xx is a crash.
+"""
+
+import argparse
+import concurrent.futures
+import copy
+import itertools
+import json
+import random
+import time
+import uuid
+
+from load_tools import BASE_URL, make_client, simulated_client_headers, summarize_latencies
+
+# Mirrors BODY_LIMITS in lib/validation.js
+BODY_LIMITS = {
+    '/users': 8 * 1024,
+    '/admin/products': 32 * 1024,
+    '/orders': 256 * 1024,
+}
+OVERSIZE_FACTORS = (1.01, 10, 100)
+STREAMED_BYTES = 16 * 1024 * 1024
+
+client_ids = itertools.count()
+
+
+def client_headers():
+    """Each request poses as its own client so the admission rate limits stay out of the numbers"""
+    n = next(client_ids)
+    return simulated_client_headers(f"fuzz-{n}")
+
+
+def valid_payloads(rng):
+    product = {
+        'name': 'منتج اختبار التحقق',
+        'nameEn': 'Validation probe',
+        'description': 'وصف ' * 200,
+        'price': 120,
+        'originalPrice': 150,
+        'category': 'electronics',
+        'categoryAr': 'الإلكترونيات',
+        'image': 'https://example.com/probe.jpg',
+        'stock': 5,
+        'specifications': {f"spec{i}": f"value {i}" for i in range(20)},
+    }
+    item = {'productId': 'probe', 'name': 'منتج اختبار', 'price': 10, 'quantity': 1, **product}
+    return {
+        '/users': {
+            'uid': f"fuzz_{uuid.uuid4().hex[:12]}",
+            'email': 'fuzz@example.com',
+            'name': 'مستخدم اختبار',
+            'phone': '+963900000000',
+            'address': {'street': 'شارع', 'city': 'دمشق'},
+        },
+        '/admin/products': product,
+        '/orders': {
+            'userId': 'fuzz_user',
+            'items': [dict(item, productId=f"probe_{i}") for i in range(rng.randint(1, 20))],
+            'total': 10,
+            'paymentMethod': 'whatsapp',
+            'customerInfo': {'name': 'مستخدم', 'phone': '+963900000000'},
+        },
+    }
+
+
+# Required field and its maximum length, per endpoint
+REQUIRED = {'/users': ('uid', 128), '/admin/products': ('name', 200), '/orders': ('userId', 128)}
+
+
+def deep(depth):
+    value = 'x'
+    for _ in range(depth):
+        value = {'a': value}
+    return value
+
+
+def breaking_mutations(path):
+    field, max_length = REQUIRED[path]
+    mutations = [
+        ('missing required field', lambda body: body.pop(field)),
+        ('required field is a number', lambda body: body.__setitem__(field, 12345)),
+        ('required field is null', lambda body: body.__setitem__(field, None)),
+        ('required field is an object', lambda body: body.__setitem__(field, {'$gt': ''})),
+        ('required field too long', lambda body: body.__setitem__(field, 'x' * (max_length + 1))),
+        ('required field empty', lambda body: body.__setitem__(field, '   ')),
+    ]
+    if path == '/users':
+        mutations += [
+            ('invalid email', lambda body: body.__setitem__('email', 'not-an-email')),
+            ('admin role', lambda body: body.__setitem__('role', 'admin')),
+            ('deeply nested address', lambda body: body.__setitem__('address', deep(500))),
+        ]
+    elif path == '/admin/products':
+        mutations += [
+            ('negative price', lambda body: body.__setitem__('price', -1)),
+            ('price as string', lambda body: body.__setitem__('price', '100')),
+            ('fractional stock', lambda body: body.__setitem__('stock', 1.5)),
+            ('too many images', lambda body: body.__setitem__('images', ['https://example.com/i.jpg'] * 21)),
+            ('nested specifications', lambda body: body.__setitem__('specifications', {'a': deep(200)})),
+            ('too many specifications', lambda body: body.__setitem__(
+                'specifications', {f"k{i}": 'v' for i in range(51)})),
+        ]
+    else:
+        mutations += [
+            ('no items', lambda body: body.__setitem__('items', [])),
+            ('zero quantity', lambda body: body['items'][0].__setitem__('quantity', 0)),
+            ('item without id', lambda body: body['items'][0].pop('productId')),
+            ('too many items', lambda body: body.__setitem__('items', body['items'][:1] * 101)),
+            ('unknown payment method', lambda body: body.__setitem__('paymentMethod', 'bitcoin')),
+            ('total as string', lambda body: body.__setitem__('total', '10')),
+        ]
+    return mutations
+
+
+RAW_BODIES = [
+    ('truncated JSON', lambda text: text[:len(text) // 2]),
+    ('trailing garbage', lambda text: text + '}}'),
+    ('NaN literal', lambda text: text.replace('"price": 10', '"price": NaN', 1) if '"price": 10' in text else 'NaN'),
+    ('array body', lambda text: '[' + text + ']'),
+    ('string body', lambda text: json.dumps(text)),
+    ('null body', lambda text: 'null'),
+    ('empty body', lambda text: ''),
+]
+
+
+def add_noise(rng, body):
+    """Random extra fields and unicode; schemas drop unknown keys, so noise alone never breaks a body"""
+    for _ in range(rng.randint(0, 5)):
+        body[f"extra_{rng.randint(0, 999)}"] = rng.choice([
+            'ﷺ' * rng.randint(1, 50), rng.random() * 1e6, None, [1, 2, 3], {'$where': 'sleep(1000)'}])
+
+
+def fuzz_cases(rng, count):
+    for n in range(count):
+        path = rng.choice(list(BODY_LIMITS))
+        body = copy.deepcopy(valid_payloads(rng)[path])
+        add_noise(rng, body)
+        if rng.random() < 0.2:
+            name, mutate = rng.choice(RAW_BODIES)
+            yield path, name, mutate(json.dumps(body, ensure_ascii=False))
+            continue
+        chosen = rng.sample(breaking_mutations(path), rng.randint(1, 2))
+        for _, mutate in chosen:
+            mutate(body)
+        yield path, ' + '.join(name for name, _ in chosen), json.dumps(body, ensure_ascii=False)
+
+
+def post_raw(client, path, data, timeout=30):
+    start = time.perf_counter()
+    response = client.request('POST', path, data=data.encode() if isinstance(data, str) else data,
+                              headers=client_headers(), timeout=timeout, expect='response')
+    return response, (time.perf_counter() - start) * 1000
+
+
+def delete_product(client, product_id):
+    client.request('DELETE', f"/admin/products/{product_id}", headers=client_headers(), expect='response')
+
+
+def run_fuzz(client, args):
+    print(f"\n🎲 Fuzzing {args.cases} malformed bodies (seed {args.seed})")
+    rng = random.Random(args.seed)
+    holes, crashes, statuses = [], [], {}
+
+    def attempt(case):
+        path, name, data = case
+        response, _ = post_raw(client, path, data)
+        return path, name, response
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for path, name, response in executor.map(attempt, fuzz_cases(rng, args.cases)):
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code < 400:
+                holes.append((path, name))
+                if path == '/admin/products':
+                    delete_product(client, response.json()['id'])
+            elif response.status_code >= 500:
+                crashes.append((path, name, response.text[:200]))
+
+    print(f"   statuses: {dict(sorted(statuses.items()))}")
+    for path, name in holes[:10]:
+        print(f"   ❌ accepted: {path} with {name}")
+    for path, name, text in crashes[:10]:
+        print(f"   ❌ crashed: {path} with {name}: {text}")
+    return {'accepted_invalid': len(holes), 'server_errors': len(crashes), 'statuses': statuses}
+
+
+def check_stripping(client):
+    """A valid product with unknown fields is stored without them"""
+    body = dict(valid_payloads(random.Random(0))['/admin/products'], injected='x' * 1000, rating=4)
+    response, _ = post_raw(client, '/admin/products', json.dumps(body))
+    response.raise_for_status()
+    product = response.json()
+    delete_product(client, product['id'])
+    return 'injected' not in product
+
+
+def measure_overhead(client, args):
+    """Latency of bodies rejected before validation work ({} fails at once) versus bodies
+    parsed and validated in full (a large valid body missing one required field)"""
+    print(f"\n⏱️ Validation overhead ({args.requests} requests per case)")
+    rng = random.Random(args.seed)
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for path in BODY_LIMITS:
+            field = REQUIRED[path][0]
+            full = copy.deepcopy(valid_payloads(rng)[path])
+            if path == '/orders':
+                full['items'] = full['items'][:1] * 50
+            full.pop(field)
+            for case, body in (('empty object', '{}'), ('full body', json.dumps(full, ensure_ascii=False))):
+                start = time.perf_counter()
+                rows = list(executor.map(lambda _: post_raw(client, path, body), range(args.requests)))
+                elapsed = time.perf_counter() - start
+                latencies = [latency for response, latency in rows if response.status_code == 400]
+                summary = summarize_latencies(latencies)
+                results[f"{path} {case}"] = {'bytes': len(body.encode()), 'throughput': len(latencies) / elapsed,
+                                             **summary}
+                print(f"   {path:<16} {case:<13} {len(body.encode()):>7,}B  {len(latencies) / elapsed:7.1f} req/s  "
+                      f"p50={summary['p50']:6.1f}ms  p99={summary['p99']:6.1f}ms")
+    return results
+
+
+def fetch_rss(client):
+    return client.metrics()['process']['rss']
+
+
+def streamed_body(total, chunk=64 * 1024):
+    sent = 0
+    while sent < total:
+        yield b'x' * chunk
+        sent += chunk
+
+
+def check_oversized(client):
+    print("\n📦 Oversized bodies")
+    rss_before = fetch_rss(client)
+    results = []
+    for path, limit in BODY_LIMITS.items():
+        for factor in OVERSIZE_FACTORS:
+            size = int(limit * factor)
+            body = json.dumps({'padding': 'x' * size})
+            response, latency = post_raw(client, path, body)
+            results.append((path, f"{size:,}B declared", response.status_code, latency))
+
+        # Chunked upload without Content-Length: the limit has to be enforced while streaming
+        start = time.perf_counter()
+        try:
+            status = client.request('POST', path, data=streamed_body(STREAMED_BYTES), headers=client_headers(),
+                                    timeout=60, expect='response').status_code
+        except client.transport_errors:
+            status = 'closed'  # the server stopped reading and dropped the connection
+        results.append((path, f"{STREAMED_BYTES:,}B streamed", status, (time.perf_counter() - start) * 1000))
+    rss_growth = fetch_rss(client) - rss_before
+
+    for path, case, status, latency in results:
+        ok = status in (413, 'closed')
+        print(f"   {'✅' if ok else '❌'} {path:<16} {case:<22} -> {status}  {latency:7.1f}ms")
+    print(f"   server RSS change: {rss_growth / 1024 / 1024:+.1f}MB")
+    return all(status in (413, 'closed') for _, _, status, _ in results), rss_growth
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz request validation and measure its overhead')
+    parser.add_argument('--cases', type=int, default=2000, help='malformed bodies to send')
+    parser.add_argument('--requests', type=int, default=500, help='requests per overhead case')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--max-rss-growth-mb', type=float, default=64,
+                        help='allowed server RSS growth across the oversized-body barrage')
+    parser.add_argument('--report', help='write results to this JSON file')
+    args = parser.parse_args()
+
+    print("🛡️ REQUEST VALIDATION FUZZ TEST")
+    print("=" * 80)
+    print(f"🔗 API Base URL: {BASE_URL}")
+    print("=" * 80)
+
+    client = make_client(args.concurrency)
+    fuzz = run_fuzz(client, args)
+    stripped = check_stripping(client)
+    overhead = measure_overhead(client, args)
+    oversized_rejected, rss_growth = check_oversized(client)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report:
+            json.dump({'fuzz': fuzz, 'overhead': overhead, 'oversized_rejected': oversized_rejected,
+                       'rss_growth_bytes': rss_growth}, report, indent=2)
+        print(f"\n📝 Report written to {args.report}")
+
+    checks = {
+        'no malformed body was accepted': fuzz['accepted_invalid'] == 0,
+        'no malformed body caused a server error': fuzz['server_errors'] == 0,
+        'unknown fields are dropped before storing': stripped,
+        'oversized bodies are rejected with 413': oversized_rejected,
+        f'server RSS grew less than {args.max_rss_growth_mb:.0f}MB': rss_growth < args.max_rss_growth_mb * 1024 * 1024,
+    }
+    print()
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Wallet Ledger Reconciliation
+Verifies every user's walletBalance/walletSeq snapshot against the wallet_ledger entries
+in one streaming merge pass over both collections
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Configuration - Get from environment
+MONGO_URL = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+DB_NAME = os.getenv('DB_NAME', 'mystoreapp')
+
+BATCH_SIZE = 5000
+AMOUNT_TOLERANCE = 1e-6
+
+
+def stream_users(database):
+    """Yield (uid, balance, seq) for every user, ordered by uid"""
+    cursor = database.users.find(
+        {'uid': {'$type': 'string'}}, {'_id': 0, 'uid': 1, 'walletBalance': 1, 'walletSeq': 1}
+    ).sort('uid', 1).batch_size(BATCH_SIZE)
+    for user in cursor:
+        yield user.get('uid'), user.get('walletBalance', 0) or 0, user.get('walletSeq')
+
+
+def stream_ledger_totals(database):
+    """Yield (userId, total, count, max_seq) per user from the ledger, ordered by userId"""
+    pipeline = [
+        {'$group': {
+            '_id': '$userId',
+            'total': {'$sum': '$amount'},
+            'count': {'$sum': 1},
+            'maxSeq': {'$max': '$seq'},
+        }},
+        {'$sort': {'_id': 1}},
+    ]
+    cursor = database.wallet_ledger.aggregate(pipeline, allowDiskUse=True, batchSize=BATCH_SIZE)
+    for row in cursor:
+        yield row['_id'], row['total'], row['count'], row['maxSeq']
+
+
+def reconcile(users, ledger_totals):
+    """Merge-join two uid-sorted streams and yield one finding per problem user
+
+    Findings are dicts with a `kind` of:
+      balance_mismatch - snapshot balance differs from the ledger sum
+      seq_mismatch     - snapshot seq differs from the entry count or seq has gaps
+      legacy           - user predates the ledger (no walletSeq, no entries)
+      orphan_entries   - ledger entries for a uid that has no user document
+    """
+    ledger_iter = iter(ledger_totals)
+    pending = next(ledger_iter, None)
+
+    for uid, balance, seq in users:
+        while pending is not None and pending[0] < uid:
+            yield {'kind': 'orphan_entries', 'userId': pending[0], 'ledgerTotal': pending[1]}
+            pending = next(ledger_iter, None)
+
+        if pending is not None and pending[0] == uid:
+            _, total, count, max_seq = pending
+            pending = next(ledger_iter, None)
+        else:
+            total, count, max_seq = 0, 0, None
+
+        if seq is None and count == 0:
+            yield {'kind': 'legacy', 'userId': uid, 'snapshotBalance': balance}
+            continue
+
+        if abs(balance - total) > AMOUNT_TOLERANCE:
+            yield {'kind': 'balance_mismatch', 'userId': uid,
+                   'snapshotBalance': balance, 'ledgerTotal': total}
+        if seq != count or max_seq != count:
+            yield {'kind': 'seq_mismatch', 'userId': uid,
+                   'snapshotSeq': seq, 'entryCount': count, 'maxSeq': max_seq}
+
+    while pending is not None:
+        yield {'kind': 'orphan_entries', 'userId': pending[0], 'ledgerTotal': pending[1]}
+        pending = next(ledger_iter, None)
+
+
+def adopt_legacy_user(database, uid):
+    """Give a pre-ledger user an opening entry equal to their current balance
+
+    The seq and the entry are written in one transaction, so a crash never
+    leaves a seq with no entry behind it; the balance is read inside it too.
+    """
+    from pymongo import ReturnDocument
+
+    def adopt(session):
+        now = datetime.now(timezone.utc)
+        user = database.users.find_one_and_update(
+            {'uid': uid, 'walletSeq': {'$exists': False}},
+            {'$set': {'walletSeq': 1, 'updatedAt': now}},
+            projection={'walletBalance': 1, 'testRun': 1, 'expiresAt': 1},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if user is None:
+            return
+        balance = user.get('walletBalance') or 0
+        database.wallet_ledger.insert_one({
+            'id': str(uuid.uuid4()),
+            'userId': uid,
+            'seq': 1,
+            'type': 'opening',
+            'amount': balance,
+            'balanceAfter': balance,
+            'referenceId': None,
+            'note': 'adopted by reconciliation',
+            'createdAt': now,
+            **({'testRun': user['testRun'], 'expiresAt': user['expiresAt']} if user.get('testRun') else {}),
+        }, session=session)
+
+    with database.client.start_session() as session:
+        session.with_transaction(adopt)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Reconcile wallet snapshots against the ledger')
+    parser.add_argument('--adopt-legacy', action='store_true',
+                        help='write opening entries for users created before the ledger existed')
+    parser.add_argument('--report', help='write findings as JSON lines to this file')
+    parser.add_argument('--show', type=int, default=20, help='print at most N findings')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from pymongo import MongoClient
+
+    print("🧾 WALLET LEDGER RECONCILIATION")
+    print("=" * 80)
+    print(f"🔗 Database: {DB_NAME}")
+    print("=" * 80)
+
+    client = MongoClient(MONGO_URL)
+    database = client[DB_NAME]
+
+    start = time.perf_counter()
+    counts = {'balance_mismatch': 0, 'seq_mismatch': 0, 'legacy': 0, 'orphan_entries': 0}
+    shown = 0
+    report = open(args.report, 'w', encoding='utf-8') if args.report else None
+
+    try:
+        for finding in reconcile(stream_users(database), stream_ledger_totals(database)):
+            counts[finding['kind']] += 1
+
+            if finding['kind'] == 'legacy' and args.adopt_legacy:
+                adopt_legacy_user(database, finding['userId'])
+            if report:
+                report.write(json.dumps(finding, ensure_ascii=False) + '\n')
+            if shown < args.show and finding['kind'] != 'legacy':
+                print(f"   ❌ {finding}")
+                shown += 1
+    finally:
+        if report:
+            report.close()
+        client.close()
+
+    print(f"\n📊 Reconciliation finished in {time.perf_counter() - start:.1f}s")
+    for kind, count in counts.items():
+        status = "✅" if count == 0 or (kind == 'legacy' and args.adopt_legacy) else "❌"
+        print(f"   {status} {kind}: {count}")
+
+    return counts['balance_mismatch'] == 0 and counts['seq_mismatch'] == 0 and counts['orphan_entries'] == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)